@@ -6,8 +6,7 @@
 # programmer    GLF
 
 import datetime          # used for getting the date
-import os                # used for getting the basic file name (returns lower case)
-import win32api          # used for getting fileName with correct case
+import os                # used for the folder of this script
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -16,11 +15,12 @@ import umap
 from sklearn import preprocessing    # Import label encoder  
 import matplotlib.patheffects as PathEffects    # use for fancy plot text for example
 
+from fishproject import catalog, embedding_cache, pipeline, projection
+
 # ============== COMMON INITIALIZATION =====================
 date_o = datetime.datetime.today()
 date_c = date_o.strftime('%m/%d/%Y')
-programname_c = os.path.basename(__file__)                                          # case insensitive file name
-programName_c = win32api.GetLongPathName(win32api.GetShortPathName(programname_c)) # case sensitive name
+programName_c = pipeline.program_name(__file__)   # case sensitive name (win32api only when installed)
 
 ix = str.find(programName_c,'.')
 
@@ -29,11 +29,13 @@ programMsg_c = programName_c + ' (' + date_c + ')'
 authorName_c = 'G.L. Fudge'
 
 figName_c = programName_c[:ix]+'_fig.png'
+modelDir_c = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'umap_models')  # next to this script, not the working directory
 
 
 # ================= get data ==================
-sethEnvData_df = pd.read_csv((fileName_c))                 # load the sethEnv data into a pandas data frame
+sethEnvData_df = catalog.load_table('environment').reset_index()   # load the sethEnv data into a pandas data frame
 sethEnvData_num_df = sethEnvData_df.drop(['SiteN','State'], axis = 1)    # numerical data only
+sethEnvData_num_cols = list(sethEnvData_num_df.columns)
 sethEnvData_labels = sethEnvData_df['State']
 label_encoder = preprocessing.LabelEncoder()  
 sethEnvData_labels_v = label_encoder.fit_transform(sethEnvData_labels) 
@@ -56,8 +58,18 @@ sethEnvData_num_df = sc_z.fit_transform(sethEnvData_num_df)
 # default init seems better than pca
 # min_dist default of 0.1 looks best
 umapModel = umap.UMAP(n_components=2,metric='correlation',random_state=1,n_neighbors=7,n_epochs=500,learning_rate=0.5,min_dist=0.1,n_jobs = 1)
+sethEnvData_key = embedding_cache.embedding_key(sethEnvData_num_df, umapModel.get_params())
 sethEnvData_umap = umapModel.fit_transform(sethEnvData_num_df)
 
+# save the fitted scaler + model, so new sites can be placed into this plot with
+# projection.project(projection.load_projection(modelDir_c, 'demo umapModel'), new_rows)
+projection.save_projection(modelDir_c, projection.Projection(name='demo umapModel',
+                                                             columns=sethEnvData_num_cols,
+                                                             imputer=None,
+                                                             scaler=sc_z,
+                                                             model=umapModel,
+                                                             key=sethEnvData_key))
+
 
 print('type(isethEnvData_umap) = ',type(sethEnvData_umap))
 print('sethEnvData_umap.shape = ',sethEnvData_umap.shape)
@@ -0,0 +1,16 @@
+# program		fishproject/__init__.py
+# purpose	    shared helpers for the fish data visualization scripts
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  the modules in this package are imported by the scripts in
+#     python_code/ (e.g. beaty_sethData_v4p2.py). run the scripts from
+#     the python_code/ directory so that "import fishproject" resolves.
+# 2)  importing the package or its modules does no work and does not
+#     import umap. the figures can also be rendered from the command line:
+#     python -m fishproject render --figures 1-4 --out DIR
+###
+
+__author__ = "Michael M Beaty"
+__version__ = "4.3"
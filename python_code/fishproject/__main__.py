@@ -0,0 +1,372 @@
+# program		fishproject/__main__.py
+# purpose	    command line entry point of the package
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  usage, from the python_code/ directory:
+#         python -m fishproject render --figures 1-4 --out DIR
+#     renders the figures headless (Agg, no windows) into DIR. with
+#     --trace FILE the time and memory of every stage and figure are
+#     written to FILE as a chrome trace (see fishproject.spans).
+#     --memory-budget MB runs only as many render workers as fit in MB,
+#     --preview-dpi DPI draws smaller figures for a quick look,
+#     --formats png,webp,pdf saves every figure in those formats (dzi
+#     for a deep zoom tile pyramid with an html viewer).
+#         python -m fishproject sweep --min-dist 0.1,0.5 --out sheet.png
+#     fits a UMAP for every combination of the listed parameter values
+#     (see fishproject.sweep) and draws them all on one contact sheet.
+#         python -m fishproject bench --sites 46,500,2000 --out bench
+#     times the pipeline stages on synthetic data of growing size (see
+#     fishproject.benchmark).
+#         python -m fishproject tiles figures/*.png --out DIR
+#     writes a deep zoom tile pyramid and an html viewer of every png (see
+#     fishproject.tiles).
+# 2)  only argparse is imported up front. the pipeline (pandas, sklearn,
+#     matplotlib and, when a fit is needed, umap) is imported after the
+#     arguments are parsed, so --help and argument errors return at once.
+###
+
+### imports
+import argparse
+import sys
+
+
+### Docstring Data
+__all__ = ["parse_figure_numbers", "parse_values", "build_parser", "main"]
+
+
+### parse_figure_numbers(text)
+# Parses a figure selection like "1-4,7,9-10" into a sorted list of
+# figure numbers.
+###
+def parse_figure_numbers(text) :
+    numbers = set()
+    for part in text.split(",") :
+        part = part.strip()
+        if not part :
+            continue
+
+        try :
+            if "-" in part :
+                first, last = part.split("-", 1)
+                numbers.update(range(int(first), int(last) + 1))
+            else :
+                numbers.add(int(part))
+        except ValueError :
+            raise argparse.ArgumentTypeError("invalid figure selection " +
+                                             repr(part)
+                                             )
+
+    if not numbers :
+        raise argparse.ArgumentTypeError("no figures selected")
+
+    return sorted(numbers)
+
+
+### parse_values(kind)
+# Returns an argparse type that parses a comma separated list of values
+# of kind (int, float or str).
+###
+def parse_values(kind) :
+    def parse(text) :
+        try :
+            values = [kind(part.strip()) for part in text.split(",")
+                      if part.strip()]
+        except ValueError :
+            raise argparse.ArgumentTypeError("invalid value list " +
+                                             repr(text)
+                                             )
+        if not values :
+            raise argparse.ArgumentTypeError("no values given")
+
+        return values
+
+    return parse
+
+
+### build_parser()
+# The argparse parser of the command line.
+###
+def build_parser() :
+    parser = argparse.ArgumentParser(prog = "python -m fishproject",
+                                     description = "UMAP figures of the "
+                                                   "fish survey data"
+                                     )
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    render = commands.add_parser("render",
+                                 help = "render figures headless to png files"
+                                 )
+    render.add_argument("--figures", type = parse_figure_numbers,
+                        default = None, metavar = "LIST",
+                        help = "figure numbers, e.g. 1-4,7 (default: all)"
+                        )
+    render.add_argument("--out", default = ".", metavar = "DIR",
+                        help = "folder the figures are saved to"
+                        )
+    render.add_argument("--workers", type = int, default = None,
+                        help = "render worker processes (default: one per "
+                               "CPU core)"
+                        )
+    render.add_argument("--memory-budget", type = float, default = None,
+                        metavar = "MB",
+                        help = "peak memory of the render workers, fewer "
+                               "workers run when they do not fit"
+                        )
+    render.add_argument("--preview-dpi", type = int, default = None,
+                        metavar = "DPI",
+                        help = "draw smaller preview figures at DPI "
+                               "(default: full size)"
+                        )
+    render.add_argument("--formats", type = parse_values(str), default = None,
+                        metavar = "LIST",
+                        help = "file formats of the figures, e.g. "
+                               "png,webp,pdf,dzi (default: png)"
+                        )
+    render.add_argument("--umap-workers", type = int, default = None,
+                        help = "UMAP fit worker processes (default: one per "
+                               "CPU core)"
+                        )
+    render.add_argument("--data-dir", default = None, metavar = "DIR",
+                        help = "folder with the csv files (default: data/)"
+                        )
+    render.add_argument("--cache-dir", default = "umap_cache", metavar = "DIR",
+                        help = "folder of the UMAP embedding cache"
+                        )
+    render.add_argument("--no-cache", action = "store_true",
+                        help = "do not use the UMAP embedding cache"
+                        )
+    render.add_argument("--quiet", action = "store_true",
+                        help = "do not print the time and peak RSS of every "
+                               "stage and figure"
+                        )
+    render.add_argument("--trace", default = None, metavar = "FILE",
+                        help = "write the stage / figure spans (time and "
+                               "memory) to FILE"
+                        )
+    render.add_argument("--trace-format", choices = ["chrome", "json"],
+                        default = "chrome",
+                        help = "chrome trace (default) or a plain json list"
+                        )
+
+    sweep = commands.add_parser("sweep",
+                                help = "fit a grid of UMAP parameters and "
+                                       "draw a contact sheet"
+                                )
+    sweep.add_argument("--data", choices = ["site", "csf"], default = "site",
+                       help = "input table (default: site)"
+                       )
+    sweep.add_argument("--n-neighbors", type = parse_values(int),
+                       default = None, metavar = "LIST",
+                       help = "n_neighbors values, e.g. 5,10,20"
+                       )
+    sweep.add_argument("--min-dist", type = parse_values(float),
+                       default = None, metavar = "LIST",
+                       help = "min_dist values, e.g. 0.01,0.1,0.5"
+                       )
+    sweep.add_argument("--n-epochs", type = parse_values(int),
+                       default = None, metavar = "LIST",
+                       help = "n_epochs values"
+                       )
+    sweep.add_argument("--learning-rate", type = parse_values(float),
+                       default = None, metavar = "LIST",
+                       help = "learning_rate values"
+                       )
+    sweep.add_argument("--metric", type = parse_values(str),
+                       default = None, metavar = "LIST",
+                       help = "metric values, e.g. correlation,euclidean"
+                       )
+    sweep.add_argument("--out", default = "umap_sweep.png", metavar = "FILE",
+                       help = "contact sheet png"
+                       )
+    sweep.add_argument("--workers", type = int, default = None,
+                       help = "UMAP fit worker processes (default: one per "
+                              "CPU core)"
+                       )
+    sweep.add_argument("--data-dir", default = None, metavar = "DIR",
+                       help = "folder with the csv files (default: data/)"
+                       )
+
+    bench = commands.add_parser("bench",
+                                help = "time the pipeline stages on "
+                                       "synthetic data"
+                                )
+    bench.add_argument("--sites", type = parse_values(int), default = [],
+                       metavar = "LIST",
+                       help = "numbers of sites, e.g. 46,500,2000"
+                       )
+    bench.add_argument("--genera", type = parse_values(int), default = [],
+                       metavar = "LIST",
+                       help = "numbers of genera, e.g. 30,100,500"
+                       )
+    bench.add_argument("--segments", type = parse_values(int), default = [],
+                       metavar = "LIST",
+                       help = "numbers of 10-day segments, e.g. 876,10000"
+                       )
+    bench.add_argument("--figures", type = parse_figure_numbers,
+                       default = [2, 3], metavar = "LIST",
+                       help = "figures rendered at every point (default: 2,3)"
+                       )
+    bench.add_argument("--missing", type = float, default = 0.02,
+                       help = "fraction of the synthetic values left empty "
+                              "(default: 0.02)"
+                       )
+    bench.add_argument("--out", default = "benchmark", metavar = "DIR",
+                       help = "folder of benchmark.json and scaling.png"
+                       )
+    bench.add_argument("--label", default = None,
+                       help = "label stored in the report, e.g. a version"
+                       )
+    bench.add_argument("--compare", default = None, metavar = "JSON",
+                       help = "earlier benchmark.json to compare with"
+                       )
+
+    tiles = commands.add_parser("tiles",
+                                help = "write deep zoom tile pyramids with an "
+                                       "html viewer of saved figures"
+                                )
+    tiles.add_argument("files", nargs = "+", metavar = "FILE",
+                       help = "figure png files"
+                       )
+    tiles.add_argument("--out", default = None, metavar = "DIR",
+                       help = "folder of the pyramids (default: the folder "
+                              "of every FILE)"
+                       )
+    tiles.add_argument("--tile-size", type = int, default = 512,
+                       help = "tile width and height in pixels (default: 512)"
+                       )
+    tiles.add_argument("--tile-format", choices = ["png", "webp"],
+                       default = "png",
+                       help = "file format of the tiles (default: png)"
+                       )
+    tiles.add_argument("--workers", type = int, default = None,
+                       help = "tile encoding threads (default: one per CPU "
+                              "core)"
+                       )
+
+    return parser
+
+
+### main(argv = None)
+# Runs the command line and returns the exit code.
+###
+def main(argv = None) :
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "render" :
+        from fishproject import pipeline
+
+        if args.figures is not None :
+            try :
+                pipeline.embeddings_for(args.figures)
+            except ValueError as error :
+                parser.error(str(error))
+
+        if args.formats is not None :
+            from fishproject import saving
+
+            unknown = [name for name in args.formats
+                       if name not in saving.FORMATS]
+            if unknown :
+                parser.error("unknown figure formats: " + repr(unknown))
+
+        memory_budget = None
+        if args.memory_budget is not None :
+            from fishproject import figures
+
+            memory_budget = int(args.memory_budget * 2**20)
+            dpi = args.preview_dpi or pipeline.dpi_var
+            if figures.render_bytes(dpi) > memory_budget :
+                parser.error("a figure at %d dpi needs about %d MB, over the "
+                             "memory budget" % (dpi, figures.render_bytes(dpi) // 2**20)
+                             )
+
+        if not args.quiet :
+            from fishproject import spans
+
+            spans.verbose = True
+            spans.enable(memory = False)
+
+        paths = pipeline.run(args.figures,
+                             out_dir = args.out,
+                             headless = True,
+                             render_workers = args.workers,
+                             memory_budget = memory_budget,
+                             preview_dpi = args.preview_dpi,
+                             formats = args.formats,
+                             umap_workers = args.umap_workers,
+                             cache_dir = None if args.no_cache else args.cache_dir,
+                             data_dir = args.data_dir,
+                             trace_path = args.trace,
+                             trace_format = args.trace_format,
+                             )
+
+        for path in paths :
+            print(path)
+
+    elif args.command == "sweep" :
+        from fishproject import pipeline
+        from fishproject import sweep
+
+        grid = {name : values
+                for name, values in [("metric", args.metric),
+                                     ("n_neighbors", args.n_neighbors),
+                                     ("min_dist", args.min_dist),
+                                     ("n_epochs", args.n_epochs),
+                                     ("learning_rate", args.learning_rate),
+                                     ]
+                if values is not None}
+        if not grid :
+            parser.error("give at least one parameter list to sweep")
+
+        data = pipeline.load_survey_data(args.data_dir)
+        table = data.site_data if args.data == "site" else data.csf_data
+        base_params = pipeline.UMAP_JOBS["UMAP 2"][1]
+
+        points = sweep.sweep(table, grid, base_params,
+                             max_workers = args.workers
+                             )
+        for point in points :
+            print({name : point.params[name] for name in grid},
+                  "%.1f s" % point.seconds
+                  )
+        print(sweep.contact_sheet(points, args.out))
+
+    elif args.command == "bench" :
+        from fishproject import benchmark
+        from fishproject import pipeline
+
+        try :
+            pipeline.embeddings_for(args.figures)
+        except ValueError as error :
+            parser.error(str(error))
+
+        points = benchmark.scaling_points(args.sites, args.genera,
+                                          args.segments
+                                          )
+        report = benchmark.run_benchmark(points, args.out,
+                                         figures = args.figures,
+                                         missing = args.missing,
+                                         label = args.label
+                                         )
+
+        if args.compare is not None :
+            print(benchmark.compare_reports(args.compare, report).to_string())
+
+    elif args.command == "tiles" :
+        from fishproject import tiles
+
+        for path in args.files :
+            print(tiles.export_image(path, args.out,
+                                     tile_size = args.tile_size,
+                                     tile_format = args.tile_format,
+                                     max_workers = args.workers
+                                     ))
+
+    return 0
+
+
+if __name__ == "__main__" :
+    sys.exit(main())
@@ -0,0 +1,461 @@
+# program		fishproject/benchmark.py
+# purpose	    time the pipeline stages on synthetic survey data of growing
+#               size
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  write_synthetic_data() writes csv files with the names, columns and
+#     State codes of the seth_* tables and of
+#     envData10-DayTimeSeries_18f.csv, with any number of sites, genera
+#     and 10-day segments. values are random (counts are mostly zero,
+#     like the real ones); the eco-regions are the 13 real ones, repeated
+#     over the sites. a missing fraction of the environmental values and
+#     of the genus counts is left empty (the real tables have a few gaps
+#     as well), so the impute stage has work to do.
+# 2)  the climate series has series_sites sites (default 46, like the
+#     real file) whatever the number of survey sites: 10k segments of
+#     10k sites x 18 features would be a 14 GB csv.
+# 3)  every benchmark point times the stages load (csv parsing of all the
+#     tables and of the series, no binary cache, and
+#     pipeline.load_survey_data()), impute (mean / median imputation of
+#     the raw environmental and genus arrays), ranking (site /
+#     genus order and ring sizes), umap (the fits the rendered figures
+#     need, no embedding cache), correlation (environment x genus
+#     pearson), climate (per site climate features) and render (headless,
+#     in this process). numba is compiled once before the first point,
+#     so the umap times do not include it.
+# 4)  run_benchmark() writes a json report (the sizes and the seconds of
+#     every stage of every point, plus the package versions) and a png
+#     with one scaling curve per stage and varied size. compare_reports()
+#     puts two reports side by side.
+# 5)  usage, from the python_code/ directory:
+#         python -m fishproject bench --sites 46,500,2000 --out bench
+###
+
+### imports
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fishproject import catalog
+from fishproject import climate
+from fishproject import climate_features
+from fishproject import correlation
+from fishproject import pipeline
+
+
+### Docstring Data
+__all__ = ["BASE_SIZE", "STAGES", "write_synthetic_data", "scaling_points",
+           "benchmark_point", "run_benchmark", "plot_scaling",
+           "compare_reports",
+           ]
+
+
+# size of the real data set, the other sizes are varied around it
+BASE_SIZE = {"sites" : 46, "genera" : 30, "segments" : 876}
+
+STAGES = ["load", "impute", "ranking", "umap", "correlation", "climate",
+          "render"]
+
+_ENVIRONMENT = ["DO", "pH", "avg_WW", "avg_Depth", "Pool", "Run", "Riffle",
+                "Mud", "Sand", "SmGravel", "LgGravel", "Cobble", "Boulder",
+                "Bedrock", "macrophytes ", "wood ", "upstreamCumDA_km2",
+                "slopePercent", "avgMonthFlow_cfs", "CV_flow",
+                "maxMonthFlow_cfs", "minMonthFlow_cfs",
+                ]
+
+# column name prefixes of the march2023 (old) and nov2024 (current) files
+_OLD_PREFIXES = dict.fromkeys(["Pool", "Run", "Riffle"], "pf_")
+_OLD_PREFIXES.update(dict.fromkeys(["Mud", "Sand", "SmGravel", "LgGravel",
+                                    "Cobble", "Boulder", "Bedrock"], "pb_"))
+_OLD_PREFIXES.update(dict.fromkeys(["macrophytes ", "wood "], "pft_"))
+_NEW_PREFIXES = {"pf_" : "pflow_", "pb_" : "pbottom_", "pft_" : "pfloat_"}
+
+_GENERA = ["Ameiurus", "Aphredoderus", "Aplodinotus", "Campostoma",
+           "Cyprinella", "Cyprinus", "Dorosoma", "Ellasoma", "Erimyzon",
+           "Esox", "Etheostoma", "Fundulus", "Gambusia", "Ictalurus",
+           "Labidesthes", "Lepisosteus", "Lepomis", "Lythrus",
+           "Macrohybopsis", "Micropterus", "Minytrema", "Moxostoma",
+           "Nototropis", "Notemigonus", "Notropis", "Noturus", "Percina",
+           "Phenocobius", "Pimephales", "Semotilus",
+           ]
+
+# eco_Number, eco_Letter, Title, State and number of sites in the real file
+_ECO_REGIONS = [(33, "a", "Northern Post Oak Savana", "TX", 16),
+                (32, "a", "Northern Black Land Prairie", "TX", 8),
+                (35, "c", "Pleistocene Fluvial Terraces", "TX", 6),
+                (35, "g", "Red River Bottomlands", "TX", 4),
+                (29, "b", "Eastern Cross Timbers", "OK", 1),
+                (29, "g", "Arbuckle Uplift", "OK", 2),
+                (35, "d", "Fourche Mountains", "OK", 1),
+                (35, "h", "Blackland Prairie", "OK", 1),
+                (36, "a", "Athens Plateau", "OK", 1),
+                (36, "b", "Central Mountain Ranges", "OK", 2),
+                (36, "e", "Western Ouachitas", "OK", 1),
+                (36, "f", "Western Ouachita Valleys", "OK", 2),
+                (37, "e", "Lower Canadian Hills", "OK", 1),
+                ]
+
+_CLIMATE = ["burn", "dfm1000hr", "dfm100hr", "energy_ERC", "maxT", "maxRelH",
+            "vaporDeficit", "minT", "minRelH", "specificH", "precipitation",
+            "alfalfa", "grass", "sunshine", "windDirection", "windSpeed",
+            "palmer_p", "palmer_z",
+            ]
+
+
+### _genus_names(n_genera)
+# The real genus names followed by Genus_031, Genus_032, ... The genus
+# the "with fish" UMAPs use (pipeline.g_to_plot) is always included.
+###
+def _genus_names(n_genera) :
+    names = (_GENERA + ["Genus_{:03d}".format(number + 1)
+                        for number in range(len(_GENERA), n_genera)])[:n_genera]
+    if pipeline.g_to_plot not in names :
+        names[0] = pipeline.g_to_plot
+
+    return names
+
+
+### write_synthetic_data(data_dir, n_sites, n_genera, n_segments,
+###                      series_sites = 46, missing = 0.02, seed = 24)
+# Writes the synthetic tables (see general note 1) into data_dir and
+# returns the path of the climate series csv. missing is the fraction of
+# environmental values and genus counts left empty.
+###
+def write_synthetic_data(data_dir, n_sites, n_genera, n_segments,
+                         series_sites = 46, missing = 0.02, seed = 24
+                         ) :
+    rng = np.random.default_rng(seed)
+    os.makedirs(data_dir, exist_ok = True)
+
+    # eco-regions in blocks of the real site counts, repeated
+    pattern = np.repeat(np.arange(len(_ECO_REGIONS)),
+                        [region[4] for region in _ECO_REGIONS])
+    site_region = pattern[np.arange(n_sites) % len(pattern)]
+    regions = pd.DataFrame([region[:4] for region in _ECO_REGIONS],
+                           columns = ["eco_Number", "eco_Letter", "Title",
+                                      "State"]
+                           ).iloc[site_region].reset_index(drop = True)
+    sites = np.arange(1, n_sites + 1)
+    states = regions["State"].to_numpy()
+
+    regions.insert(0, "Site_N", sites)
+    regions.to_csv(os.path.join(data_dir, catalog.TABLES["eco_region"][0]),
+                   index = False
+                   )
+
+    environment = rng.lognormal(1.0, 1.0, size = (n_sites, len(_ENVIRONMENT)))
+    environment[rng.random(environment.shape) < missing] = np.nan
+    old_names = [_OLD_PREFIXES.get(name, "") + name for name in _ENVIRONMENT]
+    new_names = [_NEW_PREFIXES.get(_OLD_PREFIXES.get(name), "") + name
+                 for name in _ENVIRONMENT]
+
+    genera = _genus_names(n_genera)
+    counts = (rng.poisson(rng.gamma(0.5, 8.0, size = (1, n_genera)),
+                          size = (n_sites, n_genera))
+              * (rng.random((n_sites, n_genera)) < 0.3)).astype(np.float64)
+    counts[rng.random(counts.shape) < missing] = np.nan
+
+    # the environmental table codes State as a number (TX 1, OK 2)
+    table = pd.DataFrame(environment, columns = old_names)
+    table.insert(0, "SiteN", sites)
+    table.insert(1, "State", np.where(states == "TX", 1, 2))
+    table.to_csv(os.path.join(data_dir, catalog.TABLES["environment"][0]),
+                 index = False
+                 )
+
+    table = pd.DataFrame(counts, columns = genera)
+    table.insert(0, "SiteN", sites)
+    table.insert(1, "State", states)
+    table.to_csv(os.path.join(data_dir, catalog.TABLES["genus"][-1]),
+                 index = False
+                 )
+
+    table = pd.concat([pd.DataFrame({"SiteN" : sites,
+                                     "State" : states,
+                                     "Lat" : rng.uniform(30.0, 37.0, n_sites),
+                                     "Long" : rng.uniform(-100.0, -94.0, n_sites),
+                                     }),
+                       pd.DataFrame(environment, columns = new_names),
+                       pd.DataFrame(counts, columns = genera),
+                       ], axis = 1)
+    table["t_population"] = np.nansum(counts, axis = 1)
+    table["t_species"] = (counts > 0).sum(axis = 1)
+    table.to_csv(os.path.join(data_dir,
+                              catalog.TABLES["environment_genus"][0]),
+                 index = False
+                 )
+
+    series = rng.normal(size = (n_segments, series_sites * len(_CLIMATE)))
+    series = pd.DataFrame(series.astype(np.float32),
+                          columns = ["site_" + str(site) + "." + feature
+                                     for site in range(series_sites)
+                                     for feature in _CLIMATE]
+                          )
+    series.insert(0, "Segment_10Day", np.arange(n_segments))
+    series_path = os.path.join(data_dir, "envData10-DayTimeSeries_18f.csv")
+    series.to_csv(series_path, index = False, float_format = "%.4g")
+
+    return series_path
+
+
+### scaling_points(sites = (), genera = (), segments = (), base = BASE_SIZE)
+# Benchmark points that vary one size at a time around base: the base
+# point, then one point per given number of sites, genera and segments.
+# Every point is a dict with the three sizes and "axis", the size it
+# varies.
+###
+def scaling_points(sites = (), genera = (), segments = (), base = BASE_SIZE) :
+    points = [dict(base, axis = "base")]
+    for axis, values in [("sites", sites), ("genera", genera),
+                         ("segments", segments)] :
+        for value in values :
+            if value != base[axis] :
+                points.append(dict(base, axis = axis, **{axis : value}))
+
+    return points
+
+
+### _warm_up()
+# Compiles numba code once with a tiny fit, so the first umap stage is
+# not charged for it.
+###
+def _warm_up() :
+    from fishproject import fit_scheduler
+
+    data = np.random.default_rng(0).random((60, 5))
+    fit_scheduler.fit_embeddings({"warm up" : (dict(pipeline.UMAP_JOBS["UMAP 2"][1]),
+                                               data)},
+                                 max_workers = 1,
+                                 shared_knn = True
+                                 )
+
+
+### benchmark_point(point, work_dir, figures = (2, 3), series_sites = 46,
+###                 missing = 0.02, seed = 24)
+# Generates the data of point (from scaling_points()) in work_dir, runs
+# the stages on it and returns the seconds of every stage of STAGES.
+# Everything runs in this process.
+###
+def benchmark_point(point, work_dir, figures = (2, 3), series_sites = 46,
+                    missing = 0.02, seed = 24
+                    ) :
+    from fishproject import figures as figure_module
+
+    data_dir = os.path.join(work_dir, "data")
+    out_dir = os.path.join(work_dir, "figures")
+    series_path = write_synthetic_data(data_dir, point["sites"],
+                                       point["genera"], point["segments"],
+                                       series_sites, missing, seed
+                                       )
+
+    seconds = {}
+    start = time.perf_counter()
+    tables = catalog.load_catalog(data_dir = data_dir, use_cache = False)
+    series = climate.load_climate_series(series_path, use_cache = False)
+    data = pipeline.load_survey_data(data_dir)
+    seconds["load"] = time.perf_counter() - start
+
+    # the arrays as read, before load_survey_data() filled their gaps
+    environment = tables["environment"].drop(columns = "State")
+    environment = environment.to_numpy(dtype = np.float64)
+    counts = tables["genus"].drop(columns = "State")
+    counts = np.transpose(counts.to_numpy(dtype = np.float64))
+
+    start = time.perf_counter()
+    pipeline.impute_columns(environment, "mean")
+    pipeline.impute_columns(counts, "median")
+    seconds["impute"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scaling = pipeline.scale_genus_data(data.genus_data)
+    seconds["ranking"] = time.perf_counter() - start
+
+    embedding_names = pipeline.embeddings_for(figures)
+    start = time.perf_counter()
+    embeddings = pipeline.fit_umaps(data, embedding_names,
+                                    max_workers = 1,
+                                    cache_dir = None
+                                    )
+    seconds["umap"] = time.perf_counter() - start
+
+    table = tables["environment_genus"]
+    genera = _genus_names(point["genera"])
+    attributes = [column for column in table.columns
+                  if column not in genera + ["State", "Lat", "Long",
+                                             "t_population", "t_species"]]
+    start = time.perf_counter()
+    correlation.correlate(table, attributes, genera)
+    seconds["correlation"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    climate_features.site_climate_features(series)
+    seconds["climate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = pipeline.figure_context(data, embeddings, scaling,
+                                      "benchmark.py",
+                                      out_dir = out_dir,
+                                      data_dir = data_dir
+                                      )
+    os.makedirs(out_dir, exist_ok = True)
+    figure_module.render_figures(context, list(figures),
+                                 headless = True,
+                                 max_workers = 1
+                                 )
+    seconds["render"] = time.perf_counter() - start
+
+    return seconds
+
+
+### _environment()
+# Python, platform and package versions recorded in the report.
+###
+def _environment() :
+    versions = {}
+    for package in ["numpy", "pandas", "scipy", "scikit-learn", "matplotlib",
+                    "umap-learn"] :
+        try :
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError :
+            versions[package] = None
+
+    return {"python" : platform.python_version(),
+            "platform" : platform.platform(),
+            "processor" : platform.processor(),
+            "cpu_count" : os.cpu_count(),
+            "packages" : versions,
+            }
+
+
+### run_benchmark(points, out_dir, figures = (2, 3), series_sites = 46,
+###               missing = 0.02, seed = 24, label = None)
+# Runs benchmark_point() for every point and writes benchmark.json and
+# scaling.png into out_dir. The synthetic data is written to a temporary
+# folder that is deleted after every point. Returns the report dict.
+###
+def run_benchmark(points, out_dir, figures = (2, 3), series_sites = 46,
+                  missing = 0.02, seed = 24, label = None
+                  ) :
+    os.makedirs(out_dir, exist_ok = True)
+    _warm_up()
+
+    results = []
+    for point in points :
+        print("\tbenchmark", {key : point[key] for key in BASE_SIZE})
+        work_dir = tempfile.mkdtemp(prefix = "fishproject_benchmark_")
+        try :
+            seconds = benchmark_point(point, work_dir, figures,
+                                      series_sites, missing, seed
+                                      )
+        finally :
+            shutil.rmtree(work_dir, ignore_errors = True)
+
+        results.append(dict(point, seconds = seconds))
+        print("\t\t" + ", ".join("{} {:.2f} s".format(stage, seconds[stage])
+                                 for stage in STAGES) + "\n")
+
+    report = {"label" : label,
+              "created" : datetime.datetime.now().isoformat(timespec = "seconds"),
+              "environment" : _environment(),
+              "settings" : {"figures" : list(figures),
+                            "series_sites" : series_sites,
+                            "missing" : missing,
+                            "seed" : seed,
+                            },
+              "stages" : STAGES,
+              "points" : results,
+              }
+
+    with open(os.path.join(out_dir, "benchmark.json"), "w") as file :
+        json.dump(report, file, indent = 1)
+
+    plot_scaling(report, os.path.join(out_dir, "scaling.png"))
+
+    return report
+
+
+### plot_scaling(report, file_path)
+# Draws one log-log panel per varied size (sites, genera, segments) with
+# the seconds of every stage against that size, the base point included.
+###
+def plot_scaling(report, file_path) :
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import NullLocator
+
+    points = report["points"]
+    axes = [axis for axis in BASE_SIZE
+            if any(point["axis"] == axis for point in points)]
+    if not axes :
+        return None
+
+    # the pipeline raises the font sizes of its figures globally
+    with matplotlib.rc_context({"font.size" : 9}) :
+        fig = Figure(figsize = (5 * len(axes), 4.5), dpi = 100)
+        FigureCanvasAgg(fig)
+
+        for number, axis in enumerate(axes) :
+            ax = fig.add_subplot(1, len(axes), number + 1)
+            curve = sorted((point for point in points
+                            if point["axis"] in (axis, "base")),
+                           key = lambda point : point[axis])
+            sizes = [point[axis] for point in curve]
+
+            for stage in report["stages"] :
+                ax.plot(sizes,
+                        [max(point["seconds"][stage], 1e-4) for point in curve],
+                        marker = "o", label = stage
+                        )
+
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.set_xticks(sizes, labels = [str(size) for size in sizes])
+            ax.xaxis.set_minor_locator(NullLocator())
+            ax.set_xlabel(axis)
+            ax.set_ylabel("seconds")
+            ax.grid(True, which = "both", alpha = 0.3)
+        ax.legend(loc = "upper left", fontsize = 8)
+
+        fig.tight_layout()
+        fig.savefig(file_path)
+
+    return file_path
+
+
+### compare_reports(old, new)
+# Puts the stage times of two reports (dicts or paths of benchmark.json)
+# side by side for the points they share. Returns a DataFrame with the
+# old and new seconds and their ratio (new / old) per point and stage.
+###
+def compare_reports(old, new) :
+    reports = []
+    for report in (old, new) :
+        if isinstance(report, (str, os.PathLike)) :
+            with open(report) as file :
+                report = json.load(file)
+        reports.append(report)
+
+    def frame(report) :
+        return pd.DataFrame([dict({key : point[key] for key in BASE_SIZE},
+                                  stage = stage, seconds = seconds)
+                             for point in report["points"]
+                             for stage, seconds in point["seconds"].items()])
+
+    table = frame(reports[0]).merge(frame(reports[1]),
+                                    on = list(BASE_SIZE) + ["stage"],
+                                    suffixes = ("_old", "_new")
+                                    )
+    table["ratio"] = table["seconds_new"] / table["seconds_old"]
+
+    return table
@@ -0,0 +1,141 @@
+# program		fishproject/bootstrap.py
+# purpose	    bootstrap confidence intervals of attribute x response
+#               correlations
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  all resamples are drawn up front as one [resample][row] integer
+#     matrix from a seeded generator. the resampled tables of a chunk of
+#     resamples are gathered with one fancy index and correlated together
+#     with fishproject.correlation, so there is no loop over attributes,
+#     responses or single resamples.
+# 2)  the chunk size bounds the memory: a chunk holds
+#     chunk_size x rows x (attributes + responses) float64 values.
+# 3)  chunks can be spread over a process pool (forked like
+#     fishproject.fit_scheduler, serial where the platform has no fork).
+#     the index matrix is drawn before the chunks are split, so the
+#     intervals are the same for any chunk size and number of workers.
+# 4)  the intervals are percentile intervals. resamples in which a column
+#     is constant give a nan correlation and are left out.
+###
+
+### imports
+import concurrent.futures
+import multiprocessing
+import typing
+
+import numpy as np
+import pandas as pd
+
+from fishproject import correlation
+
+
+### Docstring Data
+__all__ = ["BootstrapCI", "resample_indexes", "bootstrap_correlations",
+           "bootstrap_correlate",
+           ]
+
+
+### BootstrapCI
+# r    : correlation of the full table, DataFrame [attribute][response]
+# low  : lower end of the confidence interval, same shape
+# high : upper end of the confidence interval, same shape
+###
+class BootstrapCI(typing.NamedTuple) :
+    r : pd.DataFrame
+    low : pd.DataFrame
+    high : pd.DataFrame
+    confidence : float
+    n_resamples : int
+
+
+### resample_indexes(n_rows, n_resamples, seed = None)
+# Returns the [resample][row] matrix of row indexes drawn with
+# replacement.
+###
+def resample_indexes(n_rows, n_resamples, seed = None) :
+    rng = np.random.default_rng(seed)
+
+    return rng.integers(0, n_rows, size = (n_resamples, n_rows))
+
+
+### _correlate_chunk(x, y, indexes, method)
+# Correlations [resample][x column][y column] of the resamples in
+# indexes. Also the worker entry point of the pool.
+###
+def _correlate_chunk(x, y, indexes, method) :
+    r, n = correlation.correlation_matrix(x[indexes], y[indexes], method)
+
+    return r
+
+
+### bootstrap_correlations(x, y, indexes, method = "pearson",
+###                        chunk_size = 256, max_workers = 1)
+# Correlations of every resample of indexes (see resample_indexes()) of
+# the [row][column] arrays x and y, as a [resample][x column][y column]
+# array. max_workers > 1 correlates the chunks in a process pool.
+###
+def bootstrap_correlations(x, y, indexes, method = "pearson",
+                           chunk_size = 256, max_workers = 1
+                           ) :
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    chunks = [indexes[start : start + chunk_size]
+              for start in range(0, len(indexes), chunk_size)]
+
+    max_workers = min(max_workers or 1, len(chunks))
+    if (max_workers <= 1 or
+        "fork" not in multiprocessing.get_all_start_methods()
+        ) :
+        results = [_correlate_chunk(x, y, chunk, method) for chunk in chunks]
+    else :
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers = max_workers,
+                mp_context = multiprocessing.get_context("fork")
+                ) as pool :
+            results = list(pool.map(_correlate_chunk,
+                                    [x] * len(chunks), [y] * len(chunks),
+                                    chunks, [method] * len(chunks)
+                                    ))
+
+    return np.concatenate(results, axis = 0)
+
+
+### bootstrap_correlate(table, attributes, responses, method = "pearson",
+###                     n_resamples = 2000, confidence = 0.95, seed = 24,
+###                     chunk_size = 256, max_workers = 1)
+# Correlates the attribute columns of table with the response columns
+# like fishproject.correlation.correlate() and adds percentile bootstrap
+# confidence intervals. Returns a BootstrapCI.
+###
+def bootstrap_correlate(table, attributes, responses, method = "pearson",
+                        n_resamples = 2000, confidence = 0.95, seed = 24,
+                        chunk_size = 256, max_workers = 1
+                        ) :
+    attributes = list(attributes)
+    responses = list(responses)
+    x = table[attributes].to_numpy(dtype = np.float64)
+    y = table[responses].to_numpy(dtype = np.float64)
+
+    r, n = correlation.correlation_matrix(x, y, method)
+
+    indexes = resample_indexes(len(table), n_resamples, seed)
+    samples = bootstrap_correlations(x, y, indexes, method,
+                                     chunk_size = chunk_size,
+                                     max_workers = max_workers
+                                     )
+
+    alpha = (1.0 - confidence) / 2
+    with np.errstate(invalid = "ignore") :
+        low, high = np.nanquantile(samples, [alpha, 1.0 - alpha], axis = 0)
+
+    def frame(values) :
+        return pd.DataFrame(values, index = attributes, columns = responses)
+
+    return BootstrapCI(r = frame(r),
+                       low = frame(low),
+                       high = frame(high),
+                       confidence = confidence,
+                       n_resamples = n_resamples,
+                       )
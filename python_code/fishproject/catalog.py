@@ -0,0 +1,282 @@
+# program		fishproject/catalog.py
+# purpose	    load the survey tables of data/ once, with clean names,
+#               compact dtypes and a binary cache
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  every table of TABLES is read with normalized column names: the
+#     utf-8 byte order mark, leading / trailing white space and newlines
+#     are removed and inner spaces become underscores (nov2024 has
+#     "﻿SiteN" and "pfloat_macrophytes "). the old march2023 names
+#     are renamed to the nov2024 ones (pf_ -> pflow_, pb_ -> pbottom_,
+#     pft_ -> pfloat_) and the eco region Site_N becomes SiteN.
+# 2)  every table is indexed by SiteN. the scripts that need SiteN as a
+#     column call reset_index().
+# 3)  dtypes are explicit: SiteN int16, integer columns (counts, codes)
+#     int32, text columns (State, eco_Letter, Title) category. measured
+#     values stay float64 so the correlations and UMAP inputs are the same
+#     as when the csv was read directly.
+# 4)  a table lists the files it can be read from in order. the genus
+#     counts of feb2024 were never added to data/, so "genus" falls back
+#     to the june2024 file.
+# 5)  the parsed table is cached column by column as .npy files (category
+#     columns as codes) with a .json of names and dtypes, next to the
+#     climate cache in data/cache/. the cache is used while the size and
+#     modification time of the csv are unchanged. when they change the
+#     sha256 of the csv decides: same content keeps the cache, other
+#     content rebuilds it.
+# 6)  loaded tables are also kept in memory, load_table() hands out
+#     copies so a script can modify its table freely.
+###
+
+### imports
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+
+### Docstring Data
+__all__ = ["TABLES", "INDEX", "normalize_name", "normalize_columns",
+           "find_table_file", "load_table", "load_catalog",
+           ]
+
+
+INDEX = "SiteN"
+
+# table name -> files to read it from, the first one found is used
+TABLES = {"environment" : ["seth_environmentalData_march2023.csv"],
+          "genus" : ["seth_genusCountData_feb2024.csv",
+                     "seth_genusCountData_june2024.csv"],
+          "environment_genus" : ["seth_environmentalGenusCountData_nov2024.csv"],
+          "eco_region" : ["seth_ecoRegionData.csv"],
+          }
+
+# old name prefix -> current name prefix
+_PREFIX_ALIASES = {"pf_" : "pflow_",
+                   "pb_" : "pbottom_",
+                   "pft_" : "pfloat_",
+                   }
+
+# old name -> current name
+_NAME_ALIASES = {"Site_N" : INDEX}
+
+_CACHE_VERSION = 1
+
+_loaded = {}
+
+
+### normalize_name(name)
+# Returns the normalized column name of name (see general note 1).
+###
+def normalize_name(name) :
+    name = str(name).replace("﻿", "").replace("\n", "").strip()
+    name = name.replace(" ", "_")
+
+    for old, new in _PREFIX_ALIASES.items() :
+        if name.startswith(old) :
+            name = new + name[len(old):]
+            break
+
+    return _NAME_ALIASES.get(name, name)
+
+
+### normalize_columns(frame)
+# Renames the columns of frame in place with normalize_name() and returns
+# it.
+###
+def normalize_columns(frame) :
+    frame.columns = [normalize_name(name) for name in frame.columns]
+
+    return frame
+
+
+### _data_dirs(data_dir)
+# Folders searched for the csv files: data_dir when given, else data/
+# and the working directory (the scripts are run from the repo root and
+# from python_code/) and the data/ folder of the repo.
+###
+def _data_dirs(data_dir) :
+    if data_dir is not None :
+        return [data_dir]
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+
+    return ["data", ".",
+            os.path.join(os.path.dirname(os.path.dirname(package_dir)), "data"),
+            ]
+
+
+### find_table_file(name, data_dir = None)
+# Path of the csv that table name is read from. Raises FileNotFoundError
+# when none of its files is found.
+###
+def find_table_file(name, data_dir = None) :
+    for folder in _data_dirs(data_dir) :
+        for file_name in TABLES[name] :
+            path = os.path.join(folder, file_name)
+            if os.path.exists(path) :
+                return path
+
+    raise FileNotFoundError("no file found for table " + repr(name) + ": " +
+                            ", ".join(TABLES[name])
+                            )
+
+
+### _compact(frame)
+# Applies the dtypes of general note 3 and sets the SiteN index.
+###
+def _compact(frame) :
+    dtypes = {}
+    for column in frame.columns :
+        kind = frame[column].dtype.kind
+        if column == INDEX :
+            dtypes[column] = np.int16
+        elif kind in "iub" :
+            dtypes[column] = np.int32
+        elif kind == "O" :
+            dtypes[column] = "category"
+
+    return frame.astype(dtypes).set_index(INDEX)
+
+
+### _file_hash(path)
+# sha256 of the content of path.
+###
+def _file_hash(path) :
+    digest = hashlib.sha256()
+    with open(path, "rb") as file :
+        for block in iter(lambda : file.read(1 << 20), b"") :
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+### _source_stamp(path)
+# Size and modification time of path.
+###
+def _source_stamp(path) :
+    stat = os.stat(path)
+
+    return {"size" : stat.st_size, "mtime_ns" : stat.st_mtime_ns}
+
+
+### _cache_folder(path, cache_dir)
+# Folder that holds the cache of the csv at path.
+###
+def _cache_folder(path, cache_dir) :
+    base = os.path.splitext(os.path.basename(path))[0]
+
+    return os.path.join(cache_dir, "catalog", base)
+
+
+### _read_cache(path, cache_dir)
+# Returns the cached table of path, or None when there is no valid cache.
+###
+def _read_cache(path, cache_dir) :
+    folder = _cache_folder(path, cache_dir)
+    meta_path = os.path.join(folder, "table.json")
+    if not os.path.exists(meta_path) :
+        return None
+
+    with open(meta_path) as file :
+        meta = json.load(file)
+    if meta.get("version") != _CACHE_VERSION :
+        return None
+
+    stamp = _source_stamp(path)
+    if meta["source"] != stamp :
+        if meta["sha256"] != _file_hash(path) :
+            return None
+
+        # touched but not changed, remember the new stamp
+        meta["source"] = stamp
+        with open(meta_path, "w") as file :
+            json.dump(meta, file)
+
+    columns = {}
+    for number, column in enumerate(meta["columns"]) :
+        values = np.load(os.path.join(folder, str(number) + ".npy"))
+        if column["dtype"] == "category" :
+            values = pd.Categorical.from_codes(values, column["categories"])
+        columns[column["name"]] = values
+
+    index = pd.Index(np.load(os.path.join(folder, "index.npy")), name = INDEX)
+
+    return pd.DataFrame(columns, index = index)
+
+
+### _write_cache(path, cache_dir, table)
+# Writes table as the cache of path. The .json is written last, so a
+# partly written cache is never used.
+###
+def _write_cache(path, cache_dir, table) :
+    folder = _cache_folder(path, cache_dir)
+    if os.path.exists(folder) :
+        shutil.rmtree(folder)
+    os.makedirs(folder)
+
+    columns = []
+    for number, name in enumerate(table.columns) :
+        values = table[name]
+        column = {"name" : name, "dtype" : str(values.dtype)}
+        if column["dtype"] == "category" :
+            column["categories"] = values.cat.categories.tolist()
+            values = values.cat.codes
+        np.save(os.path.join(folder, str(number) + ".npy"), values.to_numpy())
+        columns.append(column)
+
+    np.save(os.path.join(folder, "index.npy"), table.index.to_numpy())
+
+    meta = {"version" : _CACHE_VERSION,
+            "source" : _source_stamp(path),
+            "sha256" : _file_hash(path),
+            "columns" : columns,
+            }
+    with open(os.path.join(folder, "table.json"), "w") as file :
+        json.dump(meta, file)
+
+
+### load_table(name, data_dir = None, cache_dir = None, use_cache = True)
+# Returns a copy of table name of TABLES as a DataFrame indexed by SiteN.
+# The binary cache is kept in cache_dir (default: a "cache" folder next
+# to the csv).
+###
+def load_table(name, data_dir = None, cache_dir = None, use_cache = True) :
+    path = os.path.abspath(find_table_file(name, data_dir))
+    if cache_dir is None :
+        cache_dir = os.path.join(os.path.dirname(path), "cache")
+
+    stamp = _source_stamp(path)
+    memo = _loaded.get(path)
+    if use_cache and memo is not None and memo[0] == stamp :
+        return memo[1].copy()
+
+    table = _read_cache(path, cache_dir) if use_cache else None
+    if table is None :
+        table = _compact(normalize_columns(pd.read_csv(path)))
+        if use_cache :
+            _write_cache(path, cache_dir, table)
+
+    _loaded[path] = (stamp, table)
+
+    return table.copy()
+
+
+### load_catalog(names = None, data_dir = None, cache_dir = None,
+###              use_cache = True)
+# load_table() for the given table names (all of TABLES by default),
+# returned as a dict of name -> DataFrame.
+###
+def load_catalog(names = None, data_dir = None, cache_dir = None,
+                 use_cache = True
+                 ) :
+    if names is None :
+        names = list(TABLES)
+
+    return {name : load_table(name, data_dir, cache_dir, use_cache)
+            for name in names}
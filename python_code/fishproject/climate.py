@@ -0,0 +1,330 @@
+# program		fishproject/climate.py
+# purpose	    load the 10-day climate time series as a (segment, site,
+#               feature) array
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  envData10-DayTimeSeries_18f.csv has one row per 10-day segment and
+#     one "site_N.feature" column per site and climate feature. site_N is
+#     0-based, the survey tables use the 1-based SiteN, so site_0 is
+#     SiteN 1.
+# 2)  the parsed array is written to a binary cache (.npy plus a .json
+#     with the axis names). the .npy is opened memory-mapped, so loading
+#     from the cache does not read the whole file. the cache is rebuilt
+#     when the size or modification time of the csv changes.
+# 3)  iter_climate_windows() reads the same csv as a stream of fixed-size
+#     segment windows (only the requested columns are parsed), and
+#     summarize_windows() reduces such a stream to per site / feature
+#     statistics. memory then depends on the window size only, not on the
+#     length of the series.
+###
+
+### imports
+import json
+import os
+import re
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+### Docstring Data
+__all__ = ["CLIMATE_FILE", "ClimateSeries", "ClimateSummary",
+           "parse_climate_columns", "load_climate_series", "select_climate",
+           "iter_climate_windows", "summarize_windows",
+           ]
+
+
+CLIMATE_FILE = "envData10-DayTimeSeries_18f.csv"
+
+_SEGMENT_COLUMN = "Segment_10Day"
+_SITE_COLUMN = re.compile(r"^site_(\d+)\.(.+)$")
+
+
+### ClimateSeries
+# values   : float32 array [segment][site][feature]
+# segments : Segment_10Day number of every row of values
+# sites    : 1-based SiteN of every site column
+# features : name of every feature (e.g. "maxT", "palmer_z")
+###
+class ClimateSeries(typing.NamedTuple) :
+    values : np.ndarray
+    segments : np.ndarray
+    sites : np.ndarray
+    features : list
+
+
+### ClimateSummary
+# Per site / feature statistics of a whole series, arrays [site][feature].
+###
+class ClimateSummary(typing.NamedTuple) :
+    count : np.ndarray
+    mean : np.ndarray
+    std : np.ndarray
+    minimum : np.ndarray
+    maximum : np.ndarray
+    sites : np.ndarray
+    features : list
+
+
+### parse_climate_columns(columns)
+# Splits the "site_N.feature" header into the SiteN values (N + 1) and
+# the feature names, and returns (sites, features, order) where order
+# lists the column names site by site in feature order. Raises
+# ValueError when a site is missing one of the features.
+###
+def parse_climate_columns(columns) :
+    features = []
+    site_features = {}
+    for column in columns :
+        if column == _SEGMENT_COLUMN :
+            continue
+
+        match = _SITE_COLUMN.match(column)
+        if match is None :
+            raise ValueError("unexpected climate column " + repr(column))
+
+        site = int(match.group(1)) + 1
+        feature = match.group(2)
+        if feature not in features :
+            features.append(feature)
+        site_features.setdefault(site, set()).add(feature)
+
+    sites = sorted(site_features)
+    for site in sites :
+        if site_features[site] != set(features) :
+            raise ValueError("site_" + str(site - 1) +
+                             " does not have all climate features"
+                             )
+
+    order = ["site_" + str(site - 1) + "." + feature
+             for site in sites
+             for feature in features]
+
+    return np.array(sites), features, order
+
+
+### _cache_paths(path, cache_dir)
+# Paths of the .npy and .json cache files of the csv at path.
+###
+def _cache_paths(path, cache_dir) :
+    base = os.path.splitext(os.path.basename(path))[0]
+
+    return (os.path.join(cache_dir, base + ".npy"),
+            os.path.join(cache_dir, base + ".json"),
+            )
+
+
+### _source_stamp(path)
+# Size and modification time of the source csv, stored with the cache.
+###
+def _source_stamp(path) :
+    stat = os.stat(path)
+
+    return {"size" : stat.st_size, "mtime_ns" : stat.st_mtime_ns}
+
+
+### _read_cache(path, cache_dir)
+# Returns the cached ClimateSeries of path, or None when there is no
+# cache or it is out of date.
+###
+def _read_cache(path, cache_dir) :
+    array_path, meta_path = _cache_paths(path, cache_dir)
+    if not (os.path.exists(array_path) and os.path.exists(meta_path)) :
+        return None
+
+    with open(meta_path) as file :
+        meta = json.load(file)
+    if meta.get("source") != _source_stamp(path) :
+        return None
+
+    return ClimateSeries(values = np.load(array_path, mmap_mode = "r"),
+                         segments = np.array(meta["segments"]),
+                         sites = np.array(meta["sites"]),
+                         features = list(meta["features"]),
+                         )
+
+
+### _write_cache(path, cache_dir, series)
+# Writes series as the binary cache of path. The .json is written last,
+# so a cache without its .json is never used.
+###
+def _write_cache(path, cache_dir, series) :
+    os.makedirs(cache_dir, exist_ok = True)
+    array_path, meta_path = _cache_paths(path, cache_dir)
+
+    if os.path.exists(meta_path) :
+        os.remove(meta_path)
+    np.save(array_path, series.values)
+
+    meta = {"source" : _source_stamp(path),
+            "segments" : series.segments.tolist(),
+            "sites" : series.sites.tolist(),
+            "features" : series.features,
+            }
+    with open(meta_path, "w") as file :
+        json.dump(meta, file)
+
+
+### load_climate_series(path, cache_dir = None, use_cache = True)
+# Loads the climate csv at path as a ClimateSeries. The binary cache is
+# kept in cache_dir (default: a "cache" folder next to the csv).
+###
+def load_climate_series(path, cache_dir = None, use_cache = True) :
+    if cache_dir is None :
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)),
+                                 "cache"
+                                 )
+
+    if use_cache :
+        series = _read_cache(path, cache_dir)
+        if series is not None :
+            return series
+
+    header = pd.read_csv(path, nrows = 0).columns
+    sites, features, order = parse_climate_columns(header)
+
+    table = pd.read_csv(path,
+                        dtype = dict({column : np.float32 for column in order},
+                                     **{_SEGMENT_COLUMN : np.int32})
+                        )
+
+    values = np.ascontiguousarray(table[order].to_numpy(dtype = np.float32))
+    series = ClimateSeries(values = values.reshape(len(table),
+                                                   len(sites),
+                                                   len(features)),
+                           segments = table[_SEGMENT_COLUMN].to_numpy(),
+                           sites = sites,
+                           features = features,
+                           )
+
+    if use_cache :
+        _write_cache(path, cache_dir, series)
+
+    return series
+
+
+### select_climate(series, sites = None, features = None)
+# Returns the part of series with the given SiteN values and feature
+# names (all when None), in the order they are given.
+###
+def select_climate(series, sites = None, features = None) :
+    site_index = np.arange(len(series.sites))
+    if sites is not None :
+        lookup = {site : index for index, site in enumerate(series.sites)}
+        site_index = np.array([lookup[site] for site in sites], dtype = np.intp)
+
+    feature_index = np.arange(len(series.features))
+    if features is not None :
+        feature_index = np.array([series.features.index(feature)
+                                  for feature in features], dtype = np.intp)
+
+    values = np.asarray(series.values)[:, site_index][:, :, feature_index]
+
+    return ClimateSeries(values = values,
+                         segments = series.segments,
+                         sites = series.sites[site_index],
+                         features = [series.features[i] for i in feature_index],
+                         )
+
+
+### iter_climate_windows(path, window, sites = None, features = None)
+# Generator over the climate csv at path that yields a ClimateSeries for
+# every window segments (the last one may be shorter). Only the columns
+# of the given SiteN values and feature names (all when None) are
+# parsed, and only one window is held in memory at a time.
+###
+def iter_climate_windows(path, window, sites = None, features = None) :
+    header = pd.read_csv(path, nrows = 0).columns
+    all_sites, all_features, order = parse_climate_columns(header)
+
+    if sites is None :
+        sites = all_sites
+    if features is None :
+        features = all_features
+
+    missing = (set(sites) - set(all_sites.tolist()) or
+               set(features) - set(all_features))
+    if missing :
+        raise ValueError("not in the climate series: " + repr(sorted(missing)))
+
+    columns = ["site_" + str(site - 1) + "." + feature
+               for site in sites
+               for feature in features]
+
+    reader = pd.read_csv(path,
+                         usecols = [_SEGMENT_COLUMN] + columns,
+                         dtype = dict({column : np.float32 for column in columns},
+                                      **{_SEGMENT_COLUMN : np.int32}),
+                         chunksize = int(window)
+                         )
+
+    with reader :
+        for chunk in reader :
+            values = chunk[columns].to_numpy(dtype = np.float32)
+
+            yield ClimateSeries(values = values.reshape(len(chunk),
+                                                        len(sites),
+                                                        len(features)),
+                                segments = chunk[_SEGMENT_COLUMN].to_numpy(),
+                                sites = np.array(sites),
+                                features = list(features),
+                                )
+
+
+### summarize_windows(windows)
+# Reduces an iterable of ClimateSeries windows (e.g. from
+# iter_climate_windows()) to a ClimateSummary in constant memory. Means
+# and variances are merged window by window (Chan et al. pairwise
+# update), so they stay accurate for long series. nan values are
+# ignored.
+###
+def summarize_windows(windows) :
+    count = mean = m2 = minimum = maximum = None
+    sites = features = None
+
+    for window in windows :
+        values = np.asarray(window.values, dtype = np.float64)
+        valid = ~np.isnan(values)
+
+        w_count = valid.sum(axis = 0)
+        w_sum = np.where(valid, values, 0.0).sum(axis = 0)
+        w_mean = np.divide(w_sum, w_count,
+                           out = np.zeros_like(w_sum), where = w_count > 0)
+        w_m2 = np.where(valid, (values - w_mean) ** 2, 0.0).sum(axis = 0)
+        w_min = np.where(valid, values, np.inf).min(axis = 0)
+        w_max = np.where(valid, values, -np.inf).max(axis = 0)
+
+        if count is None :
+            count, mean, m2 = w_count, w_mean, w_m2
+            minimum, maximum = w_min, w_max
+            sites, features = window.sites, window.features
+            continue
+
+        total = count + w_count
+        delta = w_mean - mean
+        scale = np.divide(w_count, total,
+                          out = np.zeros_like(delta), where = total > 0)
+        mean = mean + delta * scale
+        m2 = m2 + w_m2 + delta ** 2 * count * scale
+        count = total
+        minimum = np.minimum(minimum, w_min)
+        maximum = np.maximum(maximum, w_max)
+
+    if count is None :
+        raise ValueError("no climate windows to summarize")
+
+    empty = count == 0
+    std = np.sqrt(np.divide(m2, count, out = np.zeros_like(m2),
+                            where = ~empty))
+
+    return ClimateSummary(count = count,
+                          mean = np.where(empty, np.nan, mean),
+                          std = np.where(empty, np.nan, std),
+                          minimum = np.where(empty, np.nan, minimum),
+                          maximum = np.where(empty, np.nan, maximum),
+                          sites = sites,
+                          features = features,
+                          )
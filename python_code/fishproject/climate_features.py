@@ -0,0 +1,132 @@
+# program		fishproject/climate_features.py
+# purpose	    per-site summaries of the climate series for joining onto
+#               the survey tables
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  every statistic is one reduction over the segment axis of the
+#     [segment][site][feature] array, so all sites and features are done
+#     at once. seasonal means are a single matrix product of a
+#     [season][segment] weight matrix with the series.
+# 2)  the series has no calendar dates. segment n is taken to start on day
+#     start_day + 10 * n, with 365.25 days per year (36.5 segments). the
+#     default start_day = 0 puts segment 0 on January 1st.
+# 3)  the result is a DataFrame indexed by SiteN with one
+#     "<feature>_<statistic>" column per feature and statistic, e.g.
+#     "maxT_mean", "precipitation_p90", "palmer_z_summer".
+###
+
+### imports
+import numpy as np
+import pandas as pd
+
+
+### Docstring Data
+__all__ = ["SEASONS", "season_weights", "site_climate_features",
+           "join_climate_features",
+           ]
+
+
+# day-of-year ranges [start, end) of the seasons. winter wraps around the
+# end of the year
+SEASONS = {"winter" : (335, 60),
+           "spring" : (60, 152),
+           "summer" : (152, 244),
+           "fall" : (244, 335),
+           }
+
+_DAYS_PER_YEAR = 365.25
+_DAYS_PER_SEGMENT = 10
+
+
+### season_weights(segments, seasons = SEASONS, start_day = 0)
+# Returns a [season][segment] 0/1 float matrix telling which season every
+# segment falls in (by the day of year the segment starts on).
+###
+def season_weights(segments, seasons = SEASONS, start_day = 0) :
+    day = np.mod(start_day + _DAYS_PER_SEGMENT * np.asarray(segments),
+                 _DAYS_PER_YEAR)
+
+    weights = np.zeros((len(seasons), len(day)))
+    for row, (start, end) in enumerate(seasons.values()) :
+        if start <= end :
+            weights[row] = (day >= start) & (day < end)
+        else :
+            weights[row] = (day >= start) | (day < end)
+
+    return weights
+
+
+### site_climate_features(series, percentiles = (10, 50, 90),
+###                       seasons = SEASONS, start_day = 0)
+# Summarizes a fishproject.climate.ClimateSeries per site: mean, std,
+# min, max, the given percentiles and the mean of every season, for every
+# feature. nan values are ignored. Returns a DataFrame indexed by SiteN.
+###
+def site_climate_features(series, percentiles = (10, 50, 90),
+                          seasons = SEASONS, start_day = 0
+                          ) :
+    values = np.asarray(series.values, dtype = np.float64)
+    n_segments, n_sites, n_features = values.shape
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    count = valid.sum(axis = 0)
+
+    stats = {}
+    with np.errstate(invalid = "ignore", divide = "ignore") :
+        stats["mean"] = filled.sum(axis = 0) / count
+        stats["std"] = np.sqrt((np.where(valid, values - stats["mean"], 0.0) ** 2)
+                               .sum(axis = 0) / count)
+        stats["min"] = np.where(count > 0,
+                                np.where(valid, values, np.inf).min(axis = 0),
+                                np.nan)
+        stats["max"] = np.where(count > 0,
+                                np.where(valid, values, -np.inf).max(axis = 0),
+                                np.nan)
+
+        if len(percentiles) :
+            ranked = np.nanpercentile(values, percentiles, axis = 0)
+            for q, result in zip(percentiles, ranked) :
+                stats["p" + format(q, "g")] = result
+
+        # [season][segment] @ [segment][site * feature]
+        weights = season_weights(series.segments, seasons, start_day)
+        season_sum = weights @ filled.reshape(n_segments, -1)
+        season_count = weights @ valid.reshape(n_segments, -1)
+        season_mean = (season_sum / season_count).reshape(len(seasons),
+                                                          n_sites,
+                                                          n_features)
+        for name, result in zip(seasons, season_mean) :
+            stats[name] = result
+
+    columns = {}
+    for f, feature in enumerate(series.features) :
+        for name, result in stats.items() :
+            columns[feature + "_" + name] = result[:, f]
+
+    table = pd.DataFrame(columns, index = pd.Index(series.sites, name = "SiteN"))
+
+    return table
+
+
+### join_climate_features(site_table, features)
+# Joins the output of site_climate_features() onto a survey table indexed
+# by SiteN (the fishproject.catalog tables) or with a SiteN column (e.g.
+# seth_environmentalGenusCountData_nov2024.csv read with pandas). Sites
+# without climate data get nan.
+###
+def join_climate_features(site_table, features) :
+    if "SiteN" not in site_table.columns :
+        return site_table.merge(features,
+                                how = "left",
+                                left_index = True,
+                                right_index = True,
+                                )
+
+    return site_table.merge(features,
+                            how = "left",
+                            left_on = "SiteN",
+                            right_index = True,
+                            )
@@ -0,0 +1,118 @@
+# program		fishproject/climate_lags.py
+# purpose	    lagged cross-correlation between climate features
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  for a feature pair (lead, follow) the correlation at lag k is
+#     sum_t x[t] * y[t + k] / n over the standardized series x of lead and
+#     y of follow at the same site. a peak at a positive lag k means lead
+#     is ahead of follow by k 10-day segments.
+# 2)  all sites and pairs are done at once: the series are zero padded to
+#     at least 2n - 1 samples so the circular correlation of rfft / irfft
+#     equals the linear one, and the transform runs along the segment axis
+#     of a [segment][site][pair] array.
+# 3)  nan values are treated as the mean of the series (0 after
+#     standardizing), so they do not add to the correlation.
+###
+
+### imports
+import typing
+
+import numpy as np
+
+
+### Docstring Data
+__all__ = ["LagCorrelation", "lagged_cross_correlation", "peak_lags"]
+
+
+### LagCorrelation
+# lags     : lag of every row of values, in segments
+# values   : correlation array [lag][site][pair]
+# peak_lag : lag of the largest absolute correlation, array [site][pair]
+# peak     : correlation at peak_lag (signed), array [site][pair]
+# sites    : SiteN of every site column
+# pairs    : (lead, follow) feature names of every pair column
+###
+class LagCorrelation(typing.NamedTuple) :
+    lags : np.ndarray
+    values : np.ndarray
+    peak_lag : np.ndarray
+    peak : np.ndarray
+    sites : np.ndarray
+    pairs : list
+
+
+### _standardize(values)
+# Standardizes values along axis 0 and replaces nan with 0. Constant
+# series become all 0.
+###
+def _standardize(values) :
+    with np.errstate(invalid = "ignore", divide = "ignore") :
+        mean = np.nanmean(values, axis = 0)
+        std = np.nanstd(values, axis = 0)
+        result = (values - mean) / std
+
+    return np.where(np.isfinite(result), result, 0.0)
+
+
+### _fft_length(n)
+# Smallest power of two that holds a linear correlation of length n
+# series.
+###
+def _fft_length(n) :
+    return 1 << int(2 * n - 2).bit_length()
+
+
+### peak_lags(lags, values)
+# Returns (peak_lag, peak) of a [lag][...] correlation array: the lag of
+# the largest absolute correlation and the signed correlation there.
+###
+def peak_lags(lags, values) :
+    index = np.argmax(np.abs(values), axis = 0)
+    peak = np.take_along_axis(values, index[np.newaxis], axis = 0)[0]
+
+    return np.asarray(lags)[index], peak
+
+
+### lagged_cross_correlation(series, pairs, max_lag = None)
+# Correlates the features of a fishproject.climate.ClimateSeries at every
+# site for every (lead, follow) pair of feature names, at lags -max_lag
+# to max_lag (default: every lag the series allows). Returns a
+# LagCorrelation.
+###
+def lagged_cross_correlation(series, pairs, max_lag = None) :
+    values = np.asarray(series.values, dtype = np.float64)
+    n_segments = values.shape[0]
+
+    if max_lag is None :
+        max_lag = n_segments - 1
+    max_lag = min(int(max_lag), n_segments - 1)
+
+    pairs = [tuple(pair) for pair in pairs]
+    lead = [series.features.index(pair[0]) for pair in pairs]
+    follow = [series.features.index(pair[1]) for pair in pairs]
+
+    # standardize each feature once, then pick the pair columns
+    scaled = _standardize(values)
+    x = scaled[:, :, lead]
+    y = scaled[:, :, follow]
+
+    size = _fft_length(n_segments)
+    spectrum = np.conj(np.fft.rfft(x, n = size, axis = 0))
+    spectrum *= np.fft.rfft(y, n = size, axis = 0)
+    circular = np.fft.irfft(spectrum, n = size, axis = 0)
+
+    # negative lags wrap around to the end of the circular result
+    lags = np.arange(-max_lag, max_lag + 1)
+    correlation = circular[lags % size] / n_segments
+
+    peak_lag, peak = peak_lags(lags, correlation)
+
+    return LagCorrelation(lags = lags,
+                          values = correlation,
+                          peak_lag = peak_lag,
+                          peak = peak,
+                          sites = series.sites,
+                          pairs = pairs,
+                          )
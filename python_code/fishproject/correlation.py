@@ -0,0 +1,156 @@
+# program		fishproject/correlation.py
+# purpose	    correlation of site attributes with fish responses in one
+#               matrix product
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  correlate() returns every attribute x response correlation at once,
+#     instead of one full DataFrame.corr() per response. the columns are
+#     centered and the whole [attribute][response] block comes from one
+#     matrix product, so all 30 genus columns cost about as much as one.
+# 2)  pearson_matrix() works on [..., row, column] arrays, so a stack of
+#     resampled or permuted tables (see fishproject.bootstrap and
+#     fishproject.permutation) is correlated in one batched call.
+# 3)  nan values are handled pairwise like DataFrame.corr(): a row counts
+#     for a pair of columns when both values are there. for "spearman"
+#     every column is ranked over its own non-nan values, which is the same
+#     as pandas when there are no nan values (the survey tables have none).
+# 4)  p-values are two sided, from the t distribution with n - 2 degrees
+#     of freedom (the same as scipy.stats.pearsonr / spearmanr).
+###
+
+### imports
+import typing
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+### Docstring Data
+__all__ = ["METHODS", "Correlation", "rank_columns", "pearson_matrix",
+           "correlation_matrix", "correlation_pvalues", "correlate",
+           ]
+
+
+METHODS = ("pearson", "spearman")
+
+
+### Correlation
+# r : correlation, DataFrame [attribute][response]
+# p : two sided p-value of r, same shape
+# n : number of rows used for every pair, same shape
+###
+class Correlation(typing.NamedTuple) :
+    r : pd.DataFrame
+    p : pd.DataFrame
+    n : pd.DataFrame
+
+
+### rank_columns(x)
+# Ranks every column of x ([..., row, column]) with ties getting their
+# average rank. nan values stay nan and do not take a rank.
+###
+def rank_columns(x) :
+    x = np.asarray(x, dtype = np.float64)
+    missing = np.isnan(x)
+
+    # nan sorts last as +inf, so the other values keep the ranks 1..k
+    ranks = stats.rankdata(np.where(missing, np.inf, x), axis = -2)
+
+    return np.where(missing, np.nan, ranks)
+
+
+### pearson_matrix(x, y)
+# Pearson correlation of every column of x with every column of y, both
+# [..., row, column] arrays with the same rows. Returns (r, n), arrays
+# [..., x column][y column], n being the number of rows used.
+###
+def pearson_matrix(x, y) :
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    x_valid = ~np.isnan(x)
+    y_valid = ~np.isnan(y)
+
+    with np.errstate(invalid = "ignore", divide = "ignore") :
+        if x_valid.all() and y_valid.all() :
+            xc = x - x.mean(axis = -2, keepdims = True)
+            yc = y - y.mean(axis = -2, keepdims = True)
+
+            cov = np.swapaxes(xc, -1, -2) @ yc
+            x_var = (xc ** 2).sum(axis = -2)
+            y_var = (yc ** 2).sum(axis = -2)
+            r = cov / np.sqrt(x_var[..., :, np.newaxis] *
+                              y_var[..., np.newaxis, :])
+            n = np.full(r.shape, x.shape[-2])
+        else :
+            # centered first to keep the sums small, then summed over the
+            # rows where both columns have a value
+            xc = np.where(x_valid, x - np.nanmean(x, axis = -2, keepdims = True), 0.0)
+            yc = np.where(y_valid, y - np.nanmean(y, axis = -2, keepdims = True), 0.0)
+            xw = np.swapaxes(x_valid.astype(np.float64), -1, -2)
+            yw = y_valid.astype(np.float64)
+            xt = np.swapaxes(xc, -1, -2)
+
+            n = xw @ yw
+            x_sum = xt @ yw
+            y_sum = xw @ yc
+            cov = xt @ yc - x_sum * y_sum / n
+            x_var = np.swapaxes(xc ** 2, -1, -2) @ yw - x_sum ** 2 / n
+            y_var = xw @ (yc ** 2) - y_sum ** 2 / n
+            r = cov / np.sqrt(x_var * y_var)
+            n = n.astype(np.int64)
+
+    return np.clip(r, -1.0, 1.0), n
+
+
+### correlation_matrix(x, y, method = "pearson")
+# pearson_matrix() for "pearson", or the same on the column ranks for
+# "spearman".
+###
+def correlation_matrix(x, y, method = "pearson") :
+    if method not in METHODS :
+        raise ValueError("method must be one of " + repr(METHODS))
+
+    if method == "spearman" :
+        x = rank_columns(x)
+        y = rank_columns(y)
+
+    return pearson_matrix(x, y)
+
+
+### correlation_pvalues(r, n)
+# Two sided p-values of correlations r computed from n rows each.
+###
+def correlation_pvalues(r, n) :
+    r = np.asarray(r, dtype = np.float64)
+    dof = np.asarray(n, dtype = np.float64) - 2
+
+    with np.errstate(invalid = "ignore", divide = "ignore") :
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+
+    return np.where(dof > 0, p, np.nan)
+
+
+### correlate(table, attributes, responses, method = "pearson")
+# Correlates the attribute columns of table with the response columns
+# (e.g. ["t_population", "t_species"] or all the genus columns). Returns
+# a Correlation of DataFrames indexed by attribute with one column per
+# response.
+###
+def correlate(table, attributes, responses, method = "pearson") :
+    attributes = list(attributes)
+    responses = list(responses)
+
+    r, n = correlation_matrix(table[attributes].to_numpy(dtype = np.float64),
+                              table[responses].to_numpy(dtype = np.float64),
+                              method
+                              )
+    p = correlation_pvalues(r, n)
+
+    def frame(values) :
+        return pd.DataFrame(values, index = attributes, columns = responses)
+
+    return Correlation(r = frame(r), p = frame(p), n = frame(n))
@@ -0,0 +1,171 @@
+# program		fishproject/distances.py
+# purpose	    site x site distance matrices shared by all UMAP fits of the
+#               same table
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  every UMAP of a table starts from the same pairwise distances of its
+#     rows. distance_matrix() computes them once per (table, metric) and
+#     knn_graph() turns them into the nearest neighbor graph each fit gets
+#     as precomputed_knn, so no fit computes the distances again.
+# 2)  below small_rows sites the matrix is sklearn's pairwise_distances()
+#     of the float32 data, which is what UMAP computes itself for data
+#     under 4096 rows: the fits give the same embeddings as before. from
+#     small_rows up, correlation distances are computed in float32 blocks
+#     of block_rows rows (1 - the dot products of the centered, unit
+#     length rows), which needs no float64 copy of the matrix.
+# 3)  the fits still use metric = "correlation" and not "precomputed". a
+#     precomputed metric would make UMAP run its pca init on the distance
+#     matrix instead of the data (and drop transform()), which changes
+#     every figure.
+# 4)  matrices are cached in the embedding cache folder under the hash of
+#     the input (fishproject.embedding_cache.embedding_key with the model
+#     name "distances"), and evicted with the embeddings.
+# 5)  only the METRICS that sklearn computes the same way as UMAP are
+#     supported, distance_matrix() raises a ValueError for any other
+#     metric (UMAP only metrics like "hellinger", callables, ...).
+#     shared_knn_graphs() leaves the jobs with such a metric or with
+#     metric_kwds out, UMAP then finds their neighbors itself.
+###
+
+### imports
+import numpy as np
+
+from fishproject import embedding_cache
+
+
+### Docstring Data
+__all__ = ["small_rows", "METRICS", "correlation_distances",
+           "distance_matrix", "knn_graph", "shared_knn_graphs",
+           ]
+
+
+### Settings
+small_rows = 4096
+block_rows = 1024
+
+# metrics with the same name and meaning in sklearn and UMAP
+METRICS = ("euclidean", "l2", "manhattan", "cityblock", "l1", "chebyshev",
+           "canberra", "braycurtis", "cosine", "correlation", "hamming",
+           )
+
+
+### correlation_distances(data, block_rows = block_rows)
+# Correlation distances between the rows of data as a float32 [row][row]
+# array, computed block_rows rows at a time. Rows with no variance are at
+# distance 1 from every other row.
+###
+def correlation_distances(data, block_rows = block_rows) :
+    values = np.asarray(data, dtype = np.float32)
+    values = values - values.mean(axis = 1, keepdims = True)
+
+    norms = np.linalg.norm(values, axis = 1, keepdims = True)
+    values = np.divide(values, norms, out = np.zeros_like(values),
+                       where = norms > 0
+                       )
+
+    n_rows = values.shape[0]
+    distances = np.empty((n_rows, n_rows), dtype = np.float32)
+    for start in range(0, n_rows, block_rows) :
+        stop = min(start + block_rows, n_rows)
+        block = distances[start : stop]
+
+        np.matmul(values[start : stop], values.T, out = block)
+        np.subtract(1, block, out = block)
+        np.clip(block, 0, 2, out = block)
+        block[np.arange(stop - start), np.arange(start, stop)] = 0
+
+    return distances
+
+
+### distance_matrix(data, metric = "correlation", cache_dir = None,
+###                 max_bytes = None)
+# The [row][row] distance matrix of the rows of data (see general note 2),
+# loaded from or saved to the cache in cache_dir when one is given.
+# Raises ValueError when metric is not one of METRICS.
+###
+def distance_matrix(data, metric = "correlation", cache_dir = None,
+                    max_bytes = None
+                    ) :
+    if metric not in METRICS :
+        raise ValueError("shared distances are not supported for metric " +
+                         repr(metric) + ", it must be one of " +
+                         repr(METRICS)
+                         )
+
+    if cache_dir is not None :
+        key = embedding_cache.embedding_key(data, {"metric" : metric},
+                                            "distances"
+                                            )
+        distances = embedding_cache.load_embedding(cache_dir, key)
+        if distances is not None :
+            return distances
+
+    values = np.asarray(data, dtype = np.float32)
+    if metric == "correlation" and values.shape[0] >= small_rows :
+        distances = correlation_distances(values)
+    else :
+        from sklearn.metrics import pairwise_distances
+
+        distances = pairwise_distances(values, metric = metric)
+
+    if cache_dir is not None :
+        embedding_cache.save_embedding(cache_dir, key, distances, max_bytes)
+
+    return distances
+
+
+### knn_graph(distances, n_neighbors)
+# The exact nearest neighbor graph of a [row][row] distance matrix as
+# UMAP builds it: returns (indices, dists), arrays [row][neighbor] with
+# the row itself first. Ties go to the lower row number.
+###
+def knn_graph(distances, n_neighbors) :
+    if distances.shape[0] < small_rows :
+        indices = np.argsort(distances, axis = 1, kind = "stable")[:, :n_neighbors]
+    else :
+        # sort only the n_neighbors closest rows of every row
+        indices = np.argpartition(distances, n_neighbors - 1,
+                                  axis = 1)[:, :n_neighbors]
+        order = np.argsort(np.take_along_axis(distances, indices, axis = 1),
+                           axis = 1, kind = "stable"
+                           )
+        indices = np.take_along_axis(indices, order, axis = 1)
+
+    dists = np.take_along_axis(distances, indices, axis = 1)
+
+    return indices, dists.astype(np.float32)
+
+
+### shared_knn_graphs(jobs, cache_dir = None, max_bytes = None)
+# For jobs, a dict of name -> (params, data) with params the umap.UMAP()
+# keyword arguments, returns name -> precomputed_knn. The distance matrix
+# of every (data, metric) is computed (or loaded) once, the graph of every
+# (data, metric, n_neighbors) is built once. Jobs whose metric is not one
+# of METRICS or that have metric_kwds get no graph (see general note 5).
+###
+def shared_knn_graphs(jobs, cache_dir = None, max_bytes = None) :
+    matrices = {}
+    graphs = {}
+    knn = {}
+    for name, (params, data) in jobs.items() :
+        metric = params.get("metric", "euclidean")
+        n_neighbors = params.get("n_neighbors", 15)
+        if metric not in METRICS or params.get("metric_kwds") :
+            continue
+
+        # the same table object is usually shared by several jobs
+        table = (id(data), metric)
+        if table not in matrices :
+            matrices[table] = distance_matrix(data, metric, cache_dir,
+                                              max_bytes
+                                              )
+        if table + (n_neighbors,) not in graphs :
+            graphs[table + (n_neighbors,)] = knn_graph(matrices[table],
+                                                       n_neighbors
+                                                       )
+
+        knn[name] = graphs[table + (n_neighbors,)]
+
+    return knn
@@ -0,0 +1,129 @@
+# program		fishproject/eco_regions.py
+# purpose	    eco-region of every site as integer coded arrays
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  seth_ecoRegionData.csv (catalog table "eco_region") is turned into
+#     integer codes once: every site gets a state code and a region code,
+#     and every region its state, its rank inside that state and the
+#     first site it occurs at. the figures then look up markers and
+#     colors by indexing, without comparing region titles.
+# 2)  states are numbered in order of their first site (TX 0, OK 1) and
+#     regions state by state in order of their first site, which is the
+#     order of the old eco_uniques_list. a region's marker comes from its
+#     state and its color from its rank inside the state.
+###
+
+### imports
+import typing
+
+import numpy as np
+import pandas as pd
+
+from fishproject import catalog
+
+
+### Docstring Data
+__all__ = ["EcoRegions", "eco_regions_from_table", "load_eco_regions",
+           "site_styles", "legend_styles",
+           ]
+
+
+### EcoRegions
+# sites        : SiteN of every site, sorted
+# states       : state names, in code order
+# state_code   : state code of every site
+# region_code  : region code of every site
+# region_state : state code of every region
+# region_rank  : rank of every region inside its state
+# first_site   : 0-based position of the first site of every region
+# labels       : legend label of every region ("33a: Title - TX")
+# masks        : bool array [region][site], True where the site is in
+#                the region
+###
+class EcoRegions(typing.NamedTuple) :
+    sites : np.ndarray
+    states : list
+    state_code : np.ndarray
+    region_code : np.ndarray
+    region_state : np.ndarray
+    region_rank : np.ndarray
+    first_site : np.ndarray
+    labels : list
+    masks : np.ndarray
+
+
+### eco_regions_from_table(table)
+# Builds EcoRegions from the catalog "eco_region" table (indexed by SiteN
+# with eco_Number, eco_Letter, Title and State columns).
+###
+def eco_regions_from_table(table) :
+    table = table.sort_index()
+
+    state_code, states = pd.factorize(np.asarray(table["State"], dtype = object))
+    raw_code, titles = pd.factorize(np.asarray(table["Title"], dtype = object))
+
+    # regions in order of first site, then grouped by state (stable)
+    raw_first = np.unique(raw_code, return_index = True)[1]
+    order = np.lexsort((raw_first, state_code[raw_first]))
+    remap = np.empty(len(order), dtype = np.intp)
+    remap[order] = np.arange(len(order))
+
+    region_code = remap[raw_code]
+    first_site = raw_first[order]
+    region_state = state_code[first_site]
+
+    state_start = np.searchsorted(region_state, region_state)
+    region_rank = np.arange(len(order)) - state_start
+
+    first_rows = table.iloc[first_site]
+    labels = (first_rows["eco_Number"].astype(str) +
+              first_rows["eco_Letter"].astype(str) + ": " +
+              first_rows["Title"].astype(str) + " - " +
+              first_rows["State"].astype(str)
+              ).tolist()
+
+    masks = region_code[np.newaxis, :] == np.arange(len(order))[:, np.newaxis]
+
+    return EcoRegions(sites = table.index.to_numpy(),
+                      states = list(states),
+                      state_code = state_code,
+                      region_code = region_code,
+                      region_state = region_state,
+                      region_rank = region_rank,
+                      first_site = first_site,
+                      labels = labels,
+                      masks = masks,
+                      )
+
+
+### load_eco_regions(data_dir = None)
+# EcoRegions of seth_ecoRegionData.csv, read through fishproject.catalog.
+###
+def load_eco_regions(data_dir = None) :
+    return eco_regions_from_table(catalog.load_table("eco_region", data_dir))
+
+
+### site_styles(eco, color_list)
+# Returns (site_marker_index, site_colors): the marker index (state code)
+# and the color of every site, the colors taken from color_list by the
+# rank of the site's region inside its state.
+###
+def site_styles(eco, color_list) :
+    region_colors = np.asarray(color_list, dtype = object)[eco.region_rank]
+
+    return eco.region_state[eco.region_code], region_colors[eco.region_code]
+
+
+### legend_styles(eco, markers, color_list)
+# Returns (sites, markers, colors, labels) of the eco-region legend, one
+# entry per region: the site the legend entry is drawn at, the marker of
+# its state, its color and its label.
+###
+def legend_styles(eco, markers, color_list) :
+    return (eco.first_site.tolist(),
+            [markers[state] for state in eco.region_state],
+            [color_list[rank] for rank in eco.region_rank],
+            list(eco.labels),
+            )
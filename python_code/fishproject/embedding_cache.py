@@ -0,0 +1,224 @@
+# program		fishproject/embedding_cache.py
+# purpose	    on-disk cache for UMAP embeddings
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  an embedding is stored under the sha256 of the input matrix (shape
+#     and float64 values) and all the constructor parameters of the model,
+#     random_state included. for UMAP the parameters given are completed
+#     with the UMAP() defaults, so the keyword arguments of a fit and
+#     model.get_params() of the same model give the same key. any change
+#     to the data or to a UMAP parameter gives a new key, so a stale
+#     embedding is never returned.
+# 2)  entries are compressed .npz files. when the cache grows past
+#     max_bytes the least recently used entries are deleted.
+# 3)  the umap-learn version in the key comes from the installed package
+#     metadata and the UMAP() defaults from its source (umap/umap_.py), so
+#     a key can be computed (and a cached embedding loaded) without
+#     importing umap, which takes seconds.
+###
+
+### imports
+import ast
+import functools
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+
+### Docstring Data
+__all__ = ["embedding_key", "load_embedding", "save_embedding",
+           "evict", "cached_fit_transform",
+           ]
+
+
+### _model_version()
+# Installed version of umap-learn, "" when it is not installed.
+###
+def _model_version() :
+    try :
+        return importlib.metadata.version("umap-learn")
+    except importlib.metadata.PackageNotFoundError :
+        return getattr(sys.modules.get("umap"), "__version__", "")
+
+
+### _init_defaults(path, class_name)
+# Default values of the __init__ arguments of class_name in the python
+# source file path, read without importing it. None when the class is
+# not found or a default is not a literal.
+###
+def _init_defaults(path, class_name) :
+    with open(path) as file :
+        tree = ast.parse(file.read())
+
+    for node in tree.body :
+        if not (isinstance(node, ast.ClassDef) and node.name == class_name) :
+            continue
+
+        for function in node.body :
+            if not (isinstance(function, ast.FunctionDef)
+                    and function.name == "__init__") :
+                continue
+
+            args = function.args
+            named = args.args[len(args.args) - len(args.defaults):]
+            defaults = list(zip(named, args.defaults))
+            defaults += [(arg, default)
+                         for arg, default in zip(args.kwonlyargs,
+                                                 args.kw_defaults)
+                         if default is not None]
+            try :
+                return {arg.arg : ast.literal_eval(default)
+                        for arg, default in defaults}
+            except ValueError :
+                return None
+
+    return None
+
+
+### _model_defaults(model_name)
+# Constructor defaults of the model (general notes 1 and 3), {} for
+# models other than UMAP or when umap-learn is not installed.
+###
+@functools.lru_cache(maxsize = None)
+def _model_defaults(model_name) :
+    if model_name != "UMAP" :
+        return {}
+
+    spec = importlib.util.find_spec("umap")
+    if spec is None :
+        return {}
+
+    try :
+        defaults = _init_defaults(os.path.join(os.path.dirname(spec.origin),
+                                               "umap_.py"),
+                                  "UMAP"
+                                  )
+    except (OSError, SyntaxError) :
+        defaults = None
+    if defaults is not None :
+        return defaults
+
+    # the source is laid out differently, ask umap itself
+    import umap
+
+    return {name : parameter.default
+            for name, parameter in inspect.signature(umap.UMAP).parameters.items()
+            if parameter.default is not inspect.Parameter.empty}
+
+
+### embedding_key(data, params, model_name = "UMAP")
+# Returns the hex digest that identifies the embedding of data with the
+# given model parameters. params can be the keyword arguments of the model
+# or its get_params(), both give the same key.
+###
+def embedding_key(data, params, model_name = "UMAP") :
+    matrix = np.ascontiguousarray(np.asarray(data, dtype = np.float64))
+    version = _model_version()
+    params = dict(_model_defaults(model_name), **params)
+
+    digest = hashlib.sha256()
+    digest.update(str((model_name, version, matrix.shape)).encode())
+    digest.update(matrix.tobytes())
+    digest.update(json.dumps(params, sort_keys = True, default = repr).encode())
+
+    return digest.hexdigest()
+
+
+### _entry_path(cache_dir, key)
+# Path of the .npz file that holds the given key.
+###
+def _entry_path(cache_dir, key) :
+    return os.path.join(cache_dir, key + ".npz")
+
+
+### load_embedding(cache_dir, key)
+# Returns the cached embedding for key, or None if it is not cached. A hit
+# refreshes the modification time of the entry, which is what eviction
+# uses as the last access time.
+###
+def load_embedding(cache_dir, key) :
+    path = _entry_path(cache_dir, key)
+    if not os.path.exists(path) :
+        return None
+
+    try :
+        with np.load(path) as entry :
+            embedding = entry["embedding"]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) :
+        # unreadable (e.g. truncated) entries are treated as a miss
+        os.remove(path)
+        return None
+
+    os.utime(path)
+
+    return embedding
+
+
+### save_embedding(cache_dir, key, embedding, max_bytes = None)
+# Writes the embedding to the cache and evicts old entries if the cache
+# is now larger than max_bytes. The file is written under a temporary
+# name first so that an interrupted run never leaves a partial entry.
+###
+def save_embedding(cache_dir, key, embedding, max_bytes = None) :
+    os.makedirs(cache_dir, exist_ok = True)
+
+    path = _entry_path(cache_dir, key)
+    temp_path = path + ".tmp." + str(os.getpid())
+    with open(temp_path, "wb") as file :
+        np.savez_compressed(file, embedding = np.asarray(embedding))
+    os.replace(temp_path, path)
+
+    if max_bytes is not None :
+        evict(cache_dir, max_bytes, keep = key)
+
+
+### evict(cache_dir, max_bytes, keep = None)
+# Deletes the least recently used entries until the total size of the
+# cache is at most max_bytes. The entry named keep is never deleted.
+###
+def evict(cache_dir, max_bytes, keep = None) :
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir) :
+        if not name.endswith(".npz") :
+            continue
+
+        path = os.path.join(cache_dir, name)
+        stat = os.stat(path)
+        total += stat.st_size
+        if name != str(keep) + ".npz" :
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    for mtime, size, path in sorted(entries) :
+        if total <= max_bytes :
+            break
+
+        os.remove(path)
+        total -= size
+
+
+### cached_fit_transform(model, data, cache_dir, max_bytes = None)
+# Returns model.fit_transform(data), taken from the cache when the same
+# data was already embedded with the same parameters. Returns
+# (embedding, hit) where hit tells if the model was skipped.
+###
+def cached_fit_transform(model, data, cache_dir, max_bytes = None) :
+    key = embedding_key(data, model.get_params(), type(model).__name__)
+
+    embedding = load_embedding(cache_dir, key)
+    if embedding is not None :
+        return embedding, True
+
+    embedding = model.fit_transform(data)
+    save_embedding(cache_dir, key, embedding, max_bytes)
+
+    return embedding, False
@@ -0,0 +1,547 @@
+# program		fishproject/figures.py
+# purpose	    draw and save the UMAP figures of beaty_sethData_v4p2.py
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  every figure is described by an entry of FIGURES and drawn by
+#     draw_figure() from a context dict holding the precomputed data
+#     (embeddings, order indexes, scaled counts, styles). figure numbers
+#     and file names come from FIGURES, not from a running counter, so the
+#     Nth figure is always saved as <prefix>_figN.png.
+# 2)  render_figures() draws the figures one after another on screen like
+#     the script always did, or in headless mode with the Agg backend in
+#     worker processes, one task per group of figures that share an
+#     embedding. headless mode never calls plt.show().
+# 3)  like fishproject.fit_scheduler the workers are forked, or spawned
+#     on platforms without fork (the calling script needs an
+#     if __name__ == "__main__" guard then).
+# 4)  every figure is drawn in a fishproject.spans span "figure N" (with
+#     the saving as its own span); workers hand their spans back to the
+#     parent process.
+# 5)  in headless mode the figures of a group are drawn on one matplotlib
+#     figure (draw_figure_group()). the layers they share (legends, site
+#     centers, site labels) are built once and hidden or shown per figure,
+#     only the genus rings and the legend box are built for every figure.
+#     matplotlib artists can not be moved to another figure, so the layers
+#     are reused within a group and not across groups.
+# 6)  a 36 x 24 inch figure at 200 dpi has a 7200 x 4800 pixel canvas,
+#     about 130 MB of RGBA. every figure is closed right after it is saved
+#     (or shown) and render_figures() runs the garbage collector after
+#     every figure or group: pyplot figures are reference cycles, so a
+#     closed figure keeps its canvas and artists until the next full
+#     collection otherwise. with a memory_budget render_figures()
+#     runs only as many render workers as fit in it, preview_dpi draws
+#     smaller figures for quick looks. the figure spans report the peak
+#     RSS of every figure.
+# 7)  figures are saved with fishproject.saving: the canvas is drawn into
+#     a buffer and encoded (png, and webp / pdf with formats) by
+#     background threads while the next figure is drawn. render_figures()
+#     waits for the files before it returns, draw_figure() and
+#     draw_figure_group() leave that to fishproject.saving.flush().
+###
+
+### imports
+import concurrent.futures
+import gc
+import multiprocessing
+import os
+
+import matplotlib.pyplot as plt
+from matplotlib import collections
+
+from fishproject import layers
+from fishproject import saving
+from fishproject import spans
+
+
+### Docstring Data
+__all__ = ["FIGURES", "worker_bytes", "open_new_figure",
+           "add_corner_texts", "close_current_figure",
+           "figure_bytes", "render_bytes", "figure_layers", "draw_figure",
+           "draw_figure_group", "figure_groups", "render_figures",
+           ]
+
+
+### Settings
+# memory of a render worker without its figure (python, numpy, pandas,
+# matplotlib and the context), used for the memory budget
+worker_bytes = 160 * 2**20
+
+
+_TITLE = "UMAP Scatter Plot"
+_TITLE_WF = "UMAP Scatter Plot with Fish"
+
+_LEGEND_UR = {"loc" : "upper right", "bbox_to_anchor" : (1.0, 1.0)}
+_LEGEND_LR = {"loc" : "lower right", "bbox_to_anchor" : (1.0, 0.0)}
+_LEGEND_3D = {"loc" : "best"}
+_LEGEND_3D_WF = {"loc" : "upper left", "bbox_to_anchor" : (-0.4, 0.9)}
+
+
+# embedding  : key of the embedding in context["embeddings"]
+# genera     : draw the genus legend and rings (or only the rings of
+#              context["focus_genus"] when "focus")
+# labels     : key of the "#N" label offsets in context["label_offsets"],
+#              None for no labels
+FIGURES = {1 : {"embedding" : "site_2D", "title" : _TITLE,
+                "genera" : True, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, ncols = 3)},
+           2 : {"embedding" : "site_2D_2", "title" : _TITLE,
+                "genera" : False, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, ncols = 2)},
+           3 : {"embedding" : "site_2D_2", "title" : _TITLE,
+                "genera" : True, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, ncols = 3)},
+           4 : {"embedding" : "site_2D_3", "title" : _TITLE,
+                "genera" : True, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, bbox_to_anchor = (1.05, 1.0),
+                                ncols = 3)},
+           5 : {"embedding" : "site_2D_4", "title" : _TITLE,
+                "genera" : False, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, ncols = 2)},
+           6 : {"embedding" : "site_2D_4", "title" : _TITLE,
+                "genera" : True, "labels" : "2D",
+                "legend" : dict(_LEGEND_UR, ncols = 3)},
+           7 : {"embedding" : "site_3D", "title" : _TITLE,
+                "genera" : False, "labels" : None,
+                "legend" : dict(_LEGEND_3D, ncols = 2)},
+           8 : {"embedding" : "site_3D", "title" : _TITLE,
+                "genera" : False, "labels" : "3D",
+                "legend" : dict(_LEGEND_3D, ncols = 2)},
+           9 : {"embedding" : "site_wf_3D", "title" : _TITLE_WF,
+                "genera" : False, "labels" : "3D_wf",
+                "legend" : dict(_LEGEND_3D_WF, ncols = 2)},
+           10 : {"embedding" : "site_wf_3D", "title" : _TITLE_WF,
+                 "genera" : False, "labels" : None,
+                 "legend" : dict(_LEGEND_3D_WF, ncols = 2)},
+           11 : {"embedding" : "site_wf_2D", "title" : _TITLE_WF,
+                 "genera" : False, "labels" : "2D",
+                 "legend" : dict(_LEGEND_UR, ncols = 2)},
+           12 : {"embedding" : "site_wf_2D", "title" : _TITLE_WF,
+                 "genera" : True, "labels" : "2D",
+                 "legend" : dict(_LEGEND_LR, ncols = 3)},
+           13 : {"embedding" : "site_wf_2D", "title" : _TITLE_WF,
+                 "genera" : "focus", "labels" : "2D",
+                 "legend" : dict(_LEGEND_LR, ncols = 3)},
+           }
+
+
+### open_new_figure(number, dpi_val = 200,
+###                 figure_size = (36,24),
+###                 figure_title_font_size = 36,
+###                 default_font_size = 24)
+# open_new_figure() is a function that initalizes figure number. It is
+# recomended to call close_current_figure() after drawing the figure in
+# order to plot and save it.
+###
+def open_new_figure(number, dpi_val = 200,
+                    figure_size = (36,24),
+                    figure_title_font_size = 36,
+                    default_font_size = 24
+                    ):
+    f = plt.figure(number, # build the current figure
+                   dpi = dpi_val,
+                   figsize = figure_size
+                   )
+
+    f.suptitle('Figure ' + str(number), # add figure title
+               fontsize = figure_title_font_size
+               )
+
+    plt.rcParams.update({'font.size': default_font_size})
+
+    return f
+
+
+### add_corner_texts(fig, corner_texts, corner_font_size = 24)
+# Adds the EE-497 common text blocks to the corners of the overall
+# figure: corner_texts holds the upper left, upper right and lower left
+# text.
+###
+def add_corner_texts(fig, corner_texts, corner_font_size = 24) :
+    plt.figure(fig.number)
+    plt.subplot(position=[0.0500,    0.94,    0.02500,    0.02500]) # U-left
+    plt.axis('off')
+    plt.text(0,.5, corner_texts[0], fontsize=corner_font_size)
+
+    plt.subplot(position=[0.9,    0.94,    0.02500,    0.02500]) # U-right
+    plt.axis('off')
+    plt.text(0,.5, corner_texts[1], fontsize=corner_font_size)
+
+    plt.subplot(position=[0.0500,    0.02,    0.02500,    0.02500]) # L-left
+    plt.axis('off')
+    plt.text(0,.5, corner_texts[2], fontsize=corner_font_size)
+
+
+### close_current_figure(fig, file_path, corner_texts, corner_font_size = 24,
+###                      headless = False, formats = ("png",))
+# close_current_figure() adds EE-497 common text blocks to the corneres
+# of the overall figure before plottting and saving the figure as a png
+# (and the other formats, in the background, see general note 7).
+# corner_texts holds the upper left, upper right and lower left text. The
+# figure is closed after it is shown, in headless mode it is not shown.
+###
+def close_current_figure(fig, file_path, corner_texts, corner_font_size = 24,
+                         headless = False, formats = ("png",)
+                         ):
+    add_corner_texts(fig, corner_texts, corner_font_size)
+
+    saving.save_figure(fig, file_path, formats)
+    if not headless :
+        plt.show()
+    plt.close(fig)
+
+
+### figure_path(context, number)
+# File name of figure number, with the extension of the first of
+# context["formats"].
+###
+def figure_path(context, number) :
+    return os.path.join(context["out_dir"],
+                        context["file_prefix"] + '_fig' + str(number) + '.' +
+                        context["formats"][0]
+                        )
+
+
+### figure_bytes(dpi, figure_size = (36,24))
+# Bytes of the RGBA canvas of a figure_size inch figure at dpi, the bulk
+# of the memory a figure needs while it is saved.
+###
+def figure_bytes(dpi, figure_size = (36,24)) :
+    return round(figure_size[0] * dpi) * round(figure_size[1] * dpi) * 4
+
+
+### render_bytes(dpi)
+# Memory one figure at dpi needs while it is drawn and its saves are
+# pending: the canvas and up to saving.max_pending buffers.
+###
+def render_bytes(dpi) :
+    return figure_bytes(dpi) * (1 + saving.max_pending)
+
+
+### figure_layers(spec)
+# Names of the layers of a FIGURES entry, in drawing order. The genus
+# rings are the per figure overlay, the others are base layers.
+###
+def figure_layers(spec) :
+    names = []
+    if spec["genera"] :
+        names.append("genus legend")
+    names += ["eco legend", "site centers"]
+    if spec["genera"] :
+        names.append("genus rings")
+    if spec["labels"] is not None :
+        names.append("site labels " + spec["labels"])
+
+    return names
+
+
+### _open_axes(number, context, coords)
+# Opens figure number and its (2D or 3D) axes for coords.
+###
+def _open_axes(number, context, coords) :
+    fig = open_new_figure(number, dpi_val = context["dpi"])
+
+    if len(coords) == 3 :
+        axs = fig.add_subplot(projection='3d', computed_zorder = False)
+        axs.set_proj_type('persp', focal_length = context["focal_len"])
+    else :
+        axs = plt.subplot(111)
+
+    return fig, axs
+
+
+### _draw_layer(name, axs, coords, context, spec)
+# Draws layer name (see figure_layers()) of the figure spec on axs and
+# returns the artists it added.
+###
+def _draw_layer(name, axs, coords, context, spec) :
+    start = len(axs.collections), len(axs.texts)
+
+    if name == "genus legend" :
+        layers.draw_genus_legend(axs, coords, context["site_order_index"][0],
+                                 context["genus_labels"],
+                                 context["genus_colors"],
+                                 context["genus_lines"],
+                                 context["ring_marker"]
+                                 )
+
+    elif name == "eco legend" :
+        layers.draw_eco_legend(axs, coords, context["eco_sites"],
+                               context["eco_markers"], context["eco_colors"],
+                               context["eco_labels"]
+                               )
+
+    elif name == "site centers" :
+        layers.draw_site_centers(axs, coords, context["site_marker_index"],
+                                 context["site_color_index"],
+                                 context["site_markers"]
+                                 )
+
+    elif name == "genus rings" :
+        layers.draw_genus_rings(axs, coords, context["genus_order_index"],
+                                context["genus_sizes"],
+                                context["genus_colors"],
+                                context["genus_lines"],
+                                context["ring_marker"],
+                                linewidth = context["line_widths"],
+                                genus = (context["focus_genus"]
+                                         if spec["genera"] == "focus" else None)
+                                )
+
+    else :
+        text_style = {"backgroundcolor" : "white", "fontsize" : 12}
+        if len(coords) != 3 :
+            text_style["rotation"] = context["rot"]
+
+        layers.draw_site_labels(axs, coords,
+                                context["label_offsets"][spec["labels"]],
+                                **text_style
+                                )
+
+    return axs.collections[start[0]:] + axs.texts[start[1]:]
+
+
+### _finish_axes(axs, spec, context, coords, handles = None)
+# Title, axis labels and legend of the figure spec. handles are the
+# legend entries (default: every labeled artist of axs).
+###
+def _finish_axes(axs, spec, context, coords, handles = None) :
+    axs.set_title(spec["title"] + "\n" +
+                  "Threshold = " + str(context["plot_threshold"])
+                  )
+
+    if len(coords) == 3 :
+        axs.set_xlabel(xlabel = "UMAP Dimension 0", labelpad = 8.0)
+        axs.set_ylabel(ylabel = "UMAP Dimension 1", labelpad = 8.0)
+        axs.set_zlabel(zlabel = "UMAP Dimension 2", labelpad = 8.0)
+    else :
+        axs.set_xlabel("UMAP Dimension 0")
+        axs.set_ylabel("UMAP Dimension 1")
+
+    if handles is not None :
+        return axs.legend(handles, [handle.get_label() for handle in handles],
+                          borderpad = 0.5,
+                          title = "Legend",
+                          fontsize = 20,
+                          **spec["legend"]
+                          )
+
+    return axs.legend(borderpad = 0.5,
+                      title = "Legend",
+                      fontsize = 20,
+                      **spec["legend"]
+                      )
+
+
+### draw_figure(number, context, headless = False)
+# Draws figure number of FIGURES from the precomputed context and saves
+# it. Returns the path of the saved png.
+###
+def draw_figure(number, context, headless = False) :
+    with spans.span("figure " + str(number), "figure", number = number) :
+        spec = FIGURES[number]
+        coords = context["embeddings"][spec["embedding"]]
+
+        fig, axs = _open_axes(number, context, coords)
+        for name in figure_layers(spec) :
+            _draw_layer(name, axs, coords, context, spec)
+        _finish_axes(axs, spec, context, coords)
+
+        file_path = figure_path(context, number)
+        with spans.span("save figure " + str(number), "figure", number = number) :
+            close_current_figure(fig, file_path, context["corner_texts"],
+                                 headless = headless,
+                                 formats = context["formats"]
+                                 )
+
+        return file_path
+
+
+### draw_figure_group(numbers, context)
+# Headless only. Draws figures that share one embedding on a single
+# figure: every base layer any of them needs is drawn once, in the
+# drawing order of figure_layers(), and shown only for the figures that
+# have it; the genus rings and the legend are drawn per figure and
+# removed after saving. Returns the paths in the order of numbers.
+###
+def draw_figure_group(numbers, context) :
+    first = FIGURES[numbers[0]]
+    coords = context["embeddings"][first["embedding"]]
+
+    names = []
+    for number in numbers :
+        names += [name for name in figure_layers(FIGURES[number])
+                  if name != "genus rings" and name not in names]
+    order = ["genus legend", "eco legend", "site centers"]
+    names.sort(key = lambda name : order.index(name) if name in order
+                                   else len(order))
+
+    with spans.span("base layers " + first["embedding"], "figure") :
+        fig, axs = _open_axes(numbers[0], context, coords)
+        # a "site labels KEY" layer draws the offsets under KEY
+        base = {name : _draw_layer(name, axs, coords, context,
+                                   dict(first, labels = name[12:]))
+                for name in names}
+        add_corner_texts(fig, context["corner_texts"])
+
+    paths = []
+    for number in numbers :
+        with spans.span("figure " + str(number), "figure", number = number) :
+            spec = FIGURES[number]
+            shown = figure_layers(spec)
+            fig.suptitle('Figure ' + str(number), fontsize = 36)
+
+            for name, artists in base.items() :
+                for artist in artists :
+                    artist.set_visible(name in shown)
+
+            overlay = []
+            if "genus rings" in shown :
+                overlay = _draw_layer("genus rings", axs, coords, context, spec)
+
+            # legend entries in drawing order, like axs.legend() finds them
+            handles = [artist for name in shown if name in base
+                       for artist in base[name]
+                       if isinstance(artist, collections.Collection)
+                       and not artist.get_label().startswith("_")]
+            legend = _finish_axes(axs, spec, context, coords, handles)
+
+            file_path = figure_path(context, number)
+            with spans.span("save figure " + str(number), "figure",
+                            number = number) :
+                saving.save_figure(fig, file_path, context["formats"])
+            paths.append(file_path)
+
+            legend.remove()
+            for artist in overlay :
+                artist.remove()
+
+    plt.close(fig)
+
+    return paths
+
+
+### figure_groups(numbers)
+# Splits numbers into lists of figures that share an embedding, in the
+# order of their first figure.
+###
+def figure_groups(numbers) :
+    groups = {}
+    for number in numbers :
+        groups.setdefault(FIGURES[number]["embedding"], []).append(number)
+
+    return list(groups.values())
+
+
+_worker_context = None
+
+
+### _init_worker(context)
+# Runs once in every render worker. The context is handed over when the
+# worker is created, so it is not pickled again for every figure.
+###
+def _init_worker(context) :
+    global _worker_context
+    _worker_context = context
+
+    plt.switch_backend("Agg")
+
+
+### _render_worker(numbers)
+# Worker entry point of the headless render pool, draws one figure
+# group. Returns the paths and the spans of the figures.
+###
+def _render_worker(numbers) :
+    mark = len(spans.records())
+    paths = draw_figure_group(numbers, _worker_context)
+    saving.flush()
+    gc.collect()
+
+    return paths, spans.records()[mark:]
+
+
+### render_figures(context, numbers = None, headless = False,
+###                max_workers = None, memory_budget = None,
+###                preview_dpi = None, formats = None)
+# Draws and saves the given figure numbers (all of FIGURES by default)
+# and returns their file paths in the order of numbers. Headless mode
+# uses the Agg backend and draws the figures group by group (see
+# draw_figure_group()) in up to max_workers worker processes, one group
+# per task (default one per CPU core, 1 draws them in this process).
+# memory_budget (bytes) lowers max_workers to the number of workers that
+# fit in it and raises ValueError when one figure does not fit. The
+# figures are drawn at preview_dpi instead of context["dpi"] and saved
+# in formats (see fishproject.saving.FORMATS) instead of
+# context["formats"] when given. The paths are those of the first format.
+###
+def render_figures(context, numbers = None, headless = False,
+                   max_workers = None, memory_budget = None,
+                   preview_dpi = None, formats = None
+                   ) :
+    if numbers is None :
+        numbers = list(FIGURES)
+
+    if preview_dpi is not None :
+        context = dict(context, dpi = preview_dpi)
+    if formats is not None :
+        context = dict(context, formats = list(formats))
+
+    if memory_budget is not None :
+        needed = render_bytes(context["dpi"])
+        if needed > memory_budget :
+            raise ValueError("a figure at " + str(context["dpi"]) +
+                             " dpi needs about " + str(needed // 2**20) +
+                             " MB, over the memory budget of " +
+                             str(memory_budget // 2**20) +
+                             " MB (draw a preview at a lower dpi)"
+                             )
+
+    if not headless :
+        paths = []
+        for number in numbers :
+            paths.append(draw_figure(number, context))
+            gc.collect() # frees the closed figure (see general note 6)
+        saving.flush()
+
+        return paths
+
+    groups = figure_groups(numbers)
+
+    if max_workers is None :
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(groups))
+    if memory_budget is not None :
+        max_workers = min(max_workers,
+                          max(1, memory_budget // (worker_bytes + needed))
+                          )
+
+    paths = {}
+    if max_workers <= 1 :
+        plt.switch_backend("Agg")
+        for group in groups :
+            paths.update(zip(group, draw_figure_group(group, context)))
+            gc.collect()
+        saving.flush()
+
+        return [paths[number] for number in numbers]
+
+    if "fork" in multiprocessing.get_all_start_methods() :
+        mp_context = multiprocessing.get_context("fork")
+    else :
+        mp_context = multiprocessing.get_context("spawn")
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers = max_workers,
+            mp_context = mp_context,
+            initializer = _init_worker,
+            initargs = (context,)
+            ) as pool :
+        futures = [pool.submit(_render_worker, group) for group in groups]
+
+        for group, future in zip(groups, futures) :
+            group_paths, records = future.result()
+            spans.add_records(records)
+            paths.update(zip(group, group_paths))
+
+    return [paths[number] for number in numbers]
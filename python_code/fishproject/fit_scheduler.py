@@ -0,0 +1,172 @@
+# program		fishproject/fit_scheduler.py
+# purpose	    run independent UMAP fits concurrently in a process pool
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  a job is the keyword arguments of umap.UMAP() plus the input data.
+#     each fit builds its model and runs model.fit_transform(data) in its
+#     own worker process. with a fixed random_state and n_jobs = 1 UMAP is
+#     deterministic, so a worker returns the same embedding as a serial
+#     loop would.
+# 2)  fits found in the embedding cache are not sent to the pool at all,
+#     and umap is only imported when something has to be fitted (the
+#     import alone takes seconds).
+# 3)  worker processes are started with "fork" where the platform has it
+#     and with "spawn" elsewhere. spawn re-imports the __main__ module in
+#     every worker, so the calling script has to keep its work under an
+#     if __name__ == "__main__" guard (beaty_sethData_v4p2.py does).
+# 4)  the pool has to be started before this process runs any UMAP fit
+#     itself: numba's worker threads do not survive a fork and a forked
+#     worker would hang. fit_embeddings() only fits in-process when it
+#     does not use the pool at all. importing umap before the fork is
+#     fine, and saves every forked worker the import.
+# 5)  with shared_knn = True the distance matrix of every input table is
+#     computed once (or loaded from the cache) in this process and every
+#     fit gets its nearest neighbor graph as precomputed_knn, instead of
+#     each fit computing the same distances again. for tables under 4096
+#     rows the embeddings are the same as without it (see
+#     fishproject.distances). fits with a metric fishproject.distances
+#     does not support find their neighbors themselves, and so do the fits
+#     of keep_models: a model fitted on a precomputed_knn graph has no
+#     nearest neighbor index and can not transform() new rows.
+# 6)  every fit runs in a fishproject.spans span named "UMAP fit <name>",
+#     the spans of worker processes are handed back to this process.
+###
+
+### imports
+import concurrent.futures
+import multiprocessing
+import os
+import time
+import warnings
+
+from fishproject import distances
+from fishproject import embedding_cache
+from fishproject import spans
+
+
+### Docstring Data
+__all__ = ["make_model", "fit_embeddings"]
+
+
+### make_model(params)
+# Returns umap.UMAP(**params). umap is imported here and not at module
+# level.
+###
+def make_model(params) :
+    import umap
+
+    return umap.UMAP(**params)
+
+
+### _fit_one(params, data, keep_model = False)
+# Worker entry point. Returns the embedding, the fit time in seconds and
+# with keep_model the fitted model (None otherwise).
+###
+def _fit_one(params, data, keep_model = False) :
+    start = time.perf_counter()
+    model = make_model(params)
+    with warnings.catch_warnings() :
+        # a precomputed_knn fit warns that transform() is not available
+        warnings.filterwarnings("ignore", message = ".*precomputed_knn.*")
+        embedding = model.fit_transform(data)
+
+    return embedding, time.perf_counter() - start, model if keep_model else None
+
+
+### _pool_context()
+# Returns the multiprocessing context used for the pool (see general
+# note 3).
+###
+def _pool_context() :
+    if "fork" in multiprocessing.get_all_start_methods() :
+        return multiprocessing.get_context("fork")
+
+    return multiprocessing.get_context("spawn")
+
+
+### fit_embeddings(jobs, max_workers = None, cache_dir = None,
+###                max_bytes = None, shared_knn = False, keep_models = ())
+# Fits every job of jobs, a dict of name -> (params, data) with params
+# the umap.UMAP() keyword arguments, and returns (embeddings, timings,
+# models), three dicts keyed by the job names. timings holds the wall
+# time of each fit in seconds, or None when the embedding came from the
+# embedding cache in cache_dir. models holds the fitted models of the
+# keep_models jobs that were fitted (not taken from the cache).
+# max_workers defaults to one process per CPU core, 1 runs the fits
+# serially in this process. with shared_knn the fits get their nearest
+# neighbor graphs from fishproject.distances (general note 5).
+###
+def fit_embeddings(jobs, max_workers = None, cache_dir = None,
+                   max_bytes = None, shared_knn = False, keep_models = ()
+                   ) :
+    embeddings = {}
+    timings = {}
+    models = {}
+    keys = {}
+
+    pending = []
+    for name, (params, data) in jobs.items() :
+        if cache_dir is not None :
+            keys[name] = embedding_cache.embedding_key(data, params, "UMAP")
+            embedding = embedding_cache.load_embedding(cache_dir, keys[name])
+            if embedding is not None :
+                embeddings[name] = embedding
+                timings[name] = None
+                continue
+
+        pending.append(name)
+
+    # the cache keys above are computed from the parameters without the
+    # graphs, so the cached embeddings do not depend on shared_knn
+    fit_jobs = {name : jobs[name] for name in pending}
+    shared = {name : fit_jobs[name] for name in pending
+              if name not in keep_models}
+    if shared_knn and shared :
+        with spans.span("shared distances", "umap") :
+            knn = distances.shared_knn_graphs(shared, cache_dir, max_bytes)
+        fit_jobs = {name : (dict(params, precomputed_knn = knn[name])
+                            if name in knn else params, data)
+                    for name, (params, data) in fit_jobs.items()}
+
+    if max_workers is None :
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(pending))
+
+    if max_workers > 1 :
+        context = _pool_context()
+        if context.get_start_method() == "fork" :
+            import umap
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers = max_workers,
+                                                    mp_context = context
+                                                    ) as pool :
+            futures = {name : pool.submit(spans.run_collected,
+                                          "UMAP fit " + name, "umap",
+                                          _fit_one, *fit_jobs[name],
+                                          name in keep_models)
+                       for name in pending}
+            results = {name : futures[name].result() for name in pending}
+    else :
+        results = {name : spans.run_collected("UMAP fit " + name, "umap",
+                                              _fit_one, *fit_jobs[name],
+                                              name in keep_models)
+                   for name in pending}
+
+    for name in pending :
+        (embeddings[name], timings[name], model), records = results[name]
+        spans.add_records(records)
+        if model is not None :
+            models[name] = model
+
+        if cache_dir is not None :
+            embedding_cache.save_embedding(cache_dir, keys[name],
+                                           embeddings[name], max_bytes
+                                           )
+
+    # keep the order of the jobs
+    embeddings = {name : embeddings[name] for name in jobs}
+    timings = {name : timings[name] for name in jobs}
+
+    return embeddings, timings, models
@@ -0,0 +1,221 @@
+# program		fishproject/layers.py
+# purpose	    batched scatter layers for the UMAP figures
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  every layer of a figure (backing discs, site centers, genus rings)
+#     is drawn as one PathCollection with per-point size / color /
+#     linestyle arrays instead of one plt.scatter() call per point.
+# 2)  legend entries stay single point scatters (one per genus / region,
+#     independent of the number of sites). they sit under the white
+#     backing discs, which are drawn as one collection per figure.
+# 3)  coordinates are passed in the [dimension][site] layout used by the
+#     scripts (np.transpose of the UMAP output). 3 rows draw on a 3D axes.
+#     3D axes should use computed_zorder = False so the layers are drawn
+#     in the order they were added (points are depth sorted inside each
+#     layer).
+###
+
+### imports
+import numpy as np
+
+
+### Docstring Data
+__all__ = ["genus_styles", "scatter_layer", "legend_entry",
+           "draw_backing_discs", "draw_genus_legend", "draw_eco_legend",
+           "draw_site_centers", "draw_genus_rings", "draw_site_labels",
+           ]
+
+
+### genus_styles(n_genera, color_list, line_list)
+# Enumerates the color / line style combination of every genus, the same
+# way the "enumerate combinations of colors and line styles" loops did:
+# colors cycle first, the line style advances every len(color_list)
+# genera. Returns (colors, linestyles), one entry per genus. Past
+# len(color_list) * len(line_list) genera the combinations repeat.
+###
+def genus_styles(n_genera, color_list, line_list) :
+    colors = [color_list[genus % len(color_list)]
+              for genus in range(n_genera)]
+    linestyles = [line_list[(genus // len(color_list)) % len(line_list)]
+                  for genus in range(n_genera)]
+
+    return colors, linestyles
+
+
+### scatter_layer(ax, coords, sites = None, **kwargs)
+# Draws the given sites (all when sites is None) of coords as a single
+# scatter collection on ax. 3D coordinates are drawn without depth
+# shading so that every point keeps its full color, like the old single
+# point scatters.
+###
+def scatter_layer(ax, coords, sites = None, **kwargs) :
+    coords = np.asarray(coords)
+    if sites is not None :
+        coords = coords[:, np.asarray(sites, dtype = np.intp)]
+
+    if len(coords) == 3 :
+        return ax.scatter(xs = coords[0],
+                          ys = coords[1],
+                          zs = coords[2],
+                          depthshade = False,
+                          **kwargs
+                          )
+
+    return ax.scatter(x = coords[0],
+                      y = coords[1],
+                      **kwargs
+                      )
+
+
+### legend_entry(ax, coords, site, label, **kwargs)
+# Adds a single point scatter at the given site that carries the legend
+# style and label. It is drawn under the white backing disc of that site,
+# so it only shows up in the legend (and keeps the axis limits as they
+# are, which an empty scatter would not do on a 3D axes).
+###
+def legend_entry(ax, coords, site, label, **kwargs) :
+    return scatter_layer(ax, coords, [site], label = label, **kwargs)
+
+
+### draw_backing_discs(ax, coords, sites, size = 420*2)
+# White discs drawn under the site centers / genus rings of the given
+# sites.
+###
+def draw_backing_discs(ax, coords, sites, size = 420*2) :
+    return scatter_layer(ax, coords, sites,
+                         s = size,
+                         c = "white",
+                         marker = "o",
+                         )
+
+
+### draw_genus_legend(ax, coords, top_sites, labels, colors, linestyles,
+###                   marker, size = 420, linewidth = 2)
+# One legend entry per genus plus the white backing disc at the site
+# where the genus has its highest count (site_order_index[0]).
+###
+def draw_genus_legend(ax, coords, top_sites, labels, colors, linestyles,
+                      marker, size = 420, linewidth = 2
+                      ) :
+    for genus in range(len(labels)) :
+        legend_entry(ax, coords, top_sites[genus], labels[genus],
+                     s = size,
+                     c = colors[genus],
+                     marker = marker,
+                     linewidths = linewidth,
+                     linestyle = linestyles[genus],
+                     )
+
+    return draw_backing_discs(ax, coords, top_sites, size = size*2)
+
+
+### draw_eco_legend(ax, coords, region_sites, region_markers,
+###                 region_colors, labels, size = 420)
+# One legend entry per eco-region plus the white backing disc at the
+# first site of every region.
+###
+def draw_eco_legend(ax, coords, region_sites, region_markers, region_colors,
+                    labels, size = 420
+                    ) :
+    for region in range(len(labels)) :
+        legend_entry(ax, coords, region_sites[region], labels[region],
+                     s = size,
+                     c = region_colors[region],
+                     marker = region_markers[region],
+                     edgecolors = "face",
+                     )
+
+    return draw_backing_discs(ax, coords, region_sites, size = size*2)
+
+
+### draw_site_centers(ax, coords, site_markers, site_colors, markers,
+###                   size = 180)
+# Draws the center of every site. site_markers[site] indexes markers and
+# site_colors[site] is the color of the site. One collection is drawn per
+# marker shape and color, in the order of markers. Single color
+# collections are drawn by the backend as stamped markers, like the old
+# single point scatters.
+###
+def draw_site_centers(ax, coords, site_markers, site_colors, markers,
+                      size = 180
+                      ) :
+    site_markers = np.asarray(site_markers)
+    site_colors = np.asarray(site_colors, dtype = object)
+
+    layers = []
+    for shape in range(len(markers)) :
+        shape_sites = np.flatnonzero(site_markers == shape)
+
+        # dict keeps the colors in order of their first site
+        for color in dict.fromkeys(site_colors[shape_sites]) :
+            sites = shape_sites[site_colors[shape_sites] == color]
+            layers.append(scatter_layer(ax, coords, sites,
+                                        s = size,
+                                        c = color,
+                                        marker = markers[shape],
+                                        edgecolors = "face",
+                                        ))
+
+    return layers
+
+
+### draw_genus_rings(ax, coords, order_index, sizes, colors, linestyles,
+###                  marker, linewidth = 3, genus = None)
+# Draws the ring of every genus at every site as one collection.
+# order_index[site][rank] is the genus_order_index (-1 entries are
+# skipped) and sizes[site][genus] the scaled marker area. The rings keep
+# the old drawing order, site by site from the largest count down, so
+# small rings stay on top of large ones. When genus is given only the
+# rings of that genus are drawn.
+###
+def draw_genus_rings(ax, coords, order_index, sizes, colors, linestyles,
+                     marker, linewidth = 3, genus = None
+                     ) :
+    order_index = np.asarray(order_index)
+    sizes = np.asarray(sizes, dtype = np.float64)
+
+    keep = order_index > -1
+    if genus is not None :
+        keep &= order_index == genus
+
+    sites, ranks = np.nonzero(keep)
+    genera = order_index[sites, ranks]
+    if len(genera) == 0 :
+        return None
+
+    return scatter_layer(ax, coords, sites,
+                         s = sizes[sites, genera],
+                         c = [colors[g] for g in genera],
+                         marker = marker,
+                         linewidths = linewidth,
+                         linestyle = [linestyles[g] for g in genera],
+                         )
+
+
+### draw_site_labels(ax, coords, offsets, **kwargs)
+# Writes "#N" next to every site. offsets holds one offset per
+# dimension, the remaining keywords are passed to ax.text().
+###
+def draw_site_labels(ax, coords, offsets, **kwargs) :
+    coords = np.asarray(coords)
+
+    texts = []
+    for site in range(coords.shape[1]) :
+        position = [coords[dim][site] + offsets[dim]
+                    for dim in range(len(coords))]
+
+        if len(coords) == 3 :
+            texts.append(ax.text(position[0], position[1], position[2],
+                                 s = "#" + str(site + 1),
+                                 **kwargs
+                                 ))
+        else :
+            texts.append(ax.text(x = position[0],
+                                 y = position[1],
+                                 s = "#" + str(site + 1),
+                                 **kwargs
+                                 ))
+
+    return texts
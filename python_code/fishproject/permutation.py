@@ -0,0 +1,161 @@
+# program		fishproject/permutation.py
+# purpose	    permutation p-values with fdr correction for correlation
+#               matrices
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  under the null hypothesis the rows of two columns are unrelated, so
+#     the response columns are shuffled, every column with its own
+#     permutation, and correlated with the unshuffled attribute columns.
+#     one permuted table gives a null sample for every cell at once, and a
+#     chunk of permuted tables is correlated in one batched call of
+#     fishproject.correlation.pearson_matrix().
+# 2)  only the count of null correlations at least as large (in absolute
+#     value) as the observed one is kept per cell, so memory depends on
+#     the chunk size and not on the number of permutations. the p-value is
+#     (1 + count) / (1 + permutations), which is never 0.
+# 3)  for "spearman" the columns are ranked once, ranks do not change when
+#     rows are shuffled.
+# 4)  fdr_bh() is the Benjamini-Hochberg step-up correction. for a square
+#     matrix of a table with itself only the cells above the diagonal are
+#     separate tests; they are corrected once and mirrored, and the
+#     diagonal gets nan.
+###
+
+### imports
+import typing
+
+import numpy as np
+import pandas as pd
+
+from fishproject import correlation
+
+
+### Docstring Data
+__all__ = ["PermutationTest", "fdr_bh", "permutation_counts",
+           "permutation_test",
+           ]
+
+
+# |r_null| >= |r| - _TIE counts as a tie, so rounding never makes an
+# identical correlation look smaller
+_TIE = 1e-12
+
+
+### PermutationTest
+# r : correlation, DataFrame [attribute][response]
+# p : permutation p-value of r, same shape
+# q : p after Benjamini-Hochberg fdr correction, same shape
+###
+class PermutationTest(typing.NamedTuple) :
+    r : pd.DataFrame
+    p : pd.DataFrame
+    q : pd.DataFrame
+    n_permutations : int
+
+
+### fdr_bh(p)
+# Benjamini-Hochberg adjusted p-values (q-values) of the array p. nan
+# entries are not counted as tests and stay nan.
+###
+def fdr_bh(p) :
+    p = np.asarray(p, dtype = np.float64)
+    q = np.full(p.shape, np.nan)
+
+    tested = ~np.isnan(p)
+    values = p[tested]
+    if values.size == 0 :
+        return q
+
+    order = np.argsort(values)
+    scaled = values[order] * values.size / np.arange(1, values.size + 1)
+    # step-up: q of rank i is the smallest scaled value at rank >= i
+    scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+
+    adjusted = np.empty_like(values)
+    adjusted[order] = np.minimum(scaled, 1.0)
+    q[tested] = adjusted
+
+    return q
+
+
+### permutation_counts(x, y, r, n_permutations, seed = None,
+###                    chunk_size = 256)
+# Number of permutations in which the correlation of x with the shuffled
+# columns of y is at least as large in absolute value as r, for every
+# [x column][y column] cell. x and y are [row][column] arrays without
+# nan.
+###
+def permutation_counts(x, y, r, n_permutations, seed = None,
+                       chunk_size = 256
+                       ) :
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    limit = np.abs(r) - _TIE
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(np.shape(r), dtype = np.int64)
+    for start in range(0, n_permutations, chunk_size) :
+        size = min(chunk_size, n_permutations - start)
+
+        # [permutation][row][column], every column shuffled on its own
+        order = rng.random((size,) + y.shape).argsort(axis = 1)
+        shuffled = np.take_along_axis(y[np.newaxis], order, axis = 1)
+
+        null, n = correlation.pearson_matrix(x, shuffled)
+        counts += (np.abs(null) >= limit).sum(axis = 0)
+
+    return counts
+
+
+### permutation_test(table, attributes, responses = None,
+###                  method = "pearson", n_permutations = 5000, seed = 24,
+###                  chunk_size = 256)
+# Correlates the attribute columns of table with the response columns
+# (the attributes themselves when None, e.g. for a heatmap) and returns
+# a PermutationTest with the permutation p-values and their fdr
+# corrected q-values.
+###
+def permutation_test(table, attributes, responses = None,
+                     method = "pearson", n_permutations = 5000, seed = 24,
+                     chunk_size = 256
+                     ) :
+    attributes = list(attributes)
+    square = responses is None
+    responses = attributes if square else list(responses)
+
+    x = table[attributes].to_numpy(dtype = np.float64)
+    y = table[responses].to_numpy(dtype = np.float64)
+    if np.isnan(x).any() or np.isnan(y).any() :
+        raise ValueError("permutation_test() needs columns without nan")
+
+    if method not in correlation.METHODS :
+        raise ValueError("method must be one of " + repr(correlation.METHODS))
+    if method == "spearman" :
+        x = correlation.rank_columns(x)
+        y = correlation.rank_columns(y)
+
+    r, n = correlation.pearson_matrix(x, y)
+    counts = permutation_counts(x, y, r, n_permutations, seed, chunk_size)
+    p = (1.0 + counts) / (1.0 + n_permutations)
+    # constant columns have no correlation to test
+    p[np.isnan(r)] = np.nan
+
+    if square :
+        upper = np.triu(np.ones(p.shape, dtype = bool), k = 1)
+        q = np.full(p.shape, np.nan)
+        q[upper] = fdr_bh(p[upper])
+        q = np.fmin(q, q.T)
+        np.fill_diagonal(p, np.nan)
+    else :
+        q = fdr_bh(p)
+
+    def frame(values) :
+        return pd.DataFrame(values, index = attributes, columns = responses)
+
+    return PermutationTest(r = frame(r),
+                           p = frame(p),
+                           q = frame(q),
+                           n_permutations = n_permutations,
+                           )
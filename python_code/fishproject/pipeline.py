@@ -0,0 +1,632 @@
+# program		fishproject/pipeline.py
+# purpose	    the UMAP figure pipeline of beaty_sethData_v4p2.py as
+#               importable functions
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  importing this module does no work: the data is loaded, the UMAPs
+#     are fitted and the figures drawn only when run() (or one of its
+#     steps) is called. umap, sklearn and matplotlib are imported inside
+#     the functions that use them.
+# 2)  run() only fits the UMAP embeddings used by the requested figures,
+#     so e.g. figures 1-4 cost three fits (or three cache lookups) instead
+#     of seven.
+# 3)  the settings below are the ones beaty_sethData_v4p2.py always used.
+#     the script and the command line (python -m fishproject render) both
+#     go through run().
+# 4)  the UMAPs of PROJECTED_JOBS (dim_red2 / 5 / 6 of the script) can be
+#     saved as fitted models (fishproject.projection), so that new sites
+#     are placed into their layouts with project_sites() instead of a
+#     refit. the models fitted for the figures are saved as they are;
+#     only the ones whose embedding came from the embedding cache are
+#     fitted again, with the same data and random_state, so their layouts
+#     are the ones in the figures.
+# 5)  the stages and figures are timed with fishproject.spans instead of
+#     "start ..." / "end ..." prints. run() writes them as a trace file
+#     when trace_path (or the environment variable FISHPROJECT_TRACE) is
+#     set.
+###
+
+### imports
+import datetime
+import os
+import tracemalloc
+import typing
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from fishproject import (catalog, eco_regions, embedding_cache,
+                         fit_scheduler, layers, projection, ranking, spans)
+
+
+### Docstring Data
+__all__ = ["dpi_var", "plot_threshold", "line_widths",
+           "factor_power", "factor_multi", "factor_const",
+           "x_offset", "y_offset", "rot", "x3_offset",
+           "y3_offset", "z3_offset", "color_list", "line_list",
+           "UMAP_JOBS", "EMBEDDINGS", "PROJECTED_JOBS", "SurveyData",
+           "GenusScaling", "program_name", "find_val", "encode_sites",
+           "impute_columns", "load_survey_data", "umap_jobs", "fit_umaps",
+           "save_projections", "project_sites", "scale_genus_data",
+           "figure_context", "embeddings_for", "run",
+           ]
+
+
+dpi_var = 200 # sets the effective dpi value for all figures. needs to be <270
+
+
+g_to_plot = "Etheostoma"
+
+# sets the minimum number of counts that a genus at a site needs
+# to have to be plotted
+plot_threshold = 0.0
+
+
+# sets the line widths of the circles
+line_widths = 3
+
+
+# number for the power value for exponential scaling
+factor_power = 0.8
+
+
+# number being multiplied the data after the power
+factor_multi = 280.0
+
+# a constant value being summed with the data after power and multi
+factor_const = -1000
+
+
+### genus_data[site][genus] = ((genus_data[site][genus] ** factor_power) * factor_multi) + factor_const
+
+
+# text offset for site numbers
+x_offset = 0.04
+y_offset = -0.04
+rot = 15
+
+x3_offset = 0.5
+y3_offset = 0.5
+z3_offset = 0
+
+x3_offset_wf = 0.0
+y3_offset_wf = 0.0
+z3_offset_wf = 0.0
+
+
+# folder and size limit (bytes) of the UMAP embedding cache. embeddings
+# are reused as long as the input data and the UMAP parameters match
+embedding_cache_dir = "umap_cache"
+embedding_cache_size = 256 * 1024**2
+
+# folder of the saved, fitted UMAP models used to project new sites
+model_dir = "umap_models"
+
+
+# perspective focal length of the 3D figures
+focal_len = 0.15
+
+
+author_name = "Michael M Beaty"
+
+
+# list of colors and line styles for plotting (the marker shapes are made
+# in figure_context(), MarkerStyle needs matplotlib)
+color_list = ["red", "green", "blue", "MediumTurquoise", "magenta", "goldenrod",
+              "black", "DarkViolet", "Olive", "Brown",
+              ]
+
+line_list = ["solid", "dashed", "dashdot"]
+
+
+# https://umap-learn.readthedocs.io/en/latest/parameters.html
+_UMAP_COMMON = {"metric" : "correlation",
+                "learning_rate" : 0.01,
+                "init" : "pca",
+                "low_memory" : False,
+                "random_state" : 24,
+                # "transform_seed" : 42,
+                "n_jobs" : 1,
+                }
+
+# job name -> (input table, umap.UMAP() keyword arguments). "site" is
+# the environmental table, "csf" the same with the g_to_plot counts
+UMAP_JOBS = {"UMAP 1" : ("site", dict(_UMAP_COMMON, n_neighbors = 2,
+                                      n_components = 2, min_dist = 0.9)),
+             "UMAP 2" : ("site", dict(_UMAP_COMMON, n_neighbors = 7,
+                                      n_components = 2, min_dist = 0.1)),
+             "UMAP 3" : ("site", dict(_UMAP_COMMON, n_neighbors = 7,
+                                      n_components = 2, min_dist = 0.35)),
+             "UMAP 4" : ("site", dict(_UMAP_COMMON, n_neighbors = 2,
+                                      n_components = 2, min_dist = 0.1)),
+             "UMAP 5" : ("site", dict(_UMAP_COMMON, n_neighbors = 7,
+                                      n_components = 3, min_dist = 0.1)),
+             "UMAP 6" : ("csf", dict(_UMAP_COMMON, n_neighbors = 7,
+                                     n_components = 2, min_dist = 0.1)),
+             "UMAP 7" : ("csf", dict(_UMAP_COMMON, n_neighbors = 7,
+                                     n_components = 3, min_dist = 0.1)),
+             }
+
+# UMAP jobs whose fitted models are saved for projecting new sites
+PROJECTED_JOBS = ["UMAP 2", "UMAP 5", "UMAP 6"]
+
+# embedding name used by fishproject.figures -> UMAP job
+EMBEDDINGS = {"site_2D" : "UMAP 1",
+              "site_2D_2" : "UMAP 2",
+              "site_2D_3" : "UMAP 3",
+              "site_2D_4" : "UMAP 4",
+              "site_3D" : "UMAP 5",
+              "site_wf_2D" : "UMAP 6",
+              "site_wf_3D" : "UMAP 7",
+              }
+
+
+### SurveyData
+# site_data    : environmental table with SiteN and the recoded State
+# csf_data     : site_data plus the g_to_plot counts
+# genus_data   : genus counts [genus][site]
+# genus_labels : genus names
+###
+class SurveyData(typing.NamedTuple) :
+    site_data : pd.DataFrame
+    csf_data : pd.DataFrame
+    genus_data : np.ndarray
+    genus_labels : pd.Index
+
+
+### GenusScaling
+# site_order_index  : [rank][genus] sites by count (fishproject.ranking)
+# genus_order_index : [site][rank] genera by count
+# genus_sizes       : scaled ring areas [site][genus]
+# max_count         : largest scaled area
+###
+class GenusScaling(typing.NamedTuple) :
+    site_order_index : np.ndarray
+    genus_order_index : np.ndarray
+    genus_sizes : np.ndarray
+    max_count : float
+
+
+### program_name(path)
+# File name of path with its real case. win32api is only used when it is
+# installed (windows), elsewhere the file name is used as it is.
+###
+def program_name(path) :
+    name = os.path.basename(path)
+    try :
+        import win32api
+    except ImportError :
+        return name
+
+    return win32api.GetLongPathName(win32api.GetShortPathName(name))
+
+
+### find_val(arr = [], val = None, count = 1))
+# Linearly finds the address of the Xth instance of the given value
+# in the given array, where X == count.
+#
+# If the value could not be found returns -1.
+###
+def find_val(arr = [], val = None, count = 1) :
+    t_count = 1
+    for index in range(len(arr)) :
+        if (arr[index] == val and t_count == count) :
+            del t_count
+            return index
+        elif arr[index] == val :
+            t_count += 1
+
+    del t_count
+    return -1
+
+
+### encode_sites(table)
+# Returns table (indexed by SiteN, like the catalog tables, or with a
+# SiteN column) with SiteN as a column and State recoded like the UMAP
+# input: TX -> 0, everything else -> 1.
+###
+def encode_sites(table) :
+    if "SiteN" not in table.columns :
+        table = table.reset_index()
+    else :
+        table = table.copy()
+
+    table["State"] = np.where(table["State"] == "TX", 0, 1)
+
+    return table
+
+
+### impute_columns(values, strategy = "mean")
+# Returns a copy of the 2D array values with the nan values of every
+# column replaced by the column mean or median (strategy), like
+# SimpleImputer(keep_empty_features = True): a column with only nan
+# values becomes 0.
+###
+def impute_columns(values, strategy = "mean") :
+    values = np.array(values, dtype = np.float64)
+    missing = np.isnan(values)
+    if not missing.any() :
+        return values
+
+    with warnings.catch_warnings() :
+        # all-nan columns, filled with 0 below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if strategy == "mean" :
+            fill = np.nanmean(values, axis = 0)
+        elif strategy == "median" :
+            fill = np.nanmedian(values, axis = 0)
+        else :
+            raise ValueError("unknown imputation strategy " + repr(strategy))
+
+    fill = np.where(np.isnan(fill), 0.0, fill)
+
+    return np.where(missing, fill, values)
+
+
+### load_survey_data(data_dir = None)
+# Loads the environmental and genus tables through fishproject.catalog,
+# recodes State (TX -> 0, else 1), fills missing environmental values
+# with the column mean and missing counts with the site median, and adds
+# the g_to_plot counts for the "with fish" UMAPs. Returns SurveyData.
+###
+def load_survey_data(data_dir = None) :
+    site_data = encode_sites(catalog.load_table("environment", data_dir))
+    genus_data = encode_sites(catalog.load_table("genus", data_dir))
+
+
+    genus_labels = genus_data.drop(["SiteN", "State"], axis = 1).columns
+    genus_data = np.transpose(genus_data.drop(["SiteN", "State"], axis = 1).to_numpy())
+
+
+    # only float columns can hold nan, SiteN / State / counts read as
+    # integers stay as they are
+    with spans.span("impute") :
+        float_columns = site_data.columns[[dtype.kind == "f"
+                                           for dtype in site_data.dtypes]]
+        site_data[float_columns] = impute_columns(site_data[float_columns],
+                                                  "mean"
+                                                  )
+
+        # the columns of the [genus][site] array are sites: like the
+        # SimpleImputer the script ran on it, a missing count gets the
+        # median of its site
+        if genus_data.dtype.kind == "f" :
+            genus_data = impute_columns(genus_data, "median")
+
+
+    csf_data = pd.DataFrame(site_data)
+
+    csf_data.insert(len(site_data.columns),
+                    g_to_plot,
+                    genus_data[find_val(genus_labels, g_to_plot)],
+                    )
+
+    return SurveyData(site_data = site_data,
+                      csf_data = csf_data,
+                      genus_data = genus_data,
+                      genus_labels = genus_labels,
+                      )
+
+
+### umap_jobs(data, names = None)
+# Jobs for fishproject.fit_scheduler.fit_embeddings() of the given
+# UMAP_JOBS names (all by default): name -> (params, input table).
+###
+def umap_jobs(data, names = None) :
+    if names is None :
+        names = list(UMAP_JOBS)
+
+    tables = {"site" : data.site_data, "csf" : data.csf_data}
+
+    return {name : (UMAP_JOBS[name][1], tables[UMAP_JOBS[name][0]])
+            for name in names}
+
+
+### fit_umaps(data, embedding_names = None, max_workers = None,
+###           cache_dir = embedding_cache_dir,
+###           max_bytes = embedding_cache_size, model_dir = None)
+# Fits (or loads from the embedding cache) the given EMBEDDINGS (all by
+# default) and returns them as name -> [dimension][site] arrays. With
+# model_dir the PROJECTED_JOBS among them are saved there as projections
+# (see save_projections()).
+###
+def fit_umaps(data, embedding_names = None, max_workers = None,
+              cache_dir = embedding_cache_dir,
+              max_bytes = embedding_cache_size, model_dir = None
+              ) :
+    if embedding_names is None :
+        embedding_names = list(EMBEDDINGS)
+
+    # keep the UMAP_JOBS order
+    names = [name for name in UMAP_JOBS
+             if name in {EMBEDDINGS[key] for key in embedding_names}]
+    jobs = umap_jobs(data, names)
+    projected = []
+    if model_dir is not None :
+        projected = [name for name in PROJECTED_JOBS if name in jobs]
+
+    with spans.span("UMAP") :
+        fitted = fit_scheduler.fit_embeddings(jobs,
+                                              max_workers = max_workers,
+                                              cache_dir = cache_dir,
+                                              max_bytes = max_bytes,
+                                              shared_knn = True,
+                                              keep_models = projected
+                                              )
+        embeddings, fit_times, models = fitted
+
+        # a cache hit has no fit span, it is reported with the span lines
+        if spans.verbose :
+            for name in jobs :
+                if fit_times[name] is None :
+                    print("\t\t" + name + " : loaded from the embedding cache")
+
+    if projected :
+        with spans.span("saving models") :
+            save_projections(data, projected, model_dir, models)
+
+    return {key : np.transpose(embeddings[EMBEDDINGS[key]])
+            for key in embedding_names}
+
+
+### save_projections(data, names = PROJECTED_JOBS, model_dir = model_dir,
+###                  models = None)
+# Saves the projections of the given UMAP_JOBS names whose saved model is
+# missing or was fitted on other data. models (name -> fitted model, from
+# fishproject.fit_scheduler.fit_embeddings()) are saved as they are, the
+# other names are fitted here. Returns the names that were saved.
+###
+def save_projections(data, names = PROJECTED_JOBS, model_dir = model_dir,
+                     models = None
+                     ) :
+    if models is None :
+        models = {}
+
+    saved = []
+    for name, (params, table) in umap_jobs(data, names).items() :
+        key = embedding_cache.embedding_key(table, params, "UMAP")
+        if projection.is_current(model_dir, name, key) :
+            continue
+
+        model = models.get(name)
+        action = "fit and save the " if model is None else "save the "
+        with spans.span(action + name + " model", "umap") :
+            projection.save_projection(model_dir,
+                                       projection.fit_projection(name, params,
+                                                                 table,
+                                                                 model = model)
+                                       )
+        saved.append(name)
+
+    return saved
+
+
+### project_sites(rows, names = PROJECTED_JOBS, model_dir = model_dir)
+# Places new sites into the saved layouts. rows is a DataFrame with one
+# row per new site and the columns of the environmental table (plus the
+# g_to_plot count for "UMAP 6"); missing values are imputed. Returns
+# name -> [dimension][site] arrays like fit_umaps().
+###
+def project_sites(rows, names = PROJECTED_JOBS, model_dir = model_dir) :
+    rows = encode_sites(rows)
+
+    return {name : np.transpose(projection.project(
+                       projection.load_projection(model_dir, name), rows))
+            for name in names}
+
+
+### scale_genus_data(genus_data)
+# Orders the sites / genera by count and scales the counts to ring areas.
+# genus_data is [genus][site]. Returns GenusScaling. Every step works on
+# the whole array.
+###
+def scale_genus_data(genus_data) :
+    with spans.span("data manipulation") :
+        with spans.span("conversion to float datatype for stability reasons") :
+            genus_data = np.asarray(genus_data, dtype = np.float64) * 2
+
+
+        with spans.span("site where each genus has the highest counts") :
+            site_order_index = ranking.site_order_index(np.transpose(genus_data),
+                                                        threshold = plot_threshold
+                                                        )
+
+        genus_data = np.transpose(genus_data).copy()
+
+        with spans.span("genus that has the most counts at each site") :
+            genus_order_index = ranking.genus_order_index(genus_data,
+                                                          threshold = plot_threshold
+                                                          )
+
+
+        # counts above 0 and plot_threshold become
+        # ((count ** factor_power) * factor_multi) + factor_const, max_count
+        # is the largest scaled value (-1 when there is none above -1).
+        # numpy's vectorized pow can differ from the scalar ** of the old
+        # loop in the last bit, far below what a marker size shows
+        with spans.span("max value and size scaling of all values") :
+            plotted = (genus_data > 0) & (genus_data > plot_threshold)
+            genus_data[plotted] = (np.power(genus_data[plotted], factor_power)
+                                   * factor_multi + factor_const)
+
+            max_count = genus_data[plotted].max(initial = -1)
+
+    return GenusScaling(site_order_index = site_order_index,
+                        genus_order_index = genus_order_index,
+                        genus_sizes = genus_data,
+                        max_count = max_count,
+                        )
+
+
+### figure_context(data, embeddings, scaling, program, out_dir = ".",
+###                data_dir = None)
+# The context dict of fishproject.figures for the given embeddings
+# (from fit_umaps()) and GenusScaling. program is the file name of the
+# calling program, used for the corner texts and the file names.
+###
+def figure_context(data, embeddings, scaling, program, out_dir = ".",
+                   data_dir = None
+                   ) :
+    from matplotlib.markers import MarkerStyle
+
+    shape_list = [MarkerStyle(marker = "o",
+                              fillstyle = "none"
+                              )]
+
+    s_point_shapes = [MarkerStyle(marker = "*", fillstyle = "full"),
+                      MarkerStyle(marker = "s", fillstyle = "full"),
+                      ]
+
+    # combinations of colors and line styles
+    genus_colors, genus_lines = layers.genus_styles(len(data.genus_labels),
+                                                    color_list,
+                                                    line_list
+                                                    )
+
+    with spans.span("eco-region marker and color of every site") :
+        eco = eco_regions.load_eco_regions(data_dir)
+        site_marker_index, site_color_index = eco_regions.site_styles(eco, color_list)
+        eco_sites, eco_markers, eco_colors, eco_labels = eco_regions.legend_styles(eco,
+                                                                                  s_point_shapes,
+                                                                                  color_list
+                                                                                  )
+
+    date_c = datetime.datetime.today().strftime('%m/%d/%Y')
+    ix = str.rfind(program, '.')
+    if ix < 0 :
+        ix = len(program)
+
+    return {"embeddings" : embeddings,
+            "site_order_index" : scaling.site_order_index,
+            "genus_order_index" : scaling.genus_order_index,
+            "genus_sizes" : scaling.genus_sizes,
+            "genus_labels" : list(data.genus_labels),
+            "genus_colors" : genus_colors,
+            "genus_lines" : genus_lines,
+            "focus_genus" : find_val(data.genus_labels, g_to_plot),
+            "ring_marker" : shape_list[0],
+            "line_widths" : line_widths,
+            "site_markers" : s_point_shapes,
+            "site_marker_index" : site_marker_index,
+            "site_color_index" : site_color_index,
+            "eco_sites" : eco_sites,
+            "eco_markers" : eco_markers,
+            "eco_colors" : eco_colors,
+            "eco_labels" : eco_labels,
+            "label_offsets" : {"2D" : (x_offset, y_offset),
+                               "3D" : (x3_offset, y3_offset, z3_offset),
+                               "3D_wf" : (x3_offset_wf, y3_offset_wf,
+                                          z3_offset_wf),
+                               },
+            "rot" : rot,
+            "focal_len" : focal_len,
+            "plot_threshold" : plot_threshold,
+            "dpi" : dpi_var,
+            "corner_texts" : (program + ' (' + date_c + ')',
+                              author_name,
+                              str("\"" + os.path.basename(catalog.find_table_file("environment", data_dir)) + "\", " +
+                                  "\"" + os.path.basename(catalog.find_table_file("genus", data_dir)) + "\""
+                                  ),
+                              ),
+            "out_dir" : out_dir,
+            "file_prefix" : program[:ix],
+            "formats" : ["png"],
+            }
+
+
+### embeddings_for(numbers)
+# Names of the EMBEDDINGS drawn by the given figure numbers.
+###
+def embeddings_for(numbers) :
+    from fishproject import figures
+
+    unknown = [number for number in numbers if number not in figures.FIGURES]
+    if unknown :
+        raise ValueError("unknown figure numbers: " + repr(unknown))
+
+    return list(dict.fromkeys(figures.FIGURES[number]["embedding"]
+                              for number in numbers))
+
+
+### run(numbers = None, program = "beaty_sethData_v4p2.py", out_dir = ".",
+###     headless = False, render_workers = None, umap_workers = None,
+###     cache_dir = embedding_cache_dir, data_dir = None,
+###     save_models_dir = None, trace_path = None, trace_format = "chrome",
+###     memory_budget = None, preview_dpi = None, formats = None)
+# Runs the whole pipeline for the given figure numbers (all by default)
+# and returns the paths of the saved figures. Only the UMAPs those
+# figures use are fitted. cache_dir None disables the embedding cache.
+# With save_models_dir the PROJECTED_JOBS models are saved there too: the
+# ones fitted for the figures right away, the others (from the embedding
+# cache or not used by the figures) are fitted after the figures, in this
+# process. With trace_path (default: FISHPROJECT_TRACE) the spans of
+# the run are written there, also when the run fails; span recording and
+# tracemalloc are left as the caller had them. memory_budget,
+# preview_dpi and formats (the file formats of the figures, png by
+# default) are passed to fishproject.figures.render_figures().
+###
+def run(numbers = None, program = "beaty_sethData_v4p2.py", out_dir = ".",
+        headless = False, render_workers = None, umap_workers = None,
+        cache_dir = embedding_cache_dir, data_dir = None,
+        save_models_dir = None, trace_path = None, trace_format = "chrome",
+        memory_budget = None, preview_dpi = None, formats = None
+        ) :
+    from fishproject import figures
+
+    if numbers is None :
+        numbers = list(figures.FIGURES)
+    embedding_names = embeddings_for(numbers)
+
+    if trace_path is None :
+        trace_path, trace_format = spans.trace_from_environment()
+    # the caller's span and heap tracing state, restored at the end
+    was_enabled = spans.enabled()
+    was_tracing = tracemalloc.is_tracing()
+    if trace_path is not None :
+        spans.clear()
+        spans.enable()
+
+    try :
+        with spans.span("run") :
+            with spans.span("main") :
+                with spans.span("load") :
+                    data = load_survey_data(data_dir)
+                embeddings = fit_umaps(data, embedding_names,
+                                       max_workers = umap_workers,
+                                       cache_dir = cache_dir,
+                                       model_dir = save_models_dir
+                                       )
+                scaling = scale_genus_data(data.genus_data)
+
+            with spans.span("plots") :
+                context = figure_context(data, embeddings, scaling, program,
+                                         out_dir = out_dir,
+                                         data_dir = data_dir
+                                         )
+
+                os.makedirs(out_dir, exist_ok = True)
+                paths = figures.render_figures(context, numbers,
+                                               headless = headless,
+                                               max_workers = render_workers,
+                                               memory_budget = memory_budget,
+                                               preview_dpi = preview_dpi,
+                                               formats = formats
+                                               )
+
+            if save_models_dir is not None :
+                with spans.span("saving models") :
+                    save_projections(data, model_dir = save_models_dir)
+    finally :
+        if trace_path is not None :
+            spans.write_trace(trace_path, format = trace_format)
+            if not was_enabled :
+                spans.disable()
+            if was_tracing and not tracemalloc.is_tracing() :
+                tracemalloc.start()
+            elif not was_tracing and tracemalloc.is_tracing() :
+                tracemalloc.stop()
+
+    return paths
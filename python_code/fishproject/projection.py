@@ -0,0 +1,178 @@
+# program		fishproject/projection.py
+# purpose	    save fitted UMAP models and place new sites into their
+#               layouts
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  a Projection keeps everything needed to embed new rows the same way
+#     the training rows were: the column names, the fitted imputer and
+#     scaler (either may be None) and the fitted UMAP model. project()
+#     runs model.transform(), which places the new rows into the existing
+#     layout without moving the training sites and without a refit.
+# 2)  projections are pickled to <model_dir>/<name>.pkl with a small
+#     <name>.json next to it holding the input key (see
+#     fishproject.embedding_cache.embedding_key). is_current() reads only
+#     the .json, so checking a saved model does not import umap.
+# 3)  columns missing from the new rows are added as nan and filled by
+#     the imputer with the training values (e.g. the column mean).
+# 4)  the first transform() of a process compiles numba code and takes
+#     seconds; later calls take milliseconds.
+###
+
+### imports
+import json
+import os
+import pickle
+import typing
+
+import numpy as np
+import pandas as pd
+
+from fishproject import embedding_cache
+
+
+### Docstring Data
+__all__ = ["Projection", "fit_projection", "save_projection",
+           "load_projection", "is_current", "project",
+           ]
+
+
+### Projection
+# name    : name of the model (e.g. "UMAP 2")
+# columns : input column names, in training order
+# imputer : fitted imputer or None
+# scaler  : fitted scaler or None
+# model   : fitted UMAP model
+# key     : embedding_key() of the training data and parameters
+###
+class Projection(typing.NamedTuple) :
+    name : str
+    columns : list
+    imputer : object
+    scaler : object
+    model : object
+    key : str
+
+
+### _paths(model_dir, name)
+# Paths of the .pkl and .json files of the projection name.
+###
+def _paths(model_dir, name) :
+    base = os.path.join(model_dir, name.replace(" ", "_"))
+
+    return base + ".pkl", base + ".json"
+
+
+### fit_projection(name, params, table, impute = "mean", scale = False,
+###                model = None)
+# Fits an imputer (strategy impute, None for none), optionally a
+# StandardScaler and umap.UMAP(**params) on table and returns the
+# Projection. The embedding of the training rows is model.embedding_.
+# model is a umap.UMAP(**params) already fitted on the imputed (and
+# scaled) table, it is kept instead of fitting a new one.
+###
+def fit_projection(name, params, table, impute = "mean", scale = False,
+                   model = None
+                   ) :
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+
+    values = table.to_numpy(dtype = np.float64)
+    key = embedding_cache.embedding_key(table, params, "UMAP")
+
+    imputer = None
+    if impute is not None :
+        imputer = SimpleImputer(missing_values = np.nan, strategy = impute)
+        values = imputer.fit_transform(values)
+
+    scaler = None
+    if scale :
+        scaler = StandardScaler()
+        values = scaler.fit_transform(values)
+
+    if model is None :
+        import umap
+
+        model = umap.UMAP(**params)
+        model.fit(values)
+
+    return Projection(name = name,
+                      columns = list(table.columns),
+                      imputer = imputer,
+                      scaler = scaler,
+                      model = model,
+                      key = key,
+                      )
+
+
+### save_projection(model_dir, projection)
+# Pickles projection into model_dir. Both files are written under
+# temporary names first, the .json last, so a partial save is never
+# taken as current.
+###
+def save_projection(model_dir, projection) :
+    os.makedirs(model_dir, exist_ok = True)
+    model_path, meta_path = _paths(model_dir, projection.name)
+
+    if os.path.exists(meta_path) :
+        os.remove(meta_path)
+
+    temp_path = model_path + ".tmp." + str(os.getpid())
+    with open(temp_path, "wb") as file :
+        pickle.dump(projection, file, protocol = pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, model_path)
+
+    temp_path = meta_path + ".tmp." + str(os.getpid())
+    with open(temp_path, "w") as file :
+        json.dump({"name" : projection.name,
+                   "key" : projection.key,
+                   "columns" : projection.columns,
+                   }, file)
+    os.replace(temp_path, meta_path)
+
+
+### is_current(model_dir, name, key = None)
+# True when projection name is saved in model_dir (and was fitted on the
+# input with the given key, when a key is given).
+###
+def is_current(model_dir, name, key = None) :
+    model_path, meta_path = _paths(model_dir, name)
+    if not (os.path.exists(model_path) and os.path.exists(meta_path)) :
+        return False
+    if key is None :
+        return True
+
+    with open(meta_path) as file :
+        return json.load(file).get("key") == key
+
+
+### load_projection(model_dir, name)
+# Loads the saved projection name from model_dir. Raises
+# FileNotFoundError when it was never saved.
+###
+def load_projection(model_dir, name) :
+    model_path, meta_path = _paths(model_dir, name)
+    if not os.path.exists(meta_path) :
+        raise FileNotFoundError("no saved projection " + repr(name) +
+                                " in " + repr(model_dir)
+                                )
+
+    with open(model_path, "rb") as file :
+        return pickle.load(file)
+
+
+### project(projection, rows)
+# Places the rows of the DataFrame rows (one per new site, with the
+# training column names) into the layout of projection. Returns an
+# array [row][dimension].
+###
+def project(projection, rows) :
+    values = rows.reindex(columns = projection.columns).to_numpy(dtype = np.float64)
+
+    if projection.imputer is not None :
+        values = projection.imputer.transform(values)
+    if projection.scaler is not None :
+        values = projection.scaler.transform(values)
+
+    return projection.model.transform(values)
@@ -0,0 +1,120 @@
+# program		fishproject/ranking.py
+# purpose	    vectorized ranking of genus counts per site and per genus
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  replaces the sorted() + find_val() ordering loops of
+#     beaty_sethData_v4p2.py. a stable descending argsort gives the same
+#     order as the old loops: equal counts keep their original (lowest
+#     index first) order, which is what find_val(..., count = n) produced.
+# 2)  entries whose count is not above the threshold are replaced by -1,
+#     the same sentinel the plotting loops already skip.
+# 3)  count matrices are laid out as counts[site][genus] everywhere in
+#     this module.
+###
+
+### imports
+import numpy as np
+
+
+### Docstring Data
+__all__ = ["rank_order_index", "top_k_index",
+           "site_order_index", "genus_order_index",
+           "top_genera_per_site", "top_sites_per_genus",
+           ]
+
+
+### _sort_keys(values)
+# Returns a float copy of values where nan is replaced with -inf so that
+# missing counts always rank last and never pass the threshold test.
+###
+def _sort_keys(values) :
+    keys = np.array(values, dtype = np.float64, ndmin = 2)
+    keys[np.isnan(keys)] = -np.inf
+
+    return keys
+
+
+### rank_order_index(values, threshold = 0.0)
+# Ranks every row of values from the largest to the smallest entry and
+# returns the column indexes in that order, one row per input row. Ties
+# keep their original column order. Positions whose value is not above
+# threshold are set to -1.
+###
+def rank_order_index(values, threshold = 0.0) :
+    keys = _sort_keys(values)
+
+    order = np.argsort(-keys, axis = 1, kind = "stable")
+    ranked = np.take_along_axis(keys, order, axis = 1)
+    order[~(ranked > threshold)] = -1
+
+    return order
+
+
+### top_k_index(values, k, threshold = 0.0)
+# Same result as rank_order_index(values, threshold)[:, :k] but only
+# sorts the k largest entries of each row. argpartition finds the k-th
+# largest value, the entries tied with it are taken lowest index first
+# so that the result matches the full stable ranking exactly.
+###
+def top_k_index(values, k, threshold = 0.0) :
+    keys = _sort_keys(values)
+    n_rows, n_cols = keys.shape
+    k = int(k)
+
+    if k <= 0 :
+        return np.empty((n_rows, 0), dtype = np.intp)
+
+    if k >= n_cols :
+        return rank_order_index(keys, threshold)
+
+    kth = -np.partition(-keys, k - 1, axis = 1)[:, k - 1 : k]
+
+    above = keys > kth
+    tied = keys == kth
+    n_tied_needed = k - np.count_nonzero(above, axis = 1, keepdims = True)
+    chosen = above | (tied & (np.cumsum(tied, axis = 1) <= n_tied_needed))
+
+    # exactly k entries are chosen per row, a stable sort of the boolean
+    # mask pulls them to the front while keeping their column order
+    candidates = np.argsort(~chosen, axis = 1, kind = "stable")[:, :k]
+    candidate_keys = np.take_along_axis(keys, candidates, axis = 1)
+
+    order = np.argsort(-candidate_keys, axis = 1, kind = "stable")
+    top = np.take_along_axis(candidates, order, axis = 1)
+    top[~(np.take_along_axis(candidate_keys, order, axis = 1) > threshold)] = -1
+
+    return top
+
+
+### site_order_index(counts, threshold = 0.0)
+# For counts[site][genus] returns site_order_index[rank][genus], the
+# site with the rank-th highest count of each genus. site_order_index[0]
+# is the site where each genus has the highest count.
+###
+def site_order_index(counts, threshold = 0.0) :
+    return np.transpose(rank_order_index(np.transpose(counts), threshold))
+
+
+### genus_order_index(counts, threshold = 0.0)
+# For counts[site][genus] returns genus_order_index[site][rank], the
+# genus with the rank-th highest count at each site.
+###
+def genus_order_index(counts, threshold = 0.0) :
+    return rank_order_index(counts, threshold)
+
+
+### top_genera_per_site(counts, k, threshold = 0.0)
+# Returns the k most abundant genera at every site as [site][rank].
+###
+def top_genera_per_site(counts, k, threshold = 0.0) :
+    return top_k_index(counts, k, threshold)
+
+
+### top_sites_per_genus(counts, k, threshold = 0.0)
+# Returns the k sites with the highest counts of every genus as
+# [genus][rank].
+###
+def top_sites_per_genus(counts, k, threshold = 0.0) :
+    return top_k_index(np.transpose(counts), k, threshold)
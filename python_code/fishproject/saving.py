@@ -0,0 +1,188 @@
+# program		fishproject/saving.py
+# purpose	    save figures in the background while the next one is drawn
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  saving a 7200 x 4800 figure is two steps: matplotlib draws it into
+#     an RGBA buffer, then the buffer is encoded (png compression takes
+#     most of the time). save_figure() draws the buffer in the calling
+#     thread, copies it and hands the encoding to a pool of
+#     encode_workers threads, so the caller can go on with the next
+#     figure. Pillow lets go of the GIL while it compresses.
+# 2)  matplotlib is not thread safe, only the copied buffer goes to the
+#     threads. the buffer is drawn by fig.savefig(format = "rgba") and
+#     encoded by matplotlib.image.imsave(), the same two steps savefig()
+#     runs for a png, so the files are the same as before. the pdf is
+#     written by Pillow directly (imsave() would build a matplotlib
+#     Figure for it in the thread).
+# 3)  at most max_pending buffers (about 130 MB each at full size) wait
+#     for their encoding. save_figure() blocks while that many are
+#     pending, which keeps the memory bounded when drawing is faster than
+#     encoding.
+# 4)  flush() waits for every pending save, raises the first encoding
+#     error and stops the threads. call it before the files are used and
+#     before the process ends or forks (fishproject.figures.render_figures()
+#     does).
+# 5)  a figure can be saved as png, webp and / or pdf from the one
+#     buffer. webp is lossless, the pdf holds the rendered image (RGB, at
+#     the dpi of the figure) and not vector graphics. Pillow compresses it
+#     as a jpeg, at pdf_quality and without chroma subsampling so the thin
+#     rings and the colors of the small labels stay sharp. dzi writes a
+#     deep zoom tile pyramid with an html viewer (see fishproject.tiles).
+#     every encoding runs in a fishproject.spans span "encode <file>".
+###
+
+### imports
+import concurrent.futures
+import io
+import os
+import threading
+
+import matplotlib.image
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from fishproject import spans
+from fishproject import tiles
+
+
+### Docstring Data
+__all__ = ["encode_workers", "max_pending", "pdf_quality", "FORMATS",
+           "render_buffer", "encode_buffer", "save_figure", "flush",
+           ]
+
+
+### Settings
+encode_workers = 2
+max_pending = 2
+pdf_quality = 95
+
+FORMATS = ("png", "webp", "pdf", "dzi")
+
+_pool = None
+_futures = []
+_slots = None
+_lock = threading.Lock()
+
+
+### render_buffer(fig)
+# Draws fig the way fig.savefig() does and returns (rgba, dpi): a copy of
+# the canvas as a uint8 array [row][column][RGBA] and the dpi it was
+# drawn at.
+###
+def render_buffer(fig) :
+    dpi = plt.rcParams["savefig.dpi"]
+    if dpi == "figure" :
+        dpi = getattr(fig, "_original_dpi", fig.dpi)
+
+    raw = io.BytesIO()
+    fig.savefig(raw, format = "rgba", dpi = dpi)
+
+    width = int(fig.get_figwidth() * dpi)
+    rgba = np.frombuffer(raw.getbuffer(), dtype = np.uint8)
+
+    return rgba.reshape(-1, width, 4), dpi
+
+
+### encode_buffer(rgba, dpi, file_path)
+# Writes the buffer from render_buffer() to file_path, in the format of
+# its extension (one of FORMATS).
+###
+def encode_buffer(rgba, dpi, file_path) :
+    format = os.path.splitext(file_path)[1][1:]
+    # lossy webp smears the thin rings and the small labels
+    pil_kwargs = {"lossless" : True} if format == "webp" else None
+
+    with spans.span("encode " + os.path.basename(file_path), "save") :
+        if format == "dzi" :
+            return tiles.write_pyramid(rgba, file_path)
+
+        if format == "pdf" :
+            height, width = rgba.shape[:2]
+            image = Image.frombuffer("RGBA", (width, height), rgba,
+                                     "raw", "RGBA", 0, 1
+                                     )
+            image.convert("RGB").save(file_path, "PDF",
+                                      resolution = dpi,
+                                      quality = pdf_quality,
+                                      subsampling = 0
+                                      )
+
+            return file_path
+
+        matplotlib.image.imsave(file_path, memoryview(rgba),
+                                format = format,
+                                origin = "upper",
+                                dpi = dpi,
+                                pil_kwargs = pil_kwargs
+                                )
+
+    return file_path
+
+
+### _encode_all(rgba, dpi, paths)
+# Encodes one buffer to every path, then frees its save slot.
+###
+def _encode_all(rgba, dpi, paths) :
+    try :
+        return [encode_buffer(rgba, dpi, path) for path in paths]
+    finally :
+        _slots.release()
+
+
+### save_figure(fig, file_path, formats = ("png",))
+# Draws fig and saves it in the background to file_path with the
+# extension of every format (see general notes 1 and 3). Returns the
+# paths, which exist after flush().
+###
+def save_figure(fig, file_path, formats = ("png",)) :
+    global _pool, _slots
+
+    unknown = [format for format in formats if format not in FORMATS]
+    if unknown :
+        raise ValueError("unknown figure formats: " + repr(unknown))
+
+    rgba, dpi = render_buffer(fig)
+    root = os.path.splitext(file_path)[0]
+    paths = [root + "." + format for format in formats]
+
+    with _lock :
+        if _pool is None :
+            _pool = concurrent.futures.ThreadPoolExecutor(
+                        max_workers = encode_workers,
+                        thread_name_prefix = "encode"
+                        )
+            _slots = threading.BoundedSemaphore(max_pending)
+
+    with spans.span("wait for a save slot", "save") :
+        _slots.acquire()
+    _futures.append(_pool.submit(_encode_all, rgba, dpi, paths))
+
+    return paths
+
+
+### flush()
+# Waits for every pending save and stops the encoding threads. Returns
+# the saved paths and raises the first error of an encoding.
+###
+def flush() :
+    global _pool
+
+    with _lock :
+        pool = _pool
+        futures = list(_futures)
+        _pool = None
+        del _futures[:]
+
+    if pool is None :
+        return []
+
+    pool.shutdown(wait = True)
+
+    paths = []
+    for future in futures :
+        paths += future.result()
+
+    return paths
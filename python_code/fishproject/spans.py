@@ -0,0 +1,361 @@
+# program		fishproject/spans.py
+# purpose	    time and memory of the pipeline stages and figures as
+#               nested spans
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  after enable(), with span("UMAP") : ... records one Span: wall time,
+#     cpu time of the process, the peak of the python heap (tracemalloc)
+#     and the peak RSS of the process. spans nest, a span's peak includes
+#     its children. until enable() (and after disable()) a span records
+#     and measures nothing, it only prints its times when verbose is set.
+# 2)  the python heap is only measured with enable(memory = True) (it
+#     starts tracemalloc, which slows allocations down), peak_memory is
+#     None otherwise. on linux peak_rss is the peak RSS of the process during
+#     the span: the high-water mark is read from /proc/self/status and
+#     reset through /proc/self/clear_refs like the heap peak. elsewhere
+#     (or where clear_refs can not be written) it is the high-water mark
+#     of the process up to the end of the span, and None where the
+#     resource module is missing (Windows). both peaks are of the whole
+#     process, with spans open in several threads each span gets the
+#     peaks of its time.
+# 3)  spans recorded in pool workers are handed back to the parent with
+#     run_collected() / add_records(), so fits and figures drawn in other
+#     processes appear in the trace with their own pid.
+# 4)  write_trace() saves the spans as a chrome trace (chrome://tracing or
+#     https://ui.perfetto.dev, one lane per process and thread) or as a
+#     plain json list. setting the environment variable FISHPROJECT_TRACE
+#     to a file name traces a run of fishproject.pipeline.run() without
+#     any code change (FISHPROJECT_TRACE_FORMAT = json for the plain
+#     list).
+# 5)  with verbose = True every span prints a line with its times (and
+#     its memory peaks after enable()) when it ends, indented by its
+#     depth. this replaces the old "start ..." / "end ..." print markers.
+#     verbose is off by default, beaty_sethData_v4p2.py and the command
+#     line turn it on.
+###
+
+### imports
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import typing
+
+try :
+    import resource
+except ImportError :
+    resource = None
+
+
+### Docstring Data
+__all__ = ["Span", "verbose", "enable", "disable", "enabled", "span",
+           "records", "clear", "add_records", "run_collected", "write_trace",
+           "trace_from_environment",
+           ]
+
+
+### Settings
+verbose = False
+
+_records = []
+_local = threading.local()
+_stacks = []
+_rss_reset = None
+_enabled = False
+
+
+### Span
+# name        : name of the span
+# category    : kind of span ("stage", "umap", "figure", ...)
+# pid, tid    : process and thread it ran in
+# start       : start time in seconds since the epoch
+# wall        : wall time in seconds
+# cpu         : cpu time of the process in seconds
+# peak_memory : peak of the traced python heap in bytes, or None
+# peak_rss    : peak RSS of the process in bytes, or None
+# depth       : number of enclosing spans
+# args        : extra values, e.g. the figure number
+###
+class Span(typing.NamedTuple) :
+    name : str
+    category : str
+    pid : int
+    tid : int
+    start : float
+    wall : float
+    cpu : float
+    peak_memory : typing.Optional[int]
+    peak_rss : typing.Optional[int]
+    depth : int
+    args : dict
+
+
+### _stack()
+# The open spans of this thread, innermost last.
+###
+def _stack() :
+    if not hasattr(_local, "stack") :
+        _local.stack = []
+        _stacks.append(_local.stack)
+
+    return _local.stack
+
+
+### _open_frames()
+# The open spans of every thread: the heap and RSS peaks belong to the
+# whole process.
+###
+def _open_frames() :
+    return [frame for stack in list(_stacks) for frame in list(stack)]
+
+
+### _fold_peak()
+# Adds the heap and RSS peaks since the last call to every open span and
+# restarts the peak measurements.
+###
+def _fold_peak() :
+    rss = _peak_rss()
+    if rss is not None :
+        for frame in _open_frames() :
+            frame["rss"] = max(frame["rss"], rss)
+        _reset_peak_rss()
+
+    if not tracemalloc.is_tracing() :
+        return
+
+    peak = tracemalloc.get_traced_memory()[1]
+    for frame in _open_frames() :
+        frame["peak"] = max(frame["peak"], peak)
+    tracemalloc.reset_peak()
+
+
+### _peak_rss()
+# High-water mark of the RSS of this process in bytes (since the last
+# reset on linux), or None.
+###
+def _peak_rss() :
+    if _rss_reset :
+        with open("/proc/self/status") as status :
+            for line in status :
+                if line.startswith("VmHWM:") :
+                    return int(line.split()[1]) * 1024
+
+    if resource is None :
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+### _reset_peak_rss()
+# Resets the RSS high-water mark of this process to the current RSS where
+# the os allows it (see general note 2).
+###
+def _reset_peak_rss() :
+    global _rss_reset
+
+    if _rss_reset is False :
+        return
+
+    try :
+        with open("/proc/self/clear_refs", "w") as clear_refs :
+            clear_refs.write("5")
+        _rss_reset = True
+    except OSError :
+        _rss_reset = False
+
+
+### _format_bytes(size)
+# size in MB for the verbose lines.
+###
+def _format_bytes(size) :
+    return "{:.1f} MB".format(size / 2**20)
+
+
+### enable(memory = True)
+# Starts recording spans and measuring their RSS, with memory also the
+# python heap (see general notes 1 and 2).
+###
+def enable(memory = True) :
+    global _enabled
+
+    _enabled = True
+    if memory and not tracemalloc.is_tracing() :
+        tracemalloc.start()
+
+
+### disable()
+# Stops recording spans and measuring memory.
+###
+def disable() :
+    global _enabled
+
+    _enabled = False
+    if tracemalloc.is_tracing() :
+        tracemalloc.stop()
+
+
+### enabled()
+# True between enable() and disable().
+###
+def enabled() :
+    return _enabled
+
+
+### span(name, category = "stage", **args)
+# Context manager that records the Span of its block after enable(). The
+# Span is also recorded when the block raises.
+###
+@contextlib.contextmanager
+def span(name, category = "stage", **args) :
+    if not (_enabled or verbose) :
+        yield
+        return
+
+    measure = _enabled
+    if measure :
+        _fold_peak()
+    stack = _stack()
+    frame = {"peak" : 0, "rss" : 0}
+    stack.append(frame)
+
+    start = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try :
+        yield
+    finally :
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        tracing = measure and tracemalloc.is_tracing()
+        if measure :
+            _fold_peak()
+        stack.pop()
+
+        record = Span(name = name,
+                      category = category,
+                      pid = os.getpid(),
+                      tid = threading.get_ident(),
+                      start = start,
+                      wall = wall,
+                      cpu = cpu,
+                      peak_memory = frame["peak"] if tracing else None,
+                      peak_rss = frame["rss"] or None,
+                      depth = len(stack),
+                      args = args,
+                      )
+        if measure :
+            _records.append(record)
+
+        if verbose :
+            line = "\t" * len(stack) + "{} : {:.2f} s (cpu {:.2f} s".format(name,
+                                                                         wall,
+                                                                         cpu
+                                                                         )
+            if record.peak_memory is not None :
+                line += ", heap peak " + _format_bytes(record.peak_memory)
+            if record.peak_rss is not None :
+                line += ", rss peak " + _format_bytes(record.peak_rss)
+            print(line + ")")
+
+
+### records()
+# The spans recorded so far, in the order they ended.
+###
+def records() :
+    return list(_records)
+
+
+### clear()
+# Forgets the recorded spans.
+###
+def clear() :
+    del _records[:]
+
+
+### add_records(spans)
+# Adds spans recorded elsewhere (e.g. returned by a worker process).
+###
+def add_records(spans) :
+    _records.extend(spans)
+
+
+### run_collected(name, category, function, *args)
+# Runs function(*args) inside span(name, category) and returns (result,
+# spans) with the spans recorded during the call, which are removed from
+# this process's list. Pool workers use it to hand their spans back to
+# the parent, which adds them with add_records().
+###
+def run_collected(name, category, function, *args) :
+    mark = len(_records)
+    with span(name, category) :
+        result = function(*args)
+
+    collected = _records[mark:]
+    del _records[mark:]
+
+    return result, collected
+
+
+### _chrome_event(record)
+# record as a complete ("X") event of the chrome trace format.
+###
+def _chrome_event(record) :
+    args = dict(record.args, cpu_s = record.cpu)
+    if record.peak_memory is not None :
+        args["peak_memory_mb"] = record.peak_memory / 2**20
+    if record.peak_rss is not None :
+        args["peak_rss_mb"] = record.peak_rss / 2**20
+
+    return {"name" : record.name,
+            "cat" : record.category,
+            "ph" : "X",
+            "ts" : record.start * 1e6,
+            "dur" : record.wall * 1e6,
+            "pid" : record.pid,
+            "tid" : record.tid,
+            "args" : args,
+            }
+
+
+### write_trace(path, spans = None, format = "chrome")
+# Writes spans (default: all recorded spans) to path as a chrome trace or,
+# with format = "json", as a json list of the Span fields. Returns path.
+###
+def write_trace(path, spans = None, format = "chrome") :
+    if spans is None :
+        spans = records()
+
+    if format == "chrome" :
+        content = {"traceEvents" : [_chrome_event(record) for record in spans],
+                   "displayTimeUnit" : "ms",
+                   }
+    elif format == "json" :
+        content = [record._asdict() for record in spans]
+    else :
+        raise ValueError("unknown trace format " + repr(format))
+
+    folder = os.path.dirname(path)
+    if folder :
+        os.makedirs(folder, exist_ok = True)
+
+    with open(path, "w") as file :
+        json.dump(content, file, indent = 1, default = repr)
+
+    return path
+
+
+### trace_from_environment()
+# Returns (path, format) from FISHPROJECT_TRACE and
+# FISHPROJECT_TRACE_FORMAT, path None when tracing is not asked for.
+###
+def trace_from_environment() :
+    return (os.environ.get("FISHPROJECT_TRACE") or None,
+            os.environ.get("FISHPROJECT_TRACE_FORMAT", "chrome"),
+            )
@@ -0,0 +1,122 @@
+# program		fishproject/sweep.py
+# purpose	    UMAP parameter sweeps that share the nearest neighbor graph
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  the nearest neighbor graph of a UMAP only depends on the data,
+#     n_neighbors and the metric. sweep() computes it once for every
+#     (n_neighbors, metric) pair of the grid and hands it to every grid
+#     point with that pair as precomputed_knn, so min_dist, n_epochs,
+#     learning_rate, ... variants only run the layout optimization.
+# 2)  the distances and graphs come from fishproject.distances. for data
+#     under 4096 rows a grid point gives the same embedding as a plain fit
+#     with the same parameters.
+# 3)  the grid points are fitted with fishproject.fit_scheduler, so they
+#     run in a process pool (and the same fork / spawn rules apply). the
+#     embedding cache is not used.
+# 4)  contact_sheet() draws every embedding as a small scatter plot on one
+#     png, titled with the parameters that change across the grid. it
+#     draws on an Agg canvas and never opens a window.
+###
+
+### imports
+import itertools
+import math
+import typing
+
+import numpy as np
+
+from fishproject import fit_scheduler
+
+
+### Docstring Data
+__all__ = ["SweepPoint", "parameter_grid", "sweep", "contact_sheet"]
+
+
+### SweepPoint
+# params    : umap.UMAP() keyword arguments of the grid point (without
+#             precomputed_knn)
+# embedding : array [row][dimension]
+# seconds   : fit time
+###
+class SweepPoint(typing.NamedTuple) :
+    params : dict
+    embedding : np.ndarray
+    seconds : float
+
+
+### parameter_grid(grid, base_params = None)
+# Expands grid, a dict of parameter name -> list of values, into the list
+# of every combination, each merged into base_params. The last parameter
+# of grid changes fastest.
+###
+def parameter_grid(grid, base_params = None) :
+    base_params = dict(base_params or {})
+    names = list(grid)
+
+    return [dict(base_params, **dict(zip(names, values)))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+### sweep(data, grid, base_params = None, max_workers = None)
+# Fits a UMAP of data for every point of parameter_grid(grid,
+# base_params) and returns a list of SweepPoint in grid order. Each
+# (n_neighbors, metric) graph is computed once (see general note 1).
+###
+def sweep(data, grid, base_params = None, max_workers = None) :
+    points = parameter_grid(grid, base_params)
+    values = np.asarray(data, dtype = np.float32)
+
+    jobs = {number : (params, values) for number, params in enumerate(points)}
+    embeddings, timings, _ = fit_scheduler.fit_embeddings(jobs,
+                                                          max_workers = max_workers,
+                                                          shared_knn = True
+                                                          )
+
+    return [SweepPoint(params = points[number],
+                       embedding = embeddings[number],
+                       seconds = timings[number])
+            for number in jobs]
+
+
+### contact_sheet(points, file_path, colors = None, columns = None,
+###               panel_size = 3.0, dpi = 100)
+# Draws the embeddings of points (from sweep()) on one png at file_path,
+# columns panels per row (about square by default). colors, one per row
+# of the data, colors the points. 3D embeddings are drawn from their
+# first two dimensions.
+###
+def contact_sheet(points, file_path, colors = None, columns = None,
+                  panel_size = 3.0, dpi = 100
+                  ) :
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if columns is None :
+        columns = math.ceil(math.sqrt(len(points)))
+    rows = math.ceil(len(points) / columns)
+
+    # only the parameters that change across the sweep go in the titles
+    names = [name for name in points[0].params
+             if len({repr(point.params.get(name)) for point in points}) > 1]
+
+    fig = Figure(figsize = (columns * panel_size, rows * panel_size), dpi = dpi)
+    FigureCanvasAgg(fig)
+
+    for number, point in enumerate(points) :
+        ax = fig.add_subplot(rows, columns, number + 1)
+        ax.scatter(point.embedding[:, 0], point.embedding[:, 1],
+                   s = 8, c = colors
+                   )
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_title("\n".join(name + " = " + str(point.params[name])
+                               for name in names),
+                     fontsize = 7
+                     )
+
+    fig.tight_layout()
+    fig.savefig(file_path)
+
+    return file_path
@@ -0,0 +1,300 @@
+# program		fishproject/tiles.py
+# purpose	    deep zoom tile pyramids of the figures and a small html
+#               viewer for them
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  write_pyramid() cuts a figure into tile_size x tile_size tiles at
+#     every zoom level, halving the image from one level to the next
+#     down to a single pixel. the layout is the deep zoom (dzi) one:
+#         figN.dzi                   size, tile size and tile format
+#         figN_files/LEVEL/COL_ROW.png
+#     with the highest level at full size, so OpenSeadragon and other dzi
+#     viewers open it too.
+# 2)  next to it figN.html is a viewer without any dependency: it only
+#     loads the tiles inside the window at the level that matches the
+#     zoom. drag to pan, scroll to zoom, double click to fit the figure.
+#     it works from the file system (open the html file in a browser).
+# 3)  the tiles of a level are encoded by tile_workers threads (Pillow
+#     lets go of the GIL while it compresses), the next level is scaled
+#     down in the meantime.
+# 4)  figures are exported with the "dzi" format of fishproject.saving
+#     (python -m fishproject render --formats png,dzi) or from pngs that
+#     are already saved with export_image() (python -m fishproject tiles
+#     FILE ...).
+###
+
+### imports
+import concurrent.futures
+import json
+import math
+import os
+import string
+
+import numpy as np
+from PIL import Image
+
+from fishproject import spans
+
+
+### Docstring Data
+__all__ = ["tile_size", "tile_format", "tile_workers", "pyramid_levels",
+           "write_pyramid", "write_viewer", "export_image",
+           ]
+
+
+### Settings
+tile_size = 512
+tile_format = "png"
+tile_workers = None # None uses one thread per CPU core
+
+_DZI = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008"\n'
+        '       Format="{format}" Overlap="0" TileSize="{tile_size}">\n'
+        '  <Size Width="{width}" Height="{height}"/>\n'
+        '</Image>\n'
+        )
+
+_VIEWER = string.Template('''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+html, body { margin: 0; height: 100%; overflow: hidden; background: #808080; }
+#view { position: absolute; left: 0; top: 0; right: 0; bottom: 0; cursor: grab; }
+#view img { position: absolute; user-select: none; -webkit-user-drag: none; }
+#info { position: absolute; left: 8px; bottom: 8px; padding: 2px 6px;
+        font: 12px sans-serif; background: white; }
+</style>
+</head>
+<body>
+<div id="view"></div>
+<div id="info"></div>
+<script>
+var image = $config;
+var view = document.getElementById("view");
+var info = document.getElementById("info");
+var tiles = {};
+var scale = 1, x = 0, y = 0;
+
+// scale and position that show the whole figure
+function fit() {
+  scale = Math.min(view.clientWidth / image.width, view.clientHeight / image.height);
+  x = (view.clientWidth - image.width * scale) / 2;
+  y = (view.clientHeight - image.height * scale) / 2;
+  draw();
+}
+
+// shows the tiles inside the window at the level of the zoom and drops
+// the others
+function draw() {
+  var top = image.levels - 1;
+  var level = top + Math.ceil(Math.log2(scale * (window.devicePixelRatio || 1)));
+  level = Math.max(0, Math.min(top, level));
+  var size = image.tileSize * Math.pow(2, top - level); // in figure pixels
+
+  var first_col = Math.max(0, Math.floor(-x / scale / size));
+  var first_row = Math.max(0, Math.floor(-y / scale / size));
+  var end_col = Math.min(Math.ceil(image.width / size),
+                         Math.ceil((view.clientWidth - x) / scale / size));
+  var end_row = Math.min(Math.ceil(image.height / size),
+                         Math.ceil((view.clientHeight - y) / scale / size));
+
+  var shown = {};
+  for (var row = first_row; row < end_row; row++) {
+    for (var col = first_col; col < end_col; col++) {
+      var key = level + "/" + col + "_" + row;
+      var tile = tiles[key];
+      if (!tile) {
+        tile = document.createElement("img");
+        tile.src = image.files + "/" + key + "." + image.format;
+        view.appendChild(tile);
+        tiles[key] = tile;
+      }
+      var left = Math.floor(x + col * size * scale);
+      var upper = Math.floor(y + row * size * scale);
+      var right = x + Math.min((col + 1) * size, image.width) * scale;
+      var lower = y + Math.min((row + 1) * size, image.height) * scale;
+      tile.style.left = left + "px";
+      tile.style.top = upper + "px";
+      tile.style.width = (Math.ceil(right) - left) + "px";
+      tile.style.height = (Math.ceil(lower) - upper) + "px";
+      shown[key] = true;
+    }
+  }
+
+  for (var key in tiles) {
+    if (!shown[key]) {
+      view.removeChild(tiles[key]);
+      delete tiles[key];
+    }
+  }
+
+  info.textContent = Math.round(scale * 100) + " %, level " + level + " of " +
+                     top + ", " + Object.keys(tiles).length + " tiles";
+}
+
+view.addEventListener("wheel", function (event) {
+  event.preventDefault();
+  var factor = event.deltaY < 0 ? 1.25 : 0.8;
+  var fit_scale = Math.min(view.clientWidth / image.width, view.clientHeight / image.height);
+  var new_scale = Math.max(fit_scale / 4, Math.min(8, scale * factor));
+  // keep the point under the mouse in place
+  x = event.clientX - (event.clientX - x) * new_scale / scale;
+  y = event.clientY - (event.clientY - y) * new_scale / scale;
+  scale = new_scale;
+  draw();
+}, {passive: false});
+
+var drag = null;
+view.addEventListener("mousedown", function (event) {
+  drag = [event.clientX - x, event.clientY - y];
+  view.style.cursor = "grabbing";
+});
+window.addEventListener("mousemove", function (event) {
+  if (drag) {
+    x = event.clientX - drag[0];
+    y = event.clientY - drag[1];
+    draw();
+  }
+});
+window.addEventListener("mouseup", function () {
+  drag = null;
+  view.style.cursor = "grab";
+});
+view.addEventListener("dblclick", fit);
+window.addEventListener("resize", draw);
+fit();
+</script>
+</body>
+</html>
+''')
+
+
+### pyramid_levels(width, height)
+# (width, height) of every level of the pyramid of a width x height image,
+# from the 1 x 1 level 0 up to the full size.
+###
+def pyramid_levels(width, height) :
+    top = math.ceil(math.log2(max(width, height, 1)))
+
+    return [(math.ceil(width / 2**(top - level)),
+             math.ceil(height / 2**(top - level)))
+            for level in range(top + 1)]
+
+
+### _save_tile(tile, file_path, format)
+# Encodes one tile.
+###
+def _save_tile(tile, file_path, format) :
+    tile.save(file_path, format = format)
+
+
+### write_viewer(dzi_path, width, height, tile_size = tile_size,
+###              tile_format = tile_format)
+# Writes the html viewer of the pyramid of dzi_path next to it (see
+# general note 2) and returns its path.
+###
+def write_viewer(dzi_path, width, height, tile_size = tile_size,
+                 tile_format = tile_format
+                 ) :
+    root = os.path.splitext(dzi_path)[0]
+    config = {"width" : width,
+              "height" : height,
+              "tileSize" : tile_size,
+              "levels" : len(pyramid_levels(width, height)),
+              "format" : tile_format,
+              "files" : os.path.basename(root) + "_files",
+              }
+
+    html_path = root + ".html"
+    with open(html_path, "w") as file :
+        file.write(_VIEWER.substitute(title = os.path.basename(root),
+                                      config = json.dumps(config)
+                                      ))
+
+    return html_path
+
+
+### write_pyramid(image, dzi_path, tile_size = tile_size,
+###               tile_format = tile_format, max_workers = tile_workers)
+# Writes the tile pyramid of image (a PIL image or an array [row][column]
+# [RGB(A)]) as dzi_path, its _files folder and the html viewer (see
+# general notes 1 - 3). Opaque images are saved without alpha. Returns
+# dzi_path.
+###
+def write_pyramid(image, dzi_path, tile_size = tile_size,
+                  tile_format = tile_format, max_workers = tile_workers
+                  ) :
+    if not isinstance(image, Image.Image) :
+        image = Image.fromarray(np.asarray(image))
+    if image.mode not in ("L", "RGB", "RGBA") :
+        image = image.convert("RGBA")
+    if image.mode == "RGBA" and image.getextrema()[3][0] == 255 :
+        image = image.convert("RGB")
+
+    width, height = image.size
+    levels = pyramid_levels(width, height)
+    files_dir = os.path.splitext(dzi_path)[0] + "_files"
+
+    with spans.span("tiles " + os.path.basename(dzi_path), "save") :
+        if max_workers is None :
+            max_workers = os.cpu_count() or 1
+
+        futures = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers = max_workers) as pool :
+            for level in reversed(range(len(levels))) :
+                if image.size != levels[level] :
+                    image = image.reduce(2)
+
+                level_dir = os.path.join(files_dir, str(level))
+                os.makedirs(level_dir, exist_ok = True)
+
+                for row in range(math.ceil(image.size[1] / tile_size)) :
+                    for col in range(math.ceil(image.size[0] / tile_size)) :
+                        tile = image.crop((col * tile_size,
+                                           row * tile_size,
+                                           min((col + 1) * tile_size, image.size[0]),
+                                           min((row + 1) * tile_size, image.size[1])
+                                           ))
+                        file_path = os.path.join(level_dir,
+                                                 str(col) + "_" + str(row) +
+                                                 "." + tile_format
+                                                 )
+                        futures.append(pool.submit(_save_tile, tile, file_path,
+                                                   tile_format
+                                                   ))
+
+        for future in futures :
+            future.result()
+
+        with open(dzi_path, "w") as file :
+            file.write(_DZI.format(format = tile_format,
+                                   tile_size = tile_size,
+                                   width = width,
+                                   height = height
+                                   ))
+        write_viewer(dzi_path, width, height, tile_size, tile_format)
+
+    return dzi_path
+
+
+### export_image(file_path, out_dir = None, **kwargs)
+# Writes the tile pyramid of the saved image file_path (e.g. a figure png)
+# to out_dir (default: the folder of file_path), with the keyword
+# arguments of write_pyramid(). Returns the path of the dzi file.
+###
+def export_image(file_path, out_dir = None, **kwargs) :
+    if out_dir is None :
+        out_dir = os.path.dirname(file_path)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+
+    os.makedirs(out_dir or ".", exist_ok = True)
+    with Image.open(file_path) as image :
+        image.load()
+
+        return write_pyramid(image, os.path.join(out_dir, name + ".dzi"),
+                             **kwargs
+                             )
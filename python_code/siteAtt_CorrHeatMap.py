@@ -6,25 +6,34 @@ import os
 from matplotlib import colormaps
 list(colormaps)
 
+from fishproject import catalog, permutation
+
 # === Load Data ===
-data = pd.read_csv('data/seth_environmentalGenusCountData_nov2024.csv')
+data = catalog.load_table('environment_genus')  # indexed by SiteN
+
+data = data.drop(columns=['State','Lat','Long', 'Ameiurus','Aphredoderus','Aplodinotus','Campostoma','Cyprinella','Cyprinus','Dorosoma','Ellasoma','Erimyzon','Esox','Etheostoma','Fundulus','Gambusia','Ictalurus','Labidesthes','Lepisosteus','Lepomis','Lythrus','Macrohybopsis','Micropterus','Minytrema','Moxostoma','Nototropis','Notemigonus','Notropis','Noturus','Percina','Phenocobius','Pimephales','Semotilus'])
 
-data = data.drop(columns=['SiteN','State','Lat','Long', 'Ameiurus','Aphredoderus','Aplodinotus','Campostoma','Cyprinella','Cyprinus','Dorosoma','Ellasoma','Erimyzon','Esox','Etheostoma','Fundulus','Gambusia','Ictalurus','Labidesthes','Lepisosteus','Lepomis','Lythrus','Macrohybopsis','Micropterus','Minytrema','Moxostoma','Nototropis','Notemigonus','Notropis','Noturus','Percina','Phenocobius','Pimephales','Semotilus'])
+# === Compute correlation matrix and permutation p-values ===
+num_cols = data.select_dtypes('number').columns
+c_test = permutation.permutation_test(data, num_cols, n_permutations=5000, seed=24)
+c_m = c_test.r
 
-# === Compute correlation matrix ===
-c_m = data.corr(numeric_only=True)
+# Hide cells that are not significant after FDR correction (the diagonal stays)
+fdr_alpha = 0.05
+c_mask = c_test.q > fdr_alpha
 
 # === Ensure output folder exists ===
-os.makedirs("../figures", exist_ok=True)
+os.makedirs("figures", exist_ok=True)
 
 # === Plot and save ===
 plt.figure(figsize=(12, 10))
-sns.heatmap(c_m, cmap="flare", annot=False)
-plt.title("Correlation Heatmap of Environmental & Genus Data")
+sns.heatmap(c_m, mask=c_mask, cmap="flare", annot=False)
+plt.title("Correlation Heatmap of Environmental & Genus Data\n"
+          "(cells with FDR q > " + str(fdr_alpha) + " hidden)")
 
 # Save the figure
 plt.tight_layout()
-plt.show("figures/correlation_heatmap.png", dpi=300, bbox_inches='tight')
+plt.savefig("figures/correlation_heatmap.png", dpi=300, bbox_inches='tight')
 plt.close()  # ensures the figure is finalized and file is written
 
 print("✅ Heatmap saved to figures/correlation_heatmap.png")
\ No newline at end of file
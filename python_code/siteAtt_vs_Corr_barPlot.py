@@ -2,12 +2,10 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Load dataset
-segc_d = pd.read_csv('data/seth_environmentalGenusCountData_nov2024.csv')
+from fishproject import bootstrap, catalog
 
-segc_d.columns = segc_d.columns.str.strip()          # remove leading/trailing spaces
-segc_d.columns = segc_d.columns.str.replace(' ', '_') # replace internal spaces with underscores
-segc_d.columns = segc_d.columns.str.replace('\n', '') # remove newlines if present
+# Load dataset (column names are normalized by the catalog)
+segc_d = catalog.load_table('environment_genus')
 
 # Select environmental columns
 env_cols = [
@@ -18,9 +16,12 @@ env_cols = [
     'slopePercent', 'avgMonthFlow_cfs', 'CV_flow', 'maxMonthFlow_cfs', 'minMonthFlow_cfs'
 ]
 
-# Correlation with total fish and richness
-corr_total = segc_d[env_cols + ['t_population']].corr()['t_population'][env_cols]
-corr_rich = segc_d[env_cols + ['t_species']].corr()['t_species'][env_cols]
+# Correlation with total fish and richness (one pass for both responses),
+# with 95% bootstrap confidence intervals
+corr_fish = bootstrap.bootstrap_correlate(segc_d, env_cols, ['t_population', 't_species'],
+                                          n_resamples=2000, confidence=0.95, seed=24)
+corr_total = corr_fish.r['t_population']
+corr_rich = corr_fish.r['t_species']
 
 corr_segc_d = pd.DataFrame({
     'Attribute': env_cols,
@@ -29,7 +30,15 @@ corr_segc_d = pd.DataFrame({
 }).melt(id_vars='Attribute', var_name='Metric', value_name='Correlation')
 
 plt.figure(figsize=(12, 6))
-sns.barplot(data=corr_segc_d, x='Attribute', y='Correlation', hue='Metric')
+ax = sns.barplot(data=corr_segc_d, x='Attribute', y='Correlation', hue='Metric', errorbar=None)
+
+# Bootstrap confidence intervals as error bars (one bar container per metric)
+for bars, response in zip(ax.containers, ['t_population', 't_species']):
+    r = corr_fish.r[response].values
+    x = [bar.get_x() + bar.get_width() / 2 for bar in bars]
+    yerr = [r - corr_fish.low[response].values, corr_fish.high[response].values - r]
+    ax.errorbar(x, r, yerr=yerr, fmt='none', ecolor='black', elinewidth=1, capsize=2)
+
 plt.xticks(rotation=45, ha='right')
 plt.title('Correlation of Environmental Attributes with Fish Metrics', fontsize=14)
 plt.axhline(0, color='gray', linestyle='--', lw=1)
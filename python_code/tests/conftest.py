@@ -0,0 +1,16 @@
+# program		tests/conftest.py
+# purpose	    makes the fishproject package importable for the tests
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  run the tests from the python_code/ directory:
+#         python -m pytest -q tests
+###
+
+### imports
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
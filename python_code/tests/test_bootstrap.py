@@ -0,0 +1,50 @@
+# program		tests/test_bootstrap.py
+# purpose	    bootstrap confidence intervals of the correlations
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+
+from fishproject import bootstrap
+
+
+### _pair(n_rows, seed)
+# n_rows of x and y with a correlation of about 0.6.
+###
+def _pair(n_rows, seed) :
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size = n_rows)
+
+    return pd.DataFrame({"x" : x, "y" : 0.6 * x + 0.8 * rng.normal(size = n_rows)})
+
+
+def test_interval_contains_r_and_narrows() :
+    widths = []
+    for n_rows in [20, 80, 320] :
+        result = bootstrap.bootstrap_correlate(_pair(n_rows, 7), ["x"], ["y"],
+                                               n_resamples = 1000, seed = 3
+                                               )
+        r = result.r.loc["x", "y"]
+        low = result.low.loc["x", "y"]
+        high = result.high.loc["x", "y"]
+
+        assert low < r < high
+        widths.append(high - low)
+
+    assert widths[0] > widths[1] > widths[2]
+
+
+def test_same_intervals_for_any_chunk_size() :
+    table = _pair(50, 8)
+
+    one = bootstrap.bootstrap_correlate(table, ["x"], ["y"], n_resamples = 300,
+                                        chunk_size = 300
+                                        )
+    many = bootstrap.bootstrap_correlate(table, ["x"], ["y"], n_resamples = 300,
+                                         chunk_size = 7
+                                         )
+
+    assert np.array_equal(one.low, many.low)
+    assert np.array_equal(one.high, many.high)
@@ -0,0 +1,32 @@
+# program		tests/test_catalog.py
+# purpose	    column name normalization of fishproject.catalog
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import pandas as pd
+import pytest
+
+from fishproject import catalog
+
+
+@pytest.mark.parametrize("name, expected",
+                         [("﻿Site_N", "SiteN"),
+                          ("SiteN", "SiteN"),
+                          ("pf_wood\n", "pflow_wood"),
+                          ("pb_sand", "pbottom_sand"),
+                          ("pft_algae", "pfloat_algae"),
+                          ("pflow_wood", "pflow_wood"),
+                          (" mean depth ", "mean_depth"),
+                          ])
+def test_normalize_name(name, expected) :
+    assert catalog.normalize_name(name) == expected
+
+
+def test_normalize_columns() :
+    frame = pd.DataFrame(columns = ["Site_N", "pb_mud", "State"])
+
+    assert list(catalog.normalize_columns(frame).columns) == ["SiteN",
+                                                              "pbottom_mud",
+                                                              "State",
+                                                              ]
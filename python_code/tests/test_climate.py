@@ -0,0 +1,55 @@
+# program		tests/test_climate.py
+# purpose	    parsing and loading of the 10-day climate series
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from fishproject import climate
+
+
+def test_parse_climate_columns() :
+    columns = ["Segment_10Day",
+               "site_0.maxT", "site_0.palmer_z",
+               "site_1.palmer_z", "site_1.maxT",
+               ]
+
+    sites, features, order = climate.parse_climate_columns(columns)
+
+    assert sites.tolist() == [1, 2]
+    assert features == ["maxT", "palmer_z"]
+    assert order == ["site_0.maxT", "site_0.palmer_z",
+                     "site_1.maxT", "site_1.palmer_z",
+                     ]
+
+
+@pytest.mark.parametrize("columns", [["site_0.maxT", "site_1.palmer_z"],
+                                     ["site_0.maxT", "elevation"],
+                                     ])
+def test_parse_climate_columns_rejects(columns) :
+    with pytest.raises(ValueError) :
+        climate.parse_climate_columns(columns)
+
+
+def test_load_climate_series(tmp_path) :
+    path = tmp_path / "climate.csv"
+    pd.DataFrame({"Segment_10Day" : [1, 2, 3],
+                  "site_0.maxT" : [1.0, 2.0, 3.0],
+                  "site_0.palmer_z" : [4.0, 5.0, 6.0],
+                  "site_1.maxT" : [7.0, 8.0, 9.0],
+                  "site_1.palmer_z" : [10.0, 11.0, 12.0],
+                  }).to_csv(path, index = False)
+
+    for _ in range(2) : # parsed, then read from the cache
+        series = climate.load_climate_series(str(path))
+
+        assert series.values.shape == (3, 2, 2)
+        assert series.values.dtype == np.float32
+        assert series.segments.tolist() == [1, 2, 3]
+        assert series.sites.tolist() == [1, 2]
+        assert series.features == ["maxT", "palmer_z"]
+        assert series.values[1, 1].tolist() == [8.0, 11.0]
+        assert series.values[:, 0, 1].tolist() == [4.0, 5.0, 6.0]
@@ -0,0 +1,29 @@
+# program		tests/test_climate_features.py
+# purpose	    joining the per-site climate features onto the survey tables
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from fishproject import climate_features
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_join_climate_features(indexed) :
+    features = pd.DataFrame({"maxT_mean" : [30.0, 31.0]},
+                            index = pd.Index([1, 2], name = "SiteN")
+                            )
+    table = pd.DataFrame({"SiteN" : [2, 3, 1], "State" : ["TX", "OK", "TX"]})
+    if indexed :
+        table = table.set_index("SiteN")
+
+    joined = climate_features.join_climate_features(table, features)
+
+    assert len(joined) == 3
+    assert ("SiteN" in joined.columns) != indexed
+    assert np.allclose(joined["maxT_mean"], [31.0, np.nan, 30.0],
+                       equal_nan = True
+                       )
@@ -0,0 +1,48 @@
+# program		tests/test_correlation.py
+# purpose	    fishproject.correlation against DataFrame.corr()
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from fishproject import correlation
+
+
+### _table(seed)
+# 40 rows of random attributes a, b, c and responses x, y.
+###
+def _table(seed) :
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(rng.normal(size = (40, 5)),
+                        columns = ["a", "b", "c", "x", "y"]
+                        )
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_correlate_matches_dataframe_corr(method) :
+    table = _table(4)
+    table["c"] = table["c"].round() # ties for the ranks
+
+    result = correlation.correlate(table, ["a", "b", "c"], ["x", "y"], method)
+    expected = table.corr(method = method).loc[["a", "b", "c"], ["x", "y"]]
+
+    assert np.allclose(result.r.to_numpy(), expected.to_numpy())
+    assert (result.n.to_numpy() == 40).all()
+
+
+def test_pearson_with_nan_matches_dataframe_corr() :
+    table = _table(5)
+    table.loc[[3, 7, 11], "b"] = np.nan
+    table.loc[[5, 7], "y"] = np.nan
+
+    result = correlation.correlate(table, ["a", "b", "c"], ["x", "y"])
+    expected = table.corr().loc[["a", "b", "c"], ["x", "y"]]
+
+    assert np.allclose(result.r.to_numpy(), expected.to_numpy())
+    assert result.n.loc["b", "y"] == 36
+    assert result.n.loc["b", "x"] == 37
+    assert result.n.loc["a", "x"] == 40
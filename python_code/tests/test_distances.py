@@ -0,0 +1,41 @@
+# program		tests/test_distances.py
+# purpose	    shared distance matrices and nearest neighbor graphs
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pytest
+
+from fishproject import distances
+
+
+def test_correlation_distances_match_sklearn() :
+    from sklearn.metrics import pairwise_distances
+
+    data = np.random.default_rng(7).normal(size = (40, 6)).astype(np.float32)
+
+    assert np.allclose(distances.correlation_distances(data, block_rows = 16),
+                       pairwise_distances(data, metric = "correlation"),
+                       atol = 1e-5
+                       )
+
+
+def test_distance_matrix_rejects_umap_only_metrics() :
+    with pytest.raises(ValueError, match = "hellinger") :
+        distances.distance_matrix(np.ones((5, 3)), "hellinger")
+
+
+def test_shared_knn_graphs_skips_unsupported_metrics() :
+    data = np.random.default_rng(6).normal(size = (30, 4))
+    jobs = {"corr" : ({"metric" : "correlation", "n_neighbors" : 5}, data),
+            "hell" : ({"metric" : "hellinger"}, data),
+            "mink" : ({"metric" : "euclidean",
+                       "metric_kwds" : {"p" : 3}}, data),
+            }
+
+    knn = distances.shared_knn_graphs(jobs)
+
+    assert list(knn) == ["corr"]
+    assert knn["corr"][0].shape == (30, 5)
+    assert (knn["corr"][0][:, 0] == np.arange(30)).all()
@@ -0,0 +1,117 @@
+# program		tests/test_embedding_cache.py
+# purpose	    keys, hits and eviction of fishproject.embedding_cache
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import os
+
+import numpy as np
+import pytest
+
+from fishproject import embedding_cache
+
+
+_PARAMS = {"n_neighbors" : 7, "metric" : "correlation", "random_state" : 24}
+
+
+def test_embedding_key_is_stable() :
+    data = np.arange(12.0).reshape(4, 3)
+
+    key = embedding_cache.embedding_key(data, _PARAMS)
+
+    assert key == embedding_cache.embedding_key(data.copy(), dict(_PARAMS))
+    assert key == embedding_cache.embedding_key(data.astype(np.float32),
+                                                dict(reversed(list(_PARAMS.items())))
+                                                )
+
+
+def test_embedding_key_changes_with_data_and_params() :
+    data = np.arange(12.0).reshape(4, 3)
+    changed = data.copy()
+    changed[2, 1] += 0.5
+
+    key = embedding_cache.embedding_key(data, _PARAMS)
+
+    assert key != embedding_cache.embedding_key(changed, _PARAMS)
+    assert key != embedding_cache.embedding_key(data.reshape(3, 4), _PARAMS)
+    assert key != embedding_cache.embedding_key(data, dict(_PARAMS,
+                                                           random_state = 25))
+    assert key != embedding_cache.embedding_key(data, dict(_PARAMS,
+                                                           min_dist = 0.3))
+    assert key != embedding_cache.embedding_key(data, _PARAMS, "TSNE")
+
+
+def test_embedding_key_of_params_and_model() :
+    umap = pytest.importorskip("umap")
+    data = np.arange(12.0).reshape(4, 3)
+
+    key = embedding_cache.embedding_key(data, _PARAMS)
+
+    # the defaults are filled in, a model gives the key of its arguments
+    assert key == embedding_cache.embedding_key(data, dict(_PARAMS,
+                                                           min_dist = 0.1))
+    assert key == embedding_cache.embedding_key(data,
+                                                umap.UMAP(**_PARAMS).get_params()
+                                                )
+
+
+def test_save_and_load(tmp_path) :
+    cache_dir = str(tmp_path / "cache")
+    embedding = np.random.default_rng(0).normal(size = (10, 2))
+
+    assert embedding_cache.load_embedding(cache_dir, "missing") is None
+
+    embedding_cache.save_embedding(cache_dir, "key", embedding)
+
+    assert np.array_equal(embedding_cache.load_embedding(cache_dir, "key"),
+                          embedding
+                          )
+    assert os.listdir(cache_dir) == ["key.npz"]
+
+
+def test_truncated_entry_is_a_miss(tmp_path) :
+    cache_dir = str(tmp_path)
+    embedding_cache.save_embedding(cache_dir, "key", np.ones((5, 2)))
+    path = os.path.join(cache_dir, "key.npz")
+    with open(path, "r+b") as file :
+        file.truncate(20)
+
+    assert embedding_cache.load_embedding(cache_dir, "key") is None
+    assert not os.path.exists(path)
+
+
+def test_evict_least_recently_used(tmp_path) :
+    cache_dir = str(tmp_path)
+    rng = np.random.default_rng(1)
+    sizes = {}
+    for age, key in enumerate(["a", "b", "c"]) :
+        embedding_cache.save_embedding(cache_dir, key, rng.normal(size = (50, 2)))
+        path = os.path.join(cache_dir, key + ".npz")
+        os.utime(path, (1000 + age, 1000 + age))
+        sizes[key] = os.path.getsize(path)
+
+    # a hit makes "a" the most recently used entry
+    embedding_cache.load_embedding(cache_dir, "a")
+
+    embedding_cache.evict(cache_dir, sizes["a"] + sizes["c"])
+    assert sorted(os.listdir(cache_dir)) == ["a.npz", "c.npz"]
+
+    embedding_cache.evict(cache_dir, sizes["a"])
+    assert os.listdir(cache_dir) == ["a.npz"]
+
+    embedding_cache.evict(cache_dir, 0, keep = "a")
+    assert os.listdir(cache_dir) == ["a.npz"]
+
+
+def test_save_evicts_over_max_bytes(tmp_path) :
+    cache_dir = str(tmp_path)
+    rng = np.random.default_rng(2)
+    embedding_cache.save_embedding(cache_dir, "old", rng.normal(size = (50, 2)))
+    os.utime(os.path.join(cache_dir, "old.npz"), (1000, 1000))
+
+    embedding_cache.save_embedding(cache_dir, "new", rng.normal(size = (50, 2)),
+                                   max_bytes = 1
+                                   )
+
+    assert os.listdir(cache_dir) == ["new.npz"]
@@ -0,0 +1,61 @@
+# program		tests/test_permutation.py
+# purpose	    permutation p-values and fdr q-values
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+
+from fishproject import permutation
+
+
+### _table(seed)
+# a, b = a + noise (correlated) and c (independent of both), 40 rows.
+###
+def _table(seed) :
+    rng = np.random.default_rng(seed)
+    a = rng.normal(size = 40)
+
+    return pd.DataFrame({"a" : a,
+                         "b" : a + 0.5 * rng.normal(size = 40),
+                         "c" : rng.normal(size = 40),
+                         })
+
+
+def test_fdr_bh_known_values() :
+    p = [0.01, 0.04, 0.03, np.nan, 0.005, 0.9]
+
+    q = permutation.fdr_bh(p)
+
+    assert np.allclose(q, [0.025, 0.05, 0.05, np.nan, 0.025, 0.9],
+                       equal_nan = True
+                       )
+
+
+def test_fdr_bh_capped_at_one() :
+    assert permutation.fdr_bh([0.8, 0.9, 1.0]).max() == 1.0
+    assert np.isnan(permutation.fdr_bh([np.nan, np.nan])).all()
+
+
+def test_correlated_pair_has_small_p() :
+    result = permutation.permutation_test(_table(1), ["a"], ["b", "c"],
+                                          n_permutations = 999, seed = 2
+                                          )
+
+    assert result.p.loc["a", "b"] == 1 / 1000 # no permutation beat it
+    assert result.p.loc["a", "c"] > 0.1
+    assert result.q.loc["a", "b"] <= result.q.loc["a", "c"]
+
+
+def test_square_mode() :
+    result = permutation.permutation_test(_table(3), ["a", "b", "c"],
+                                          n_permutations = 199, seed = 4
+                                          )
+    p = result.p.to_numpy()
+    q = result.q.to_numpy()
+
+    assert np.isnan(np.diag(p)).all()
+    assert np.isnan(np.diag(q)).all()
+    assert np.array_equal(q, q.T, equal_nan = True)
+    assert q[0, 1] < 0.05
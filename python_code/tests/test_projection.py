@@ -0,0 +1,86 @@
+# program		tests/test_projection.py
+# purpose	    saving fitted UMAP models and projecting new rows
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from fishproject import embedding_cache
+from fishproject import projection
+
+
+_PARAMS = {"n_neighbors" : 5, "n_epochs" : 50, "random_state" : 1,
+           "n_jobs" : 1,
+           }
+
+
+def test_save_load_and_project(tmp_path) :
+    pytest.importorskip("umap")
+    model_dir = str(tmp_path / "models")
+    rng = np.random.default_rng(9)
+    table = pd.DataFrame(rng.normal(size = (40, 4)),
+                         columns = ["DO", "pH", "depth", "width"]
+                         )
+    changed = table.copy()
+    changed.loc[0, "pH"] += 1
+
+    assert not projection.is_current(model_dir, "UMAP t")
+
+    fitted = projection.fit_projection("UMAP t", _PARAMS, table)
+    projection.save_projection(model_dir, fitted)
+
+    key = embedding_cache.embedding_key(table, _PARAMS, "UMAP")
+    assert projection.is_current(model_dir, "UMAP t")
+    assert projection.is_current(model_dir, "UMAP t", key)
+    assert not projection.is_current(model_dir, "UMAP t",
+                                     embedding_cache.embedding_key(changed,
+                                                                   _PARAMS,
+                                                                   "UMAP")
+                                     )
+
+    loaded = projection.load_projection(model_dir, "UMAP t")
+    assert loaded.columns == ["DO", "pH", "depth", "width"]
+
+    rows = table.iloc[:6]
+    placed = projection.project(loaded, rows)
+    shuffled = projection.project(loaded, rows[["width", "pH", "DO", "depth"]])
+
+    assert placed.shape == (6, 2)
+    assert np.allclose(placed, shuffled)
+    # a missing column is filled by the imputer
+    assert projection.project(loaded, rows.drop(columns = "depth")).shape == (6, 2)
+
+    with pytest.raises(FileNotFoundError) :
+        projection.load_projection(model_dir, "UMAP other")
+
+
+def test_fitted_model_is_kept() :
+    pytest.importorskip("umap")
+    from fishproject import fit_scheduler
+
+    rng = np.random.default_rng(10)
+    table = pd.DataFrame(rng.normal(size = (40, 4)),
+                         columns = ["DO", "pH", "depth", "width"]
+                         )
+    params = dict(_PARAMS, metric = "correlation")
+    jobs = {"kept" : (params, table), "shared" : (params, table)}
+
+    embeddings, timings, models = fit_scheduler.fit_embeddings(jobs,
+                                                               max_workers = 1,
+                                                               shared_knn = True,
+                                                               keep_models = ["kept"]
+                                                               )
+
+    assert list(models) == ["kept"]
+    assert np.array_equal(models["kept"].embedding_, embeddings["kept"])
+    assert np.array_equal(embeddings["kept"], embeddings["shared"])
+
+    # the kept model is saved without a refit and can place new rows
+    fitted = projection.fit_projection("UMAP t", params, table,
+                                       model = models["kept"]
+                                       )
+    assert fitted.model is models["kept"]
+    assert projection.project(fitted, table.iloc[:3]).shape == (3, 2)
@@ -0,0 +1,108 @@
+# program		tests/test_ranking.py
+# purpose	    fishproject.ranking gives the order indexes of the old
+#               sorted() / find_val() loops
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### general notes
+# 1)  _baseline_order() is the ordering loop of beaty_sethData_v4p2.py
+#     v4.2 with its find_val(). the ranking has to give the same indexes:
+#     ties in column order and -1 at and below the threshold.
+###
+
+### imports
+import numpy as np
+import pytest
+
+from fishproject import ranking
+
+
+### find_val(arr = [], val = None, count = 1)
+# find_val() of beaty_sethData_v4p2.py v4.2: the index of the count-th
+# instance of val in arr, -1 when there is none.
+###
+def find_val(arr = [], val = None, count = 1) :
+    t_count = 1
+    for index in range(len(arr)) :
+        if (arr[index] == val and t_count == count) :
+            return index
+        elif arr[index] == val :
+            t_count += 1
+
+    return -1
+
+
+### _baseline_order(rows, plot_threshold)
+# Ordering loop of v4.2 for every row of rows.
+###
+def _baseline_order(rows, plot_threshold) :
+    order_index = []
+    for site in range(len(rows)) :
+        sorted_row = sorted(rows[site], reverse = True)
+
+        temp = []
+        counts = 1
+        for genus in range(len(sorted_row)) :
+            if sorted_row[genus] > plot_threshold :
+                if genus != 0 and sorted_row[genus] == sorted_row[genus - 1] :
+                    counts += 1
+                else :
+                    counts = 1
+                temp.append(find_val(rows[site], sorted_row[genus],
+                                     count = counts
+                                     ))
+            else :
+                temp.append(-1)
+
+        order_index.append(temp)
+
+    return np.array(order_index)
+
+
+### _counts(seed)
+# Small counts [site][genus] with many ties and zeros, doubled like the
+# float conversion of the script.
+###
+def _counts(seed) :
+    rng = np.random.default_rng(seed)
+
+    return rng.integers(0, 6, size = (23, 17)).astype(np.float64) * 2
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("threshold", [0.0, 3.0])
+def test_genus_order_matches_baseline(seed, threshold) :
+    counts = _counts(seed)
+
+    expected = _baseline_order(counts.tolist(), threshold)
+
+    assert np.array_equal(ranking.genus_order_index(counts, threshold),
+                          expected
+                          )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("threshold", [0.0, 3.0])
+def test_site_order_matches_baseline(seed, threshold) :
+    counts = _counts(seed)
+
+    expected = np.transpose(_baseline_order(counts.T.tolist(), threshold))
+
+    assert np.array_equal(ranking.site_order_index(counts, threshold),
+                          expected
+                          )
+
+
+@pytest.mark.parametrize("k", [1, 4, 17])
+def test_top_k_matches_full_ranking(k) :
+    counts = _counts(3)
+
+    assert np.array_equal(ranking.top_k_index(counts, k, 3.0),
+                          ranking.rank_order_index(counts, 3.0)[:, :k]
+                          )
+
+
+def test_nan_ranks_last() :
+    counts = np.array([[np.nan, 4.0, 2.0]])
+
+    assert ranking.rank_order_index(counts).tolist() == [[1, 2, -1]]
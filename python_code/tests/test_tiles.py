@@ -0,0 +1,44 @@
+# program		tests/test_tiles.py
+# purpose	    levels and tiles of the deep zoom pyramids
+# date			10/18/2026
+# programmer    Michael M Beaty
+
+### imports
+import os
+
+import numpy as np
+from PIL import Image
+
+from fishproject import tiles
+
+
+def test_pyramid_levels_of_a_figure() :
+    levels = tiles.pyramid_levels(7200, 4800)
+
+    assert len(levels) == 14
+    assert levels[0] == (1, 1)
+    assert levels[-1] == (7200, 4800)
+    assert levels[-2] == (3600, 2400)
+    assert levels[-5] == (450, 300)
+
+
+def test_write_pyramid_tile_counts(tmp_path) :
+    rng = np.random.default_rng(5)
+    image = rng.integers(0, 256, size = (700, 1100, 3), dtype = np.uint8)
+    dzi_path = str(tmp_path / "fig.dzi")
+
+    tiles.write_pyramid(image, dzi_path, tile_size = 256, max_workers = 2)
+
+    levels = tiles.pyramid_levels(1100, 700)
+    files_dir = str(tmp_path / "fig_files")
+    assert len(os.listdir(files_dir)) == len(levels) == 12
+    assert sorted(os.listdir(os.path.join(files_dir, "11"))) == sorted(
+               str(col) + "_" + str(row) + ".png"
+               for col in range(5) for row in range(3))
+    assert len(os.listdir(os.path.join(files_dir, "10"))) == 3 * 2
+    assert len(os.listdir(os.path.join(files_dir, "0"))) == 1
+
+    with Image.open(os.path.join(files_dir, "11", "4_2.png")) as tile :
+        assert tile.size == (1100 - 4 * 256, 700 - 2 * 256)
+        assert np.array_equal(np.asarray(tile), image[512:, 1024:])
+    assert os.path.exists(str(tmp_path / "fig.html"))